@@ -1,12 +1,17 @@
-from package import Package
 
 address_list = None
 
+# Forward and reverse lookup tables built by set_address_list, so that lookups are O(1) instead of a scan of address_list.
+address_index_map = None
+index_address_map = None
+
 def set_address_list(data):
-    global address_list
+    global address_list, address_index_map, index_address_map
     if not isinstance(data, list):
         raise ValueError("address_list must be a list")
 
+    forward = {}
+    reverse = {}
     for i, row in enumerate(data):
         if not isinstance(row, list) or len(row) != 3:
             raise ValueError(f"row {i} must be a list with 3 elements")
@@ -15,7 +20,12 @@ def set_address_list(data):
             raise ValueError(f"row {i} id must be an int")
         if not isinstance(addr, str):
             raise ValueError(f"row {i} address must be a string")
+        # Keep the first occurrence to match the behavior of the original linear scan.
+        forward.setdefault(addr, int(id_))
+        reverse.setdefault(id_, addr)
     address_list = data
+    address_index_map = forward
+    index_address_map = reverse
     
 
 def get_address_list():
@@ -25,19 +35,13 @@ def get_address_list():
 def address_to_index(address):
     if address_list is None:
         raise RuntimeError("address_list is not set; call set_address_list(...) first")
-    for addr in address_list:
-        if addr[2] == address:
-            return int(addr[0])
-    return None
+    return address_index_map.get(address)
     
 
 def index_to_address(index):
     if address_list is None:
         raise RuntimeError("address_list is not set; call set_address_list(...) first")
-    for addr in address_list:
-        if addr[0] == index:
-            return addr[2]
-    return None
+    return index_address_map.get(index)
     
 
-#jjg
\ No newline at end of file
+#jjg
@@ -3,6 +3,7 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from pathlib import Path
 from pydantic import BaseModel, Field
+from typing import Optional
 import asyncio, contextlib, json, os, subprocess, sys, contextlib, time, uuid
 
 PROJECT_DIR = Path(__file__).resolve().parents[1]
@@ -17,6 +18,9 @@ ALLOWED_CMDS = {
     "enter": "\n",
 }
 
+# Simulation clocks main.py accepts with --clock (see sim_clock.py)
+ALLOWED_CLOCKS = {"virtual", "accelerated", "wall"}
+
 def cleanup_old_generated_lists() -> None:
     cutoff = time.time() - GEN_TTL_SECONDS
     for p in TMP_DIR.glob("*.csv"):
@@ -30,6 +34,7 @@ class GenReq(BaseModel):
     num_pkgs: int = Field(20, ge=20, le=40)
     constraints: int = Field(20, ge=0, le=100)
     deadlines: int = Field(20, ge=0, le=100)
+    seed: Optional[int] = None
 
 @app.post("/generate")
 async def generate(req: GenReq):
@@ -46,6 +51,8 @@ async def generate(req: GenReq):
         "-c", str(req.constraints),
         "-d", str(req.deadlines),
     ]
+    if req.seed is not None:
+        cmd += ["--seed", str(req.seed)]
 
     subprocess.run(cmd, cwd=str(PROJECT_DIR), check=True)
 
@@ -68,6 +75,8 @@ async def ws_run(ws: WebSocket):
 
     v = ws.query_params.get("v")
     list_id = ws.query_params.get("list_id")
+    seed = ws.query_params.get("seed")
+    clock = ws.query_params.get("clock")
     package_csv = None
 
     if list_id:
@@ -82,6 +91,13 @@ async def ws_run(ws: WebSocket):
     cmd = [sys.executable, "-u", "main.py", "-v", v]
     if package_csv:
         cmd += ["-p", package_csv]
+    if seed:
+        try:
+            cmd += ["--seed", str(int(seed))]
+        except ValueError:
+            pass
+    if clock in ALLOWED_CLOCKS:
+        cmd += ["--clock", clock]
 
     proc = await asyncio.create_subprocess_exec(
         *cmd,
@@ -1,18 +1,32 @@
 from enum import Enum
-import time as simulate_real_time
-from time_utils import get_route_departure_time, get_arrival_time, get_travel_time_in_minutes
+from bisect import bisect_right
+from collections import deque
+from datetime import time as time_of_day
+from time_utils import get_route_departure_minutes, get_arrival_minutes, time_to_minutes, format_minutes
 from distance_repository import get_distance
-from package import Package
+from address_repository import address_to_index
+from event_queue import EventQueue
+from sim_clock import AcceleratedClock
 
 class DeliveryHandler:
     RATE = 80 # Set the rate of accelerated real-time
     
-    def __init__(self, delivery_list=None):
+    def __init__(self, delivery_list=None, clock=None, quiet=False):
         if delivery_list is None:
             delivery_list = []
         self.delivery_list = delivery_list
-        self.previous_locations = []
-        self.previous_times = []
+        # How much real time each leg takes (see sim_clock.py); accelerated real-time at RATE unless told otherwise.
+        self.clock = clock if clock is not None else AcceleratedClock(self.RATE)
+        # A quiet handler doesn't print each event as it happens (departures, deliveries, returns, address corrections), only the final route distances.
+        self.quiet = quiet
+        # Where each truck is during deliver_packages, by truck_id (see TruckState)
+        self.truck_states = {}
+        # Positions of each package's events in the delivery_list, by package_id, and the address changes still to come in (see queue_address_change)
+        self.package_events = {}
+        self.address_changes = EventQueue()
+        # What print_package_statuses_at answers from, and the fleet it was built for (see status_timeline_for)
+        self.status_timeline = None
+        self.status_fleet = None
     
     def build_delivery_list(self, fleet):
         available_trucks, waiting_trucks = separate_trucks_by_driver_status(fleet)
@@ -34,6 +48,7 @@ class DeliveryHandler:
         
         # Sort the list based on 'time'
         self.delivery_list.sort(key=lambda tuple: tuple[2])
+        self.status_timeline = None
         
     
     def generate_delivery_timeline(self, truck_list):
@@ -49,135 +64,216 @@ class DeliveryHandler:
             # Truck leaving the warehouse
             self.delivery_list.append((truck, None, truck.departure_time, DeliveryAction.DEPART))
             
-            # Delivery of first package departing from the warehouse
-            arr_time = get_arrival_time(truck.departure_time, truck.departure_address, first_pkg.address, truck.speed_mph)
+            # Delivery of first package departing from the warehouse. Times in the delivery_list are minutes since midnight.
+            arr_time = get_arrival_minutes(truck.departure_time, truck.departure_address, first_pkg.location, truck.speed_mph)
             self.delivery_list.append((truck, first_pkg, arr_time, DeliveryAction.DELIVER))
 
-            last_address = first_pkg.address
+            last_address = first_pkg.location
             
             # Delivery of the remaining packages on the truck
             for pkg in route[1:]:
-                arr_time = get_arrival_time(arr_time, last_address, pkg.address, truck.speed_mph)
+                arr_time = get_arrival_minutes(arr_time, last_address, pkg.location, truck.speed_mph)
                 self.delivery_list.append((truck, pkg, arr_time, DeliveryAction.DELIVER))
-                last_address = pkg.address
+                last_address = pkg.location
             
             # Truck returning to the warehouse
-            arr_time = get_arrival_time(arr_time, last_address, truck.departure_address, truck.speed_mph)
+            arr_time = get_arrival_minutes(arr_time, last_address, truck.departure_address, truck.speed_mph)
             truck.return_time = arr_time
             self.delivery_list.append((truck, None, arr_time, DeliveryAction.RETURN))
             
             #print(f"Truck {truck.truck_id + 1} arriving back at the warehouse at {arr_time}") # DEBUG ONLY
         
     
-    # This delivers the packages, and simulated accelerated real time. Trucks are updated dynamically by storing updated values in the previous_locations and previous_times lists, and recalculating mid-method. Packages with the wrong addresses are handled by dynamically checking for corrected addresses at the end of each while loop.
+    # This delivers the packages, and simulated accelerated real time. Trucks are updated dynamically by storing updated values in each truck's TruckState, and recalculating mid-method. Packages with the wrong addresses are handled by queued address changes, which are applied as soon as the simulation reaches their time.
+    # Events run off an EventQueue instead of the sorted list. Each truck only has its next event queued; once an event has happened, the truck's following event goes in at its planned time plus however far the truck has drifted from the plan (a rerouted package, a driver coming back late), so late trucks take their real place among the others instead of their planned one.
     def deliver_packages(self, fleet):
         free_driver = None
+        # Trucks out on the road with a driver, and trucks that were due to leave before any of those drivers got back, in the order they were due
+        drivers_out = 0
+        waiting_for_driver = []
 
-        # Iterate over a copy of the list so that the state of the delivery_list can be saved (and corrected)
-        delivery_queue = self.delivery_list.copy()
+        pending_events = self.index_package_events()
+        self.queue_noted_address_changes()
+        # Looked up once here rather than through the enum on every event, along with the padded labels the output starts with
+        depart, deliver, ret = DeliveryAction.DEPART, DeliveryAction.DELIVER, DeliveryAction.RETURN
+        labels = {action: f"{action.value:<9}" for action in DeliveryAction}
+        quiet = self.quiet
+
+        delivery_queue = EventQueue()
+        for truck in pending_events:
+            self.schedule_next_event(delivery_queue, pending_events, truck, 0)
         
         while delivery_queue:
-            delivery_tuple = delivery_queue.pop(0)
-            truck, package, time, action = delivery_tuple
-            time_str = time.strftime("%H:%M")
+            time, seq, delivery_tuple = delivery_queue.pop()
+            truck, package, planned_time, action = delivery_tuple
+            
+            # Corrections that have come in by now reach the trucks before anything else happens
+            self.apply_address_changes(time)
             
             # Truck leaving the warehouse
-            if action == DeliveryAction.DEPART:
+            if action is depart:
                 # Availabe driver is assigned to empty truck
                 if truck.driver is None:
+                    if free_driver is None and drivers_out:
+                        # The driver this truck was waiting for is running late; it leaves when someone gets back.
+                        waiting_for_driver.append((seq, delivery_tuple))
+                        continue
                     truck.driver = free_driver
+                if truck.driver is not None:
+                    drivers_out += 1
                 
                 self.handle_delivery_action_departed(truck)
+                actual_time = time
                 
-                print(f"{action.value:<9} {time_str} | Truck ID: {truck.truck_id + 1} | From: {truck.departure_address:<40}")
+                if not quiet:
+                    time_str = format_minutes(actual_time)
+                    print(f"{labels[action]} {time_str} | Truck ID: {truck.truck_id + 1} | From: {truck.departure_address:<40}")
             
             # Delivery of the packages
-            elif action == DeliveryAction.DELIVER:
+            elif action is deliver:
                 actual_time = self.handle_delivery_action_delivered(time, package, truck)
                 
-                # Prepare strings for output
-                time_str = actual_time.strftime("%H:%M")
-                deadline_str = package.delivery_deadline.strftime("%H:%M") if package.delivery_deadline != package.EOD_TIME else 'EOD'
-                met_deadline = (actual_time <= package.delivery_deadline) if package.delivery_deadline != package.EOD_TIME else None
-                met_deadline_str = f" Met deadline: {met_deadline}" if met_deadline is not None else ""
-                
-                # Output
-                print(f"{action.value:<9} {time_str} | Package: {package.package_id:<2} | Address: {package.address:<40} | Delivery Deadline: {deadline_str:<7} | {met_deadline_str}")
+                if not quiet:
+                    # Prepare strings for output
+                    time_str = format_minutes(actual_time)
+                    if package.delivery_deadline != package.EOD_TIME:
+                        deadline_str = package.delivery_deadline.strftime("%H:%M")
+                        met_deadline_str = f" Met deadline: {actual_time <= package.deadline_minutes}"
+                    else:
+                        deadline_str = 'EOD'
+                        met_deadline_str = ""
+                    
+                    # Output
+                    print(f"{labels[action]} {time_str} | Package: {package.package_id:<2} | Address: {package.address:<40} | Delivery Deadline: {deadline_str:<7} | {met_deadline_str}")
             
             # Truck returning to the warehouse
-            elif action == DeliveryAction.RETURN:
-                self.handle_delivery_action_returned(truck)
+            elif action is ret:
+                actual_time = self.handle_delivery_action_returned(truck)
+                if actual_time is None:
+                    actual_time = time
                 
                 # Driver has completed the route - add to available driver pool.
                 free_driver = truck.driver
+                if truck.driver is not None:
+                    drivers_out -= 1
+                
+                # Anyone left waiting for a driver leaves now
+                for waiting_seq, waiting_tuple in waiting_for_driver:
+                    waiting_tuple[0].departure_time = actual_time
+                    delivery_queue.push(actual_time, waiting_tuple, waiting_seq)
+                waiting_for_driver = []
                 
                 # Output
-                print(f"{action.value:<9} {time_str} | Truck ID: {truck.truck_id + 1} | From: {truck.departure_address:<40}")
+                if not quiet:
+                    time_str = format_minutes(actual_time)
+                    print(f"{labels[action]} {time_str} | Truck ID: {truck.truck_id + 1} | From: {truck.departure_address:<40}")
+            
+            self.schedule_next_event(delivery_queue, pending_events, truck, actual_time - planned_time)
         
-        self.previous_locations = []
-        self.previous_times = []
+        self.truck_states = {}
 
         print()
         for truck in fleet:
             print(f"Truck ID: {truck.truck_id + 1}, Final Route Distance: {truck.route_distance:.1f}")
         
+    # Queues the truck's next planned event, shifted by drift minutes (how far behind the plan the truck is running).
+    def schedule_next_event(self, delivery_queue, pending_events, truck, drift):
+        events = pending_events[truck]
+        if events:
+            seq, delivery_tuple = events.popleft()
+            delivery_queue.push(delivery_tuple[2] + drift, delivery_tuple, seq)
+    
+    
+    # One pass over the delivery_list: each package's positions go in package_events for apply_address_changes, and each truck's events come back in planned order, tagged with their place in the delivery_list so ties come out in plan order.
+    def index_package_events(self):
+        self.package_events = package_events = {}
+        pending_events = {}
+        for seq, delivery_tuple in enumerate(self.delivery_list):
+            truck, package = delivery_tuple[0], delivery_tuple[1]
+            events = pending_events.get(truck)
+            if events is None:
+                events = pending_events[truck] = deque()
+            events.append((seq, delivery_tuple))
+            if package is not None:
+                positions = package_events.get(package.package_id)
+                if positions is None:
+                    package_events[package.package_id] = [seq]
+                else:
+                    positions.append(seq)
+        return pending_events
+    
+    
+    # Queues a new address for a package, taking effect at time (minutes since midnight). Any number of corrections can come in over the day; deliver_packages applies each one once the simulation gets to its time, and a later one for the same package wins.
+    def queue_address_change(self, time, package_id, address, city, state, zip_code):
+        self.address_changes.push(time, (package_id, address, city, state, zip_code))
+    
+    
+    # Per project specifications, a package with the wrong address has a special note 'X' holding the time of the correction and the corrected address. Those become queued address changes like any other.
+    def queue_noted_address_changes(self):
+        for positions in self.package_events.values():
+            package = self.delivery_list[positions[0]][1]
+            if package.special_note and package.special_note[0] == 'X':
+                correction_time, address, city, state, zip_code = package.special_note[1:6]
+                self.queue_address_change(time_to_minutes(correction_time), package.package_id, address, city, state, zip_code)
+    
+    
+    # Applies every queued address change due by now. Each one only touches the events of its own package, found through package_events.
+    def apply_address_changes(self, now):
+        while self.address_changes and self.address_changes.peek_time() <= now:
+            time, _, (package_id, address, city, state, zip_code) = self.address_changes.pop()
+            
+            for i in self.package_events.get(package_id, ()):
+                package = self.delivery_list[i][1]
+                # Too late for a package that is already delivered, and nothing to do for one that already has this address
+                if package.delivery_status == 'delivered' or package.address == address:
+                    continue
+                
+                if not self.quiet:
+                    print(f"  Address correction for package {package.package_id}. Old address: {package.address}")
+                package.address = address
+                # Keep the cached distance matrix index in sync with the corrected address.
+                if package.address_index is not None:
+                    package.address_index = address_to_index(address)
+                # Reassigned rather than appended so the warehouse journal sees the change
+                package.address_history = package.address_history + [(time, address)]
+                package.city = city
+                package.state = state
+                package.zip_code = zip_code
+                if not self.quiet:
+                    print(f"  Rerouting to new address: {package.address}")
+                
+                if self.status_timeline is not None and package_id in self.status_timeline:
+                    self.status_timeline[package_id].sort_address_history()
+        
     def handle_delivery_action_departed(self, truck):
         # Update the deliver_status of each package to 'en_route'
         set_packages_en_route(truck.package_list)
 
         # Set starting point and starting time for tracking distance/real-time
-        update_previous_location(self.previous_locations, truck.truck_id, truck.departure_address)
-        update_previous_time(self.previous_times, truck.truck_id, truck.departure_time)
+        self.truck_states[truck.truck_id] = TruckState(truck.departure_address, truck.departure_time)
 
     def handle_delivery_action_delivered(self, time, package, truck):
-        last_location = get_previous_location(self.previous_locations, truck.truck_id)
-        last_time = get_previous_time(self.previous_times, truck.truck_id)
-
-        # Check if package has a special note 'X' to correct address and compare with current time
-        if package.special_note and package.special_note[0] == 'X':
-            correction_time = package.special_note[1]
-            # A corrected address would likely be passed to the truck at the time of correction. A more realistic approach would include a corrected_addresses_list of tuples (package_id, corrected_address), which would then update the package dynamically. For the purposes of the project, I'm simply included the corrected address as part of the special note.
-            correct_address = package.special_note[2]
-            correct_city = package.special_note[3]
-            correct_state = package.special_note[4]
-            correct_zip_code = package.special_note[5]
-
-            last_time = get_previous_time(self.previous_times, truck.truck_id)
-
-            if last_time >= correction_time:
-                print(f"  Address correction for package {package.package_id}. Old address: {package.address}")
-                package.address = correct_address
-                package.address_history.append((last_time, correct_address))
-                package.city = correct_city
-                package.state = correct_state
-                package.zip_code = correct_zip_code
-                print(f"  Rerouting to new address: {package.address}")
-
-                for i, (truck_, package_, event_time, action_) in enumerate(self.delivery_list):
-                    if package_ and package_.package_id == package.package_id:
-                        package_.address = correct_address
-                        package_.city = correct_city
-                        package_.state = correct_state
-                        package_.zip_code = correct_zip_code
-                        self.delivery_list[i] = (truck_, package_, event_time, action_)
+        state = self.truck_states[truck.truck_id]
+        last_location = state.location
+        last_time = state.time
+
+        # Where the package is going right now; read once, since location works it out from the address fields
+        location = package.location
 
         # Recalculate arrival time to account for any changes mid-route
-        new_time = get_arrival_time(last_time, last_location, package.address, truck.speed_mph)
-        time_str = new_time.strftime("%H:%M")
+        new_time = get_arrival_minutes(last_time, last_location, location, truck.speed_mph)
 
-        # Simulate accelerated real-time
-        travel_minutes = get_travel_time_in_minutes(last_time, new_time)
-        simulate_real_time.sleep(travel_minutes / self.RATE)
+        # Let the leg's travel time pass on the simulation clock
+        self.clock.advance(last_time, new_time)
         #print(travel_time) # DEBUG ONLY
 
         # Update the truck's route distance
-        distance = get_distance(last_location, package.address)
+        distance = get_distance(last_location, location)
         truck.route_distance += distance
         #print(f"Distance from {last_location} to {package.address}: {distance}") # DEBUG ONLY
 
         # Update truck's previous time and location
-        update_previous_location(self.previous_locations, truck.truck_id, package.address)
-        update_previous_time(self.previous_times, truck.truck_id, new_time)
+        state.move_to(location, new_time)
 
         # Update the package's delivery attributes
         package.delivery_status = 'delivered'
@@ -186,33 +282,32 @@ class DeliveryHandler:
         return new_time
 
     def handle_delivery_action_returned(self, truck):
-        last_location = get_previous_location(self.previous_locations, truck.truck_id)
-        last_time = get_previous_time(self.previous_times, truck.truck_id)
+        state = self.truck_states[truck.truck_id]
+        last_location = state.location
+        last_time = state.time
 
         # Recalculate arrival time back to hub to account for any changes mid-route
-        new_time = get_arrival_time(last_time, last_location, truck.departure_address, truck.speed_mph)
-        time_str = new_time.strftime("%H:%M")
+        new_time = get_arrival_minutes(last_time, last_location, truck.departure_address, truck.speed_mph)
 
         distance = get_distance(last_location, truck.departure_address)
 
         truck.route_distance += distance
-        update_previous_location(self.previous_locations, truck.truck_id, truck.departure_address)
         #print(f"Distance from {last_location} to {truck.departure_address}: {distance}") # DEBUG ONLY
 
-        # Simulate accelerated real-time
-        travel_minutes = get_travel_time_in_minutes(last_time, new_time)
-        simulate_real_time.sleep(travel_minutes / self.RATE)
+        # Let the leg's travel time pass on the simulation clock
+        self.clock.advance(last_time, new_time)
 
         # Update truck's previous time and location
-        update_previous_time(self.previous_times, truck.truck_id, new_time)
-        update_previous_location(self.previous_locations, truck.truck_id, truck.departure_address)
+        state.move_to(truck.departure_address, new_time)
+
+        return new_time
     
     def print_delivery_list(self):
         #print(f"Length: {len(self.delivery_list)}") # DEBUG ONLY
         for delivery_tuple in self.delivery_list:
             truck, package, time, action = delivery_tuple
             
-            time_str = time.strftime("%H:%M")
+            time_str = format_minutes(time)
             truck_id = f"{truck.truck_id + 1}"
             pkg_id = f"{str(package.package_id) if package else 'NA':<2}"
             address = package.address if package else truck.departure_address
@@ -220,44 +315,94 @@ class DeliveryHandler:
             print(f"{action.value:<7} {time_str} | Truck ID: {truck_id} | Package ID: {pkg_id} | Address: {address}")
         
     
+    # time_input is a clock time; it is converted once here and everything below compares minutes. Minutes can be passed directly to query past midnight.
     def print_package_statuses_at(self, time_input, fleet):
-        copied_packages = []
-        
-        # Make copies of all package objects to maintain the integrity of the data
-        for truck in fleet.truck_list:
-            for package in truck.package_list:
-                copied_pkg = copy_package(package, truck.truck_id)
-                copied_packages.append(copied_pkg)
+        if isinstance(time_input, time_of_day):
+            time_input = time_to_minutes(time_input)
         
-        # Iterate through the copied_packages and set attributes
-        for delivery_tuple in self.delivery_list:
-            truck, package, time, action = delivery_tuple
-            
-            if time > time_input:
-                break
-            
-            if action == DeliveryAction.DEPART:
-                for package_ in copied_packages:
-                    if package_.truck == truck.truck_id and package_.delivery_status == 'at_the_hub':
-                        package_.delivery_status = 'en_route'
-            
-            # Only add packages to the copied_packages list
-            elif action == DeliveryAction.DELIVER and package:
-                for package_ in copied_packages:
-                    if package_.package_id == package.package_id:
-                        package_.delivery_status = 'delivered'
-                        package_.time_of_delivery = time
-                        
-        # Print each package
-        for package in copied_packages: #sorted(copied_packages, key=lambda package: package.package_id):
-            time_of_delivery_str = package.time_of_delivery.strftime('%H:%M') if package.time_of_delivery else 'NA'
+        for timeline in self.status_timeline_for(fleet).values():
+            package = timeline.package
+            delivery_status, time_of_delivery = timeline.status_at(time_input)
+            time_of_delivery_str = format_minutes(time_of_delivery) if time_of_delivery is not None else 'NA'
             delivery_deadline_str = package.delivery_deadline.strftime('%H:%M') if package.delivery_deadline != package.EOD_TIME else 'EOD'
-            address_at_time = get_address_at_time(package, time_input)
+            address_at_time = timeline.address_at(time_input)
             
             # Address, deadline, truck_no, delivery_time
-            print(f"Package ID: {package.package_id:<2} | Truck ID: {package.truck:<4} | Address: {address_at_time:<40} | Delivery Deadline: {delivery_deadline_str:<5} | Delivery Status: {package.delivery_status:<10} | Time of Delivery: {time_of_delivery_str}")
+            print(f"Package ID: {package.package_id:<2} | Truck ID: {timeline.truck_id:<4} | Address: {address_at_time:<40} | Delivery Deadline: {delivery_deadline_str:<5} | Delivery Status: {delivery_status:<10} | Time of Delivery: {time_of_delivery_str}")
         
     
+    # Status queries used to copy every package and replay the delivery_list up to the query time, O(events x packages) each. The timeline is read off the delivery_list once per fleet instead, and a query only compares against each package's depart and deliver minutes. It lasts until build_delivery_list runs again; address changes re-sort their own package's entry.
+    def status_timeline_for(self, fleet):
+        if self.status_timeline is None or self.status_fleet is not fleet:
+            self.status_timeline = self.build_status_timeline(fleet)
+            self.status_fleet = fleet
+        return self.status_timeline
+    
+    
+    # PackageTimeline for every package on the fleet, by package_id, in fleet order
+    def build_status_timeline(self, fleet):
+        depart_times = {}
+        deliver_times = {}
+        for truck, package, time, action in self.delivery_list:
+            if action == DeliveryAction.DEPART:
+                depart_times[truck.truck_id] = min(time, depart_times.get(truck.truck_id, time))
+            elif action == DeliveryAction.DELIVER and package:
+                deliver_times[package.package_id] = min(time, deliver_times.get(package.package_id, time))
+        
+        status_timeline = {}
+        for truck in fleet.truck_list:
+            for package in truck.package_list:
+                status_timeline[package.package_id] = PackageTimeline(package, truck.truck_id, depart_times.get(truck.truck_id), deliver_times.get(package.package_id))
+        return status_timeline
+    
+
+# Where a truck is partway through deliver_packages: the location it was last at and the simulation minute it got there. The miles it drives go on truck.route_distance, like everywhere else.
+# The handlers look this up by truck_id in a dict, once per event, where they used to scan a list of (truck_id, value) tuples four times per event.
+class TruckState:
+    __slots__ = ('location', 'time')
+
+    def __init__(self, location, time):
+        self.location = location
+        self.time = time
+
+
+    def move_to(self, location, time):
+        self.location = location
+        self.time = time
+
+
+# One package's day as the delivery_list plans it: the minute its truck departs and the minute it is delivered (None if never), and its address_history sorted by time so the address at any minute is a bisect away.
+class PackageTimeline:
+    __slots__ = ('package', 'truck_id', 'depart', 'deliver', 'change_times', 'addresses')
+
+    def __init__(self, package, truck_id, depart, deliver):
+        self.package = package
+        self.truck_id = truck_id
+        self.depart = depart
+        self.deliver = deliver
+        self.sort_address_history()
+
+
+    def sort_address_history(self):
+        history = self.package.address_history
+        # The first address holds until the first change; entries without a time never take over from it.
+        changes = sorted(((time, address) for time, address in history if time is not None), key=lambda change: change[0])
+        self.change_times = [time for time, _ in changes]
+        self.addresses = [history[0][1] if history else self.package.address] + [address for _, address in changes]
+
+
+    # (delivery_status, time_of_delivery) at minute time
+    def status_at(self, time):
+        if self.deliver is not None and self.deliver <= time:
+            return 'delivered', self.deliver
+        if self.depart is not None and self.depart <= time:
+            return 'en_route', None
+        return 'at_the_hub', None
+
+
+    def address_at(self, time):
+        return self.addresses[bisect_right(self.change_times, time)]
+
 
 # https://www.geeksforgeeks.org/enum-in-python/
 class DeliveryAction(Enum):
@@ -273,7 +418,7 @@ def separate_trucks_by_driver_status(fleet):
     
     for truck in fleet.truck_list:
         if truck.driver:
-            truck.departure_time = get_route_departure_time(truck.package_list)
+            truck.departure_time = get_route_departure_minutes(truck.package_list)
             available_trucks.append(truck)
         else:
             waiting_trucks.append(truck)
@@ -283,58 +428,4 @@ def separate_trucks_by_driver_status(fleet):
 def set_packages_en_route(package_list):
     for package in package_list:
         package.delivery_status = 'en_route'
-    
-def update_previous_location(prev_locations_list, truck_id, address):
-    for i, (id, _) in enumerate(prev_locations_list):
-        if id == truck_id:
-            prev_locations_list[i] = (truck_id, address)
-            return
-    prev_locations_list.append((truck_id, address))
-
-def get_previous_location(prev_locations_list, truck_id):
-    for id, address in prev_locations_list:
-        if id == truck_id:
-            return address
-    return None
-
-def update_previous_time(previous_times_list, truck_id, timestamp):
-    for i, (id, _) in enumerate(previous_times_list):
-        if id == truck_id:
-            previous_times_list[i] = (truck_id, timestamp)
-            return
-    previous_times_list.append((truck_id, timestamp))
-
-def get_previous_time(previous_times_list, truck_id):
-    for id, timestamp in previous_times_list:
-        if id == truck_id:
-            return timestamp
-    return None
-
-def copy_package(original_package, truck_id):
-    new_package = Package(package_id = original_package.package_id,
-                          address = original_package.address,
-                          city = original_package.city,
-                          state = original_package.state,
-                          zip_code = original_package.zip_code,
-                          delivery_deadline = original_package.delivery_deadline,
-                          weight_kilo = original_package.weight_kilo,
-                          special_note = original_package.special_note,
-                          delivery_status = 'at_the_hub',
-                          time_of_delivery = None,
-                          truck = truck_id,
-                          group = original_package.group,
-                          priority = original_package.priority)
-    new_package.address_history = list(original_package.address_history)
-    return new_package
-    
-def get_address_at_time(package, time_input):
-    # Return address at time of input
-    address_at_time_input = package.address_history[0][1]
-    
-    for timestamp, address in package.address_history:
-        if timestamp is not None and timestamp <= time_input:
-            address_at_time_input = address
-        elif timestamp is not None and timestamp > time_input:
-            break
-    return address_at_time_input
 #jjg
\ No newline at end of file
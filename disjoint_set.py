@@ -0,0 +1,52 @@
+# Union-find over arbitrary hashable items (package ids for the 'W' notes). Path compression and union by rank keep find() close to constant time, so linking n items costs about O(n) instead of rescanning every set on every merge.
+class DisjointSet:
+    def __init__(self):
+        self.parent = {}
+        self.rank = {}
+
+
+    def __len__(self):
+        return len(self.parent)
+
+
+    def __contains__(self, item):
+        return item in self.parent
+
+
+    def add(self, item):
+        if item not in self.parent:
+            self.parent[item] = item
+            self.rank[item] = 0
+
+
+    # Returns the root of item's set, pointing every item on the way straight at it. Iterative, so long chains can't hit the recursion limit.
+    def find(self, item):
+        self.add(item)
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+
+    # Merges the sets holding a and b, hanging the shorter tree under the taller one. Returns the new root.
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self.rank[root_a] < self.rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        if self.rank[root_a] == self.rank[root_b]:
+            self.rank[root_a] += 1
+        return root_a
+
+
+    # Returns {root: set of items} for every set.
+    def groups(self):
+        result = {}
+        for item in self.parent:
+            result.setdefault(self.find(item), set()).add(item)
+        return result
+# jjg
@@ -1,10 +1,22 @@
 import math
+try:
+    import numpy as np
+except ImportError: # NumPy is optional; list-of-lists matrices are validated in pure Python.
+    np = None
 from address_repository import address_to_index
 
 distance_matrix = None
+# Travel-minutes matrices derived from distance_matrix, keyed by truck speed (see time_utils.get_travel_minutes_matrix). They are only valid for the matrix they were built from, so setting a new one clears them.
+travel_minutes_matrices = {}
 
 def set_distance_matrix(data):
     global distance_matrix
+    if np is not None and isinstance(data, np.ndarray):
+        validate_distance_array(data)
+        distance_matrix = data
+        travel_minutes_matrices.clear()
+        return
+    
     if not data or len(data) < 2:
         raise ValueError("distance matrix must have at least two addresses")
 
@@ -30,6 +42,22 @@ def set_distance_matrix(data):
                     raise ValueError("distance matrix must be symmetric")
 
     distance_matrix = data
+    travel_minutes_matrices.clear()
+    
+
+# Vectorized version of the checks in set_distance_matrix for NumPy ndarrays.
+def validate_distance_array(data):
+    if data.ndim != 2 or data.shape[0] < 2:
+        raise ValueError("distance matrix must have at least two addresses")
+    if data.shape[0] != data.shape[1]:
+        raise ValueError("distance matrix must be symmetrical")
+    if not np.issubdtype(data.dtype, np.number):
+        raise ValueError("distances must be numeric")
+    if np.any((data < 0) & ~np.isinf(data)):
+        raise ValueError("distances must be non-negative")
+    diagonal = np.diagonal(data)
+    if np.any(~np.isinf(diagonal) & (diagonal != 0)):
+        raise ValueError("diagonal must be zero")
     
 
 def get_distance_matrix():
@@ -45,9 +73,10 @@ def print_distance_matrix(matrix):
         print(formatted_row)
     
 
+# Accepts either address strings or distance matrix indices (see Package.location).
 def get_distance(addr_a, addr_b):
-    index_a = address_to_index(addr_a)
-    index_b = address_to_index(addr_b)
+    index_a = addr_a if isinstance(addr_a, int) else address_to_index(addr_a)
+    index_b = addr_b if isinstance(addr_b, int) else address_to_index(addr_b)
     
     return distance_matrix[index_a][index_b]
 
@@ -0,0 +1,66 @@
+import heapq
+import itertools
+
+# Sourced from: https://docs.python.org/3/library/heapq.html#priority-queue-implementation-notes
+# The discrete-event queue behind DeliveryHandler.deliver_packages. Events come out in (time, seq) order, where seq is the event's place in the plan, so events due at the same minute come out in the order they were planned. An event pushed without a seq gets one after every seq handed out so far.
+# Rescheduling or removing an event doesn't search the heap for it; the old entry is marked dead and skipped when it reaches the top, so every operation is O(log n).
+class EventQueue:
+    REMOVED = object() # Stands in for the event of a dead entry
+
+    def __init__(self):
+        self.heap = []
+        self.size = 0
+        self.next_seq = 0
+        # Breaks ties between entries with the same (time, seq), so two events are never compared with each other.
+        self.counter = itertools.count()
+
+
+    # Adds event at time and returns its entry, which reschedule and remove take.
+    def push(self, time, event, seq=None):
+        if seq is None:
+            seq = self.next_seq
+        self.next_seq = max(self.next_seq, seq + 1)
+
+        entry = [time, seq, next(self.counter), event]
+        heapq.heappush(self.heap, entry)
+        self.size += 1
+        return entry
+
+
+    # Removes and returns the earliest event as (time, seq, event). Raises IndexError when the queue is empty, like list.pop.
+    def pop(self):
+        while self.heap:
+            entry = heapq.heappop(self.heap)
+            time, seq, _, event = entry
+            if event is not EventQueue.REMOVED:
+                # Popped entries count as dead too, so a stale entry can't be rescheduled back in
+                entry[3] = EventQueue.REMOVED
+                self.size -= 1
+                return time, seq, event
+        raise IndexError("pop from an empty EventQueue")
+
+
+    # Time of the earliest event, or None when the queue is empty.
+    def peek_time(self):
+        while self.heap and self.heap[0][3] is EventQueue.REMOVED:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+
+    # Moves a queued event to a new time, keeping its seq. Returns the new entry; the old one is dead.
+    def reschedule(self, entry, time):
+        event = entry[3]
+        self.remove(entry)
+        return self.push(time, event, entry[1])
+
+
+    def remove(self, entry):
+        if entry[3] is EventQueue.REMOVED:
+            raise ValueError("event is not in the queue")
+        entry[3] = EventQueue.REMOVED
+        self.size -= 1
+
+
+    def __len__(self):
+        return self.size
+#jjg
@@ -0,0 +1,160 @@
+import math
+from package import Package, get_note_tag
+from time_utils import get_travel_minutes_matrix, get_route_departure_minutes
+from truck import Truck
+from two_opt import location_index
+from tools.reporter import VerbosityLevel
+
+# Per project instruction: 'Drivers leave the hub no earlier than 8:00 a.m'
+DAY_START_MINUTES = 8 * 60
+
+# Finds the smallest fleet the loader can make a feasible plan with. main.py used to start at 1 truck and 1 driver and add a truck, then a driver, then a truck... every time loading raised SystemExit, redoing all of the package handling each time and never stopping if nothing fit.
+# This walks the same ladder of fleets (rung k has 1 + ceil(k/2) trucks and 1 + floor(k/2) drivers), but:
+#   - starts at the first rung that meets the lower bounds, so fleets that can't possibly work are never tried
+#   - gallops up the ladder (1, 2, 4, ... rungs past the last failure) until a fleet works, then binary searches back down between the two
+#   - gives up with a clear message once every package could have a truck and a driver of its own
+# The binary search assumes a bigger fleet never makes the loader fail where a smaller one succeeded, which is what the old ladder relied on too.
+class FleetSizer:
+    def __init__(self, package_list, reporter=None, truck=None):
+        self.package_list = list(package_list)
+        self.reporter = reporter
+        # Capacity, speed and hub come from a template truck; the fleet's trucks are all built the same.
+        self.truck = truck if truck is not None else Truck()
+        self.attempts = [] # (trucks, drivers, feasible), in the order they were tried
+
+        self.min_trucks, self.min_drivers = self.lower_bounds()
+        # One truck and one driver per package always covers the capacity and every deadline a package can make on its own.
+        self.max_trucks = max(self.min_trucks, len(self.package_list))
+
+
+    # (trucks, drivers) that any feasible plan needs at least.
+    def lower_bounds(self):
+        capacity = self.truck.maximum_capacity
+        drivers = max(1, math.ceil(len(self.deadline_critical_packages()) / capacity))
+
+        trucks = max(1, drivers, math.ceil(len(self.package_list) / capacity))
+        # A 'T' note names a truck, so the fleet has to have a truck with that number.
+        for pkg in self.package_list:
+            if get_note_tag(pkg.special_note) == 'T' and isinstance(pkg.special_note[1], int):
+                trucks = max(trucks, pkg.special_note[1])
+        return trucks, drivers
+
+
+    # Packages that have to leave with a driver. A truck without a driver only leaves once the first driver is back, which is never before 8:00 plus the shortest round trip to any stop; a package whose deadline falls before that truck could even reach it has to go out in the first wave.
+    # Raises SystemExit if a package can't make its deadline even with a truck all to itself, since no fleet will fix that.
+    def deadline_critical_packages(self):
+        shortest = self.shortest_minutes_from_hub()
+
+        round_trips = [2 * shortest[location_index(pkg.location)] for pkg in self.package_list if not is_rerouted(pkg)]
+        if not round_trips:
+            return []
+        second_wave = DAY_START_MINUTES + min(round_trips)
+
+        critical = []
+        for pkg in self.package_list:
+            if is_rerouted(pkg) or pkg.delivery_deadline in (None, Package.EOD_TIME):
+                continue
+            earliest = shortest[location_index(pkg.location)]
+            if get_route_departure_minutes([pkg]) + earliest > pkg.deadline_minutes:
+                raise SystemExit(f"Package {pkg.package_id} can't be delivered by {pkg.get_deadline_str()} even on a truck of its own.")
+            if second_wave + earliest > pkg.deadline_minutes:
+                critical.append(pkg)
+        return critical
+
+
+    # Fewest travel minutes from the hub to every package's address, going through other stops if that is quicker. The simulation rounds every leg on its own, so a detour can come out a minute ahead of the direct leg.
+    def shortest_minutes_from_hub(self):
+        minutes = get_travel_minutes_matrix(self.truck.speed_mph)
+        hub = location_index(self.truck.departure_address)
+        nodes = {hub} | {location_index(pkg.location) for pkg in self.package_list if not is_rerouted(pkg)}
+
+        # Dijkstra on the dense matrix; O(V^2) is fine for a day's worth of addresses.
+        best = {node: float('inf') for node in nodes}
+        best[hub] = 0
+        unvisited = set(nodes)
+        while unvisited:
+            node = min(unvisited, key=lambda n: (best[n], n))
+            unvisited.remove(node)
+            for other in unvisited:
+                through = best[node] + minutes[node][other]
+                if through < best[other]:
+                    best[other] = through
+        return best
+
+
+    # Calls attempt(trucks, drivers) on as few rungs as it can and returns (trucks, drivers, result) for the smallest fleet that worked. attempt loads a fleet of that size and raises SystemExit when it can't, like PackageLoader does. The winning rung is the last one attempted, so whatever it left behind (the loaded fleet, the package state) is the plan.
+    def search(self, attempt):
+        self.report(VerbosityLevel.PROG, f"\nFleet sizing: at least {self.min_trucks} {plural(self.min_trucks, 'truck')} and {self.min_drivers} {plural(self.min_drivers, 'driver')}, at most {self.max_trucks} {plural(self.max_trucks, 'truck')}.")
+
+        low = first_rung(self.min_trucks, self.min_drivers)
+        top = first_rung(self.max_trucks, self.max_trucks)
+
+        # Gallop until a rung works. Everything below 'failed' is known not to.
+        failed = None
+        step = 1
+        rung = low
+        while True:
+            result = self.try_rung(rung, attempt)
+            if result is not None:
+                break
+            if rung == top:
+                raise SystemExit(f"No feasible plan with up to {self.max_trucks} trucks and drivers.")
+            failed = rung
+            rung = min(rung + step, top)
+            step *= 2
+
+        # Binary search between the last failure and the first success.
+        found = rung
+        while failed is not None and found - failed > 1:
+            middle = (failed + found) // 2
+            middle_result = self.try_rung(middle, attempt)
+            if middle_result is None:
+                failed = middle
+            else:
+                found, result = middle, middle_result
+
+        trucks, drivers = rung_fleet(found)
+        # The search may have finished on a failed rung, which left its own state behind; load the winner again.
+        if self.attempts[-1][:2] != (trucks, drivers):
+            result = self.try_rung(found, attempt)
+
+        self.report(VerbosityLevel.PROG, f"\nFleet sizing: {trucks} {plural(trucks, 'truck')} and {drivers} {plural(drivers, 'driver')} after {len(self.attempts)} {plural(len(self.attempts), 'attempt')}.")
+        return trucks, drivers, result
+
+
+    # Returns what attempt returned, or None if it found no feasible plan.
+    def try_rung(self, rung, attempt):
+        trucks, drivers = rung_fleet(rung)
+        try:
+            result = attempt(trucks, drivers)
+        except SystemExit:
+            self.attempts.append((trucks, drivers, False))
+            self.report(VerbosityLevel.PROG, f"[fleet sizing] No feasible plan with {trucks} {plural(trucks, 'truck')} and {drivers} {plural(drivers, 'driver')}.")
+            return None
+        self.attempts.append((trucks, drivers, True))
+        return result
+
+
+    def report(self, level, message):
+        if self.reporter is not None:
+            self.reporter.report(level, message)
+
+
+
+# Helper functions
+
+# The fleet on rung k of the old retry ladder: (1, 1), (2, 1), (2, 2), (3, 2), ...
+def rung_fleet(rung):
+    return 1 + (rung + 1) // 2, 1 + rung // 2
+
+# The lowest rung with at least this many trucks and drivers.
+def first_rung(trucks, drivers):
+    return max(0, 2 * trucks - 3, 2 * drivers - 2)
+
+# An 'X' package's address is wrong until it is corrected mid-route, so where it starts out says nothing about when it can be delivered.
+def is_rerouted(pkg):
+    return get_note_tag(pkg.special_note) == 'X'
+
+def plural(count, word):
+    return word if count == 1 else word + "s"
+#jjg
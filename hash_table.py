@@ -6,32 +6,105 @@
 #   package weight
 #   delivery status (i.e., at the hub, en route, or delivered), including the delivery time
 
+from package import Package, get_note_tag
+
+# Open addressing with linear probing: each slot holds a (key, obj) pair, None if it has never been used, or DELETED if its entry was removed. Removed slots have to stay distinct from empty ones so that a search keeps probing past them.
+class Tombstone:
+    # Probing finds removed slots with 'is DELETED', so copying or pickling a table must not make a second tombstone. HashTable.copy shares the slot list's entries, but copy.deepcopy (still used by the warehouse_reset benchmark's reference reset) and pickle rebuild every object they reach.
+    def __copy__(self):
+        return self
+    def __deepcopy__(self, memo):
+        return self
+    def __reduce__(self):
+        return "DELETED" # Pickled by reference to the module-level sentinel
+    def __repr__(self):
+        return "DELETED"
+
+DELETED = Tombstone()
+
 class HashTable:
+    # Grow once this fraction of the slots are taken (tombstones included), so a probe always reaches an empty slot quickly.
+    MAX_LOAD_FACTOR = 0.7
+    
     def __init__(self, size):
         if size <= 0:
             raise ValueError("HashTable size must be positive")
         self.size = size
-        self.table = [[] for _ in range(size)]
+        self.table = [None] * size
+        self.count = 0 # Live entries
+        self.used = 0  # Live entries plus tombstones
+        self.version = 0 # Bumped by every insert and remove, so holders can tell whether the set of packages changed
+        # Secondary indexes over the packages in the table: {field: {value: {package_id: package}}}, one per Package.INDEXED_FIELDS entry. Packages report their own changes through package_changed.
+        self.indexes = {field: {} for field in Package.INDEXED_FIELDS}
+    
     
+    def __len__(self):
+        return self.count
     
-    # Adding magic methods so that the HashTable object is iterable
-    #https://www.toppr.com/guides/python-guide/tutorials/python-advanced-topics/python-iterators/
+    
+    def __contains__(self, key):
+        return isinstance(key, int) and self.find_slot(key) is not None
+    
+    
+    # Iterating yields the stored packages themselves, in slot order. A generator rather than a cursor stored on the table, so loops over the same table can be nested.
     def __iter__(self):
-        self.iteration = 0
-        return self
-    def __next__(self):
-        #
-        #print("from hash_table.py: __next__ function # DEBUG ONLY
-        #print(f"{self.iteration} of {self.size}") # DEBUG ONLY
-        #
+        return self.packages()
+    
+    
+    def items(self):
+        for slot in self.table:
+            if slot is not None and slot is not DELETED:
+                yield slot
+    
+    
+    # Typed views over the table. Like __iter__ they are generators, so nothing is copied and callers can stop early.
+    def packages(self):
+        for _, obj in self.items():
+            yield obj
+    
+    
+    def ids(self):
+        for key, _ in self.items():
+            yield key
+    
+    
+    def by_status(self, status):
+        return iter(self.find_by('delivery_status', status))
+    
+    
+    # Index lookups. find_by returns a snapshot list, so callers may change the field they looked up while looping over the result.
+    def find_by(self, field, value):
+        return list(self.indexes[field].get(value, {}).values())
+    
+    
+    def index_values(self, field):
+        return list(self.indexes[field])
+    
+    
+    def add_to_indexes(self, key, pkg):
+        for field, index in self.indexes.items():
+            index.setdefault(index_value(field, getattr(pkg, field)), {})[key] = pkg
+        pkg.watchers.append(self)
+    
+    
+    def remove_from_indexes(self, key, pkg):
+        for field, index in self.indexes.items():
+            drop_from_index(index, index_value(field, getattr(pkg, field)), key)
+        pkg.watchers.remove(self)
+    
+    
+    # Called by Package.__setattr__ after a watched field has been reassigned.
+    def package_changed(self, pkg, field, old_value):
+        if field not in self.indexes:
+            return
+        old_key = index_value(field, old_value)
+        new_key = index_value(field, getattr(pkg, field))
+        if old_key == new_key:
+            return
         
-        if self.iteration < self.size:
-            bucket_index = self.hash(self.iteration)
-            bucket_list = self.table[bucket_index]
-            self.iteration += 1
-            return bucket_list
-        else:
-            raise StopIteration
+        index = self.indexes[field]
+        drop_from_index(index, old_key, pkg.package_id)
+        index.setdefault(new_key, {})[pkg.package_id] = pkg
     
     
     def hash(self, key):
@@ -41,52 +114,129 @@ class HashTable:
             raise ValueError("Hash failed: non integer passed as key")
     
     
+    # Returns the index of the slot holding key, or None if the key is not in the table.
+    def find_slot(self, key):
+        index = self.hash(key)
+        
+        # An empty slot ends the probe sequence; tombstones don't.
+        while self.table[index] is not None:
+            slot = self.table[index]
+            if slot is not DELETED and slot[0] == key:
+                return index
+            index = (index + 1) % self.size
+        return None
+    
+    
+    # Inserting an existing key keeps the original entry, as before.
     def insert(self, key, obj):
-        bucket_index = self.hash(key)
-        bucket_list = self.table[bucket_index]
+        index = self.hash(key)
+        free_index = None
+        
+        while self.table[index] is not None:
+            slot = self.table[index]
+            if slot is DELETED:
+                if free_index is None:
+                    free_index = index
+            elif slot[0] == key:
+                return
+            index = (index + 1) % self.size
         
-        if not any(item.package_id == key for item in bucket_list):
-            bucket_list.append(obj)
+        # Reuse the first tombstone on the probe path if there was one
+        if free_index is None:
+            free_index = index
+            self.used += 1
+        self.table[free_index] = (key, obj)
+        self.count += 1
+        self.version += 1
+        if isinstance(obj, Package):
+            self.add_to_indexes(key, obj)
+        
+        if self.used > self.size * self.MAX_LOAD_FACTOR:
+            self.resize(self.size * 2)
+    
+    
+    # Rehash every live entry into a table with new_size slots. Tombstones are dropped along the way; keys are already unique and the indexes don't change.
+    def resize(self, new_size):
+        entries = list(self.items())
+        self.size = new_size
+        self.table = [None] * new_size
+        self.used = len(entries)
+        for key, obj in entries:
+            index = self.hash(key)
+            while self.table[index] is not None:
+                index = (index + 1) % new_size
+            self.table[index] = (key, obj)
+    
+    
+    # A new table over the same entries. The package objects are shared, not copied.
+    def copy(self):
+        clone = HashTable(self.size)
+        clone.table = list(self.table)
+        clone.count = self.count
+        clone.used = self.used
+        for key, obj in clone.items():
+            if isinstance(obj, Package):
+                clone.add_to_indexes(key, obj)
+        return clone
+    
+    
+    # Stop receiving field changes from the packages in this table, once it is no longer used.
+    def detach(self):
+        for _, obj in self.items():
+            if isinstance(obj, Package) and self in obj.watchers:
+                obj.watchers.remove(self)
     
     
     def search(self, key):
-        bucket_index = self.hash(key)
-        bucket_list = self.table[bucket_index]
-        
-        for item in bucket_list:
-            if item.package_id == key:
-                return item
-        return None
+        index = self.find_slot(key)
+        if index is None:
+            return None
+        return self.table[index][1]
     
     # Part B of the project.
     def lookup_function(self, key):
-        bucket_index = self.hash(key)
-        bucket_list = self.table[bucket_index]
+        item = self.search(key)
+        if item is None:
+            return None
         
-        for item in bucket_list:
-            if item.package_id == key:
-                
-                # Return a tuple containing each of the required data components.
-                return (item.address, item.delivery_deadline, item.city, item.zip_code, item.weight_kilo, item.delivery_status)
-        return None
+        # Return a tuple containing each of the required data components.
+        return (item.address, item.delivery_deadline, item.city, item.zip_code, item.weight_kilo, item.delivery_status)
     
     
     def remove(self, key, obj):
-        bucket_index = self.hash(key)
-        bucket_list = self.table[bucket_index]
+        index = self.find_slot(key)
         
-        if obj in bucket_list:
-            bucket_list.remove(obj)
+        if index is not None and self.table[index][1] == obj:
+            self.table[index] = DELETED
+            self.count -= 1
+            self.version += 1
+            if isinstance(obj, Package):
+                self.remove_from_indexes(key, obj)
             return True
         else:
             return False
     
     
     def print_hash_table(self):
-        for index, bucket in enumerate(self.table):
-            if bucket: # Only print non-empty buckets
-                print(f"  Bucket {index}:")
-                for data in bucket:
-                    print(f"    {data}")
+        for index, slot in enumerate(self.table):
+            if slot is not None and slot is not DELETED: # Only print occupied slots
+                print(f"  Slot {index}:")
+                print(f"    {slot[1]}")
+    
+
+# Helper functions
+
+# Special notes are indexed by their tag; every other field by its value.
+def index_value(field, value):
+    return get_note_tag(value) if field == 'special_note' else value
+    
+
+def drop_from_index(index, value, key):
+    bucket = index.get(value)
+    if bucket is None:
+        return
+    bucket.pop(key, None)
+    if not bucket:
+        del index[value]
     
-# jjg
\ No newline at end of file
+# jjg
@@ -1,7 +1,13 @@
 import random
+from operator import itemgetter
+try:
+    import numpy as np
+except ImportError:
+    np = None
 from warehouse_repository import get_warehouse_hash
 from address_repository import get_address_list, address_to_index
 from distance_repository import get_distance_matrix
+from random_repository import get_planner_rng
 from package import Package, print_package_list, print_group_list
 
 def split_package_list(truck, package_groups, package_list):
@@ -12,8 +18,8 @@ def split_package_list(truck, package_groups, package_list):
     returned_to_package_groups = []
     # Check the capacity of the truck against the length of the package_list.
     while truck.current_capacity < len(package_list):
-        # If the package_list is too large to add to the empty truck, use k_means to intelligently split the package_list into two groups, sorted in descending order.
-        k_means_groups = k_means_clustering(package_list, 2)
+        # If the package_list is too large to add to the empty truck, use k_means to intelligently split the package_list into two groups, sorted in descending order. The starting centroids come from the planner's RNG so a seeded run always splits the same way.
+        k_means_groups = k_means_clustering(package_list, 2, get_planner_rng())
         
         '''# DEBUG ONLY
         print(f"\n\nempty_truck current_capacity: {truck.current_capacity}\n")
@@ -48,68 +54,17 @@ def split_package_list(truck, package_groups, package_list):
     
 
 # K-Means Algorithm
+# Strictly this is k-medoids: every centroid is one of the packages. The work is done by MedoidClustering below.
 
-def k_means_clustering(package_list, k):
-    address_list = get_address_list()
-    distance_matrix = get_distance_matrix()
+def k_means_clustering(package_list, k, rng=None):
+    # Step 1: Randomly select k initial centroids (the addresses of k packages).
+    centroids = select_unique_package_address(package_list, k, rng)
     
-    # Step 1: Randomly select k initial centroids (the addresses of first k packages).
-    centroids = select_unique_package_address(package_list, k)
-    previous_centroids = []
+    # Steps 2 and 3: assign packages to the nearest centroid and move each centroid to the middle of its cluster until nothing changes, then try swapping centroids for any cheaper ones.
+    clustering = MedoidClustering(package_list)
+    clustering.fit(centroids)
+    cluster_list = clustering.clusters()
     
-    while centroids != previous_centroids:
-        centroid_address_list_index = []
-        for centroid in centroids:
-            index = address_to_index(centroid.address, address_list)
-            centroid_address_list_index.append(index)
-        
-        
-        # Step 2: Assign each package to the nearest centroid
-        cluster_list = [[] for _ in range(k)] # Utilize list comprehension to initialize k clusters
-        
-        #print("for each package:")
-        for package in package_list: # For each package...
-            
-            # ... the distances from the package address ...
-            package_index = address_to_index(package.address, address_list)
-            
-            distances = []
-            
-            # ... to each centroid are calculated...
-            for i in range(k):
-                centroid_index = centroid_address_list_index[i]
-                # ... and stored in the distances list.
-                distances.append(distance_matrix[package_index][centroid_index])
-            
-            '''# DEBUG ONLY
-            print(f"package_index: {package_index} ::: centroid_index: {centroid_index}")
-            print(f"package.address: {package.address} ::: centroid.address: {centroid.address}")
-            print("distances:", distances) # DEBUG ONLY
-            '''#
-            # The centroid with the minimum distance determines which centroid is assigned to closest_centroid...
-            closest_centroid = distances.index(min(distances))
-            
-            #
-            #print("closest_centroid:", closest_centroid) # DEBUG ONLY
-            #
-            
-            # ... and then the package is added to the cluster that contains the closest_centroid.
-            cluster_list[closest_centroid].append(package)
-            
-            #
-            #
-        
-        #print("exited the for loop")
-        # Step 3: Update the centroids for each cluster
-        previous_centroids = centroids
-        centroids = []
-        
-        
-        for i in range(k):
-            if cluster_list[i]:
-                new_centroid = find_new_centroid(cluster_list[i])
-                centroids.append(new_centroid)
-                
     sorted_cluster_list = sorted(cluster_list, key=len, reverse=True)
     
     # DEBUG ONLY
@@ -119,31 +74,190 @@ def k_means_clustering(package_list, k):
     
     return sorted_cluster_list
 
+
+# The medoid engine. Each package's distance matrix index is resolved once, packages sharing an address collapse into one weighted point, and the distances between those points are copied out of the matrix once. Each cluster then keeps, for every point, the summed distance from the cluster's packages to it, so moving a point between clusters updates two rows instead of recomputing find_new_centroid's O(|cluster|^2) sums.
+# With NumPy the distances, sums and swap scoring are arrays; without it, the same steps run over lists.
+class MedoidClustering:
+    def __init__(self, package_list):
+        self.package_list = package_list
+        
+        self.point_indices = [] # distance matrix index of each point
+        self.weights = []       # number of packages at each point
+        self.package_points = []
+        self.point_of_index = {}
+        for package in package_list:
+            index = get_package_index(package)
+            if index not in self.point_of_index:
+                self.point_of_index[index] = len(self.point_indices)
+                self.point_indices.append(index)
+                self.weights.append(0)
+            point = self.point_of_index[index]
+            self.weights[point] += 1
+            self.package_points.append(point)
+        
+        distance_matrix = get_distance_matrix()
+        self.vectorized = np is not None
+        if self.vectorized:
+            if isinstance(distance_matrix, np.ndarray):
+                self.distances = distance_matrix[np.ix_(self.point_indices, self.point_indices)].astype(np.float64)
+            else:
+                self.distances = np.array(submatrix(distance_matrix, self.point_indices), dtype=np.float64)
+            self.weights = np.array(self.weights, dtype=np.float64)
+        else:
+            self.distances = submatrix(distance_matrix, self.point_indices)
+        
+        self.medoids = []
+        self.labels = []
+        self.sums = []
+    
+    
+    # Runs the clustering from the given initial centroid packages and returns the final medoid points.
+    def fit(self, centroids, max_swaps=100):
+        self.medoids = [self.point_of_index[get_package_index(centroid)] for centroid in centroids]
+        self.labels = self.nearest_labels()
+        self.build_sums()
+        
+        # Voronoi iteration: move each medoid to the member with the smallest summed distance, reassign, repeat.
+        while True:
+            new_medoids = [self.best_member(c) for c in range(len(self.medoids))]
+            if new_medoids == self.medoids:
+                break
+            self.medoids = new_medoids
+            self.reassign()
+        
+        # PAM-style swap phase: replace a medoid with a non-medoid point whenever that lowers the total distance. The iteration above can stop in a local optimum that a swap across clusters gets out of.
+        for _ in range(max_swaps):
+            swap = self.best_swap()
+            if swap is None:
+                break
+            slot, point = swap
+            self.medoids[slot] = point
+            self.reassign()
+        
+        return self.medoids
+    
+    
+    # Each point's nearest medoid, first medoid on a tie (same as distances.index(min(distances))).
+    def nearest_labels(self):
+        if self.vectorized:
+            return np.argmin(self.distances[:, self.medoids], axis=1).tolist()
+        return [min(range(len(self.medoids)), key=lambda c: row[self.medoids[c]]) for row in self.distances]
+    
+    
+    # sums[c][q] is the distance from every package in cluster c to point q.
+    def build_sums(self):
+        if self.vectorized:
+            labels = np.array(self.labels)
+            self.sums = np.stack([(self.weights * (labels == c)) @ self.distances for c in range(len(self.medoids))])
+            return
+        self.sums = [[0] * len(self.point_indices) for _ in self.medoids]
+        for point, label in enumerate(self.labels):
+            self.move_point(point, None, label)
+    
+    
+    # Moves a point's packages from one cluster's sums to another's (either may be None).
+    def move_point(self, point, old, new):
+        weight = self.weights[point]
+        row = self.distances[point]
+        if self.vectorized:
+            if old is not None:
+                self.sums[old] -= weight * row
+            if new is not None:
+                self.sums[new] += weight * row
+            return
+        for cluster, sign in ((old, -1), (new, 1)):
+            if cluster is not None:
+                sums = self.sums[cluster]
+                for q, distance in enumerate(row):
+                    sums[q] += sign * weight * distance
+    
+    
+    # Reassigns every point to its nearest medoid and moves only the points whose cluster changed in the sums.
+    def reassign(self):
+        old_labels = self.labels
+        self.labels = self.nearest_labels()
+        for point, (old, new) in enumerate(zip(old_labels, self.labels)):
+            if old != new:
+                self.move_point(point, old, new)
+    
+    
+    # The member of cluster c with the smallest summed distance to the rest, first point on a tie. An empty cluster keeps its medoid.
+    def best_member(self, c):
+        members = [point for point, label in enumerate(self.labels) if label == c]
+        if not members:
+            return self.medoids[c]
+        sums = self.sums[c]
+        return min(members, key=lambda point: sums[point])
+    
+    
+    # Returns the (medoid slot, point) swap that lowers the total distance the most, or None. For each point, the distance to its nearest and second nearest medoid tells what removing any medoid would cost, so every candidate is scored in one pass over the points.
+    def best_swap(self):
+        nearest, second = [], []
+        for point, label in enumerate(self.labels):
+            row = self.distances[point]
+            nearest.append(row[self.medoids[label]])
+            others = [row[m] for c, m in enumerate(self.medoids) if c != label]
+            second.append(min(others) if others else float('inf'))
+        current = sum(w * d for w, d in zip(self.weights, nearest))
+        
+        best_delta, best_swap = -1e-9, None
+        for slot in range(len(self.medoids)):
+            # Distance from each point to the medoids left after removing this slot
+            remaining = [s if label == slot else n for n, s, label in zip(nearest, second, self.labels)]
+            for candidate, cost in enumerate(self.swap_costs(remaining)):
+                if candidate not in self.medoids and cost - current < best_delta:
+                    best_delta, best_swap = cost - current, (slot, candidate)
+        return best_swap
+    
+    
+    # Total distance if each point went to the closer of `remaining` and the candidate, for every candidate point at once.
+    def swap_costs(self, remaining):
+        if self.vectorized:
+            return (self.weights @ np.minimum(self.distances, np.array(remaining)[:, None])).tolist()
+        return [sum(w * (d if d < r else r) for w, d, r in zip(self.weights, column, remaining)) for column in zip(*self.distances)]
+    
+    
+    # The clusters as lists of packages, in package_list order, one per medoid.
+    def clusters(self):
+        cluster_list = [[] for _ in self.medoids]
+        for package, point in zip(self.package_list, self.package_points):
+            cluster_list[self.labels[point]].append(package)
+        return cluster_list
+    
+    
+    def total_distance(self):
+        return sum(self.weights[point] * self.distances[point][self.medoids[label]] for point, label in enumerate(self.labels))
+
+
+# Returns the package in the cluster with the smallest summed distance to the others. MedoidClustering keeps these sums cached; this is the stand-alone version, with each index resolved once rather than once per pair.
 def find_new_centroid(cluster):
-    address_list = get_address_list()
     distance_matrix = get_distance_matrix()
+    cluster_indices = [get_package_index(package) for package in cluster]
     
     min_sum = float('inf')
     new_centroid = None
-    for candidate in cluster:
-        distance_sum = 0
-        candidate_index = address_to_index(candidate.address, address_list)
-        for neighbor in cluster:
-            neighbor_index = address_to_index(neighbor.address, address_list)
-            distance_sum += distance_matrix[candidate_index][neighbor_index]
+    for candidate, candidate_index in zip(cluster, cluster_indices):
+        row = distance_matrix[candidate_index]
+        distance_sum = sum(row[neighbor_index] for neighbor_index in cluster_indices)
         if distance_sum < min_sum:
             min_sum = distance_sum
             new_centroid = candidate
     #print(f"min_sum: {min_sum}, new_centroid: {new_centroid}")
     return new_centroid
     
-# This will make sure that the centroids have unique addresses (I was getting strange bugs for occasional indexes out of bounds.)
-def select_unique_package_address(package_list, k):
+# This will make sure that the centroids have unique addresses (I was getting strange bugs for occasional indexes out of bounds.) Pass a random.Random as rng for repeatable picks; otherwise the global random module is used.
+def select_unique_package_address(package_list, k, rng=None):
+    if rng is None:
+        rng = random
+    # Without k distinct addresses the loop below would never finish
+    if len({package.address for package in package_list}) < k:
+        raise ValueError(f"Need {k} distinct addresses to pick centroids from")
+    
     unique_package_list = []
     unique_address_list = []
     
     while len(unique_package_list) < k:
-        test_package = random.choice(package_list)
+        test_package = rng.choice(package_list)
         
         if test_package.address not in unique_address_list:
             unique_package_list.append(test_package)
@@ -152,6 +266,21 @@ def select_unique_package_address(package_list, k):
     return unique_package_list
     
 
+# Helper that copies the rows and columns of a list-of-lists matrix for the given indices. itemgetter pulls a whole row's worth of columns in one call, which is most of the engine's setup time on big clusters.
+def submatrix(matrix, indices):
+    if len(indices) == 1:
+        return [[matrix[indices[0]][indices[0]]]]
+    pick = itemgetter(*indices)
+    return [list(pick(matrix[a])) for a in indices]
+    
+
+# Helper that returns the distance matrix index of a package, preferring the index cached at load time.
+def get_package_index(package):
+    if package.address_index is not None:
+        return package.address_index
+    return address_to_index(package.address)
+    
+
 def print_clusters(clusters):
     for i, cluster in enumerate(clusters):
         print(f"Cluster {i + 1}:")
@@ -0,0 +1,258 @@
+import time
+from distance_repository import get_distance_matrix
+from package import Package, get_note_tag
+from route_optimizer import RouteSchedule
+from time_utils import get_travel_minutes_matrix, get_route_departure_minutes
+from two_opt import RouteImprover, location_index, EPSILON
+from tools.reporter import VerbosityLevel
+
+# Longest run of stops cross-exchange swaps between two routes.
+MAX_SEGMENT = 3
+
+# Keeps improving a loaded fleet for a fixed number of seconds. PackageLoader commits one working group at a time and never looks back; this starts from whatever it built and moves packages between trucks:
+#   relocate        - move a package (or a whole 'W' group) to the cheapest spot on another truck
+#   exchange        - swap a package or group on one truck with one on another
+#   cross-exchange  - swap runs of up to MAX_SEGMENT stops between two routes, in place
+# After every accepted move the changed routes are reordered with the 2-opt improver.
+# A plan is scored on (minutes late, miles) with the simulation's own departure rule (a truck without a driver leaves when the first driver gets back), so the held plan is always the best one seen and never later than the greedy one. 'T' and 'X' packages, and any group holding one, stay where they are.
+# Candidates are tried in a fixed order, so if the search runs out of moves before the budget the result only depends on the plan it started from.
+class LoadPlanOptimizer:
+    def __init__(self, fleet, time_budget, reporter=None, polish_routes=True):
+        self.trucks = list(fleet.truck_list)
+        self.time_budget = time_budget
+        self.reporter = reporter
+        self.polish_routes = polish_routes
+        self.routes = [list(truck.package_list) for truck in self.trucks]
+        # A driver truck that leaves empty never gets a return time, which the delivery timeline needs, so loaded driver trucks stay loaded.
+        self.keep_loaded = [bool(truck.driver) and bool(route) for truck, route in zip(self.trucks, self.routes)]
+        self.cost = self.evaluate(self.routes)
+        self.moves = 0
+
+
+    # Searches until no move helps or time_budget seconds have passed, then loads the best plan onto the trucks. Returns its (minutes late, miles).
+    def optimize(self):
+        started = time.perf_counter()
+        stop_at = started + self.time_budget
+        initial_cost = self.cost
+
+        improved = True
+        while improved:
+            improved = False
+            for description, changes in self.candidates():
+                if time.perf_counter() >= stop_at:
+                    break
+                if changes is not None and self.try_candidate(description, changes):
+                    improved = True
+                    break
+
+        self.apply()
+        self.report(VerbosityLevel.PROG, f"\nLoad plan optimizer: {initial_cost[1]:.1f} -> {self.cost[1]:.1f} miles after {self.moves} moves in {time.perf_counter() - started:.2f}s")
+        return self.cost
+
+
+    # Yields (description, {truck index: new route}); changes is None when a move doesn't fit.
+    def candidates(self):
+        count = len(self.trucks)
+        for a in range(count):
+            for unit in self.units(a):
+                for b in range(count):
+                    if b != a:
+                        yield f"relocate {package_ids(unit)} from Truck {self.truck_number(a)} to Truck {self.truck_number(b)}", self.relocate(unit, a, b)
+
+        for a in range(count):
+            for b in range(a + 1, count):
+                for unit_a in self.units(a):
+                    for unit_b in self.units(b):
+                        yield f"exchange {package_ids(unit_a)} on Truck {self.truck_number(a)} with {package_ids(unit_b)} on Truck {self.truck_number(b)}", self.exchange(unit_a, a, unit_b, b)
+
+        for a in range(count):
+            for b in range(a + 1, count):
+                for i, segment_a in self.segments(a):
+                    for j, segment_b in self.segments(b):
+                        yield f"cross-exchange {package_ids(segment_a)} on Truck {self.truck_number(a)} with {package_ids(segment_b)} on Truck {self.truck_number(b)}", self.cross_exchange(i, segment_a, a, j, segment_b, b)
+
+
+    def relocate(self, unit, a, b):
+        if len(self.routes[b]) + len(unit) > self.trucks[b].maximum_capacity:
+            return None
+        return {a: without(self.routes[a], unit), b: self.insert(b, self.routes[b], unit)}
+
+
+    def exchange(self, unit_a, a, unit_b, b):
+        if len(self.routes[a]) - len(unit_a) + len(unit_b) > self.trucks[a].maximum_capacity:
+            return None
+        if len(self.routes[b]) - len(unit_b) + len(unit_a) > self.trucks[b].maximum_capacity:
+            return None
+        return {a: self.insert(a, without(self.routes[a], unit_a), unit_b), b: self.insert(b, without(self.routes[b], unit_b), unit_a)}
+
+
+    def cross_exchange(self, i, segment_a, a, j, segment_b, b):
+        route_a, route_b = self.routes[a], self.routes[b]
+        if len(route_a) - len(segment_a) + len(segment_b) > self.trucks[a].maximum_capacity:
+            return None
+        if len(route_b) - len(segment_b) + len(segment_a) > self.trucks[b].maximum_capacity:
+            return None
+        return {a: route_a[:i] + segment_b + route_a[i + len(segment_a):], b: route_b[:j] + segment_a + route_b[j + len(segment_b):]}
+
+
+    def try_candidate(self, description, changes):
+        routes = list(self.routes)
+        for index, route in changes.items():
+            routes[index] = route
+        if any(keep and not route for keep, route in zip(self.keep_loaded, routes)):
+            return False
+
+        cost = self.evaluate(routes)
+        if not better(cost, self.cost):
+            return False
+
+        if self.polish_routes:
+            polished = self.polish(routes, changes)
+            polished_cost = self.evaluate(polished)
+            # Reordering one truck can change when a waiting truck leaves, so it is only kept if the plan as a whole is no worse.
+            if not better(cost, polished_cost):
+                routes, cost = polished, polished_cost
+
+        self.report(VerbosityLevel.INFO, f"  Load plan: {description}: {self.cost[1]:.1f} -> {cost[1]:.1f} miles")
+        self.routes = routes
+        self.cost = cost
+        self.moves += 1
+        return True
+
+
+    def polish(self, routes, changes):
+        departures = self.departures(routes)
+        polished = list(routes)
+        for index in changes:
+            truck = self.trucks[index]
+            _, polished[index] = RouteImprover(routes[index], truck.speed_mph, truck.departure_address, departure_minutes=departures[index]).improve()
+        return polished
+
+
+    # Inserts the packages one at a time at their cheapest on-time position, or their cheapest position if there is none on time (the plan evaluation has the final say).
+    def insert(self, index, route, packages):
+        truck = self.trucks[index]
+        combined = route + list(packages)
+        departure = get_route_departure_minutes(combined)
+        wait = self.departures(self.routes)[index]
+        if not truck.driver:
+            departure = max(departure, wait)
+        enforce_deadlines = any(pkg.delivery_deadline != Package.EOD_TIME for pkg in combined)
+
+        schedule = RouteSchedule(route, truck.speed_mph, departure, enforce_deadlines, truck.departure_address)
+        for pkg in packages:
+            insertion = schedule.best_insertion(pkg) if schedule.is_feasible() else None
+            if insertion is None:
+                insertion = RouteSchedule(schedule.route, truck.speed_mph, departure, False, truck.departure_address).best_insertion(pkg)
+            schedule.insert(pkg, insertion[0])
+        return schedule.route
+
+
+    # Departure minute of every truck: drivers leave as soon as their packages are in, everyone else when the first driver gets back (see DeliveryHandler.build_delivery_list).
+    def departures(self, routes):
+        departures = [get_route_departure_minutes(route) for route in routes]
+        returns = [self.route_stats(truck, route, departures[i])[2] for i, (truck, route) in enumerate(zip(self.trucks, routes)) if truck.driver and route]
+        if returns:
+            first_return = min(returns)
+            for i, truck in enumerate(self.trucks):
+                if not truck.driver:
+                    departures[i] = max(departures[i], first_return)
+        return departures
+
+
+    # (minutes late, miles) for the whole plan.
+    def evaluate(self, routes):
+        departures = self.departures(routes)
+        late = 0
+        distance = 0.0
+        for truck, route, departure in zip(self.trucks, routes, departures):
+            route_late, route_distance, _ = self.route_stats(truck, route, departure)
+            late += route_late
+            distance += route_distance
+        return late, distance
+
+
+    # (minutes late, miles, return minute) of one truck's route. Deadlines only count if the route has one, like check_route_feasibility.
+    def route_stats(self, truck, route, departure):
+        distance_matrix = get_distance_matrix()
+        minutes = get_travel_minutes_matrix(truck.speed_mph)
+        enforce_deadlines = any(pkg.delivery_deadline != Package.EOD_TIME for pkg in route)
+
+        hub = prev = location_index(truck.departure_address)
+        arr_minutes = departure
+        late = 0
+        distance = 0.0
+        for pkg in route:
+            here = location_index(pkg.location)
+            arr_minutes += minutes[prev][here]
+            distance += distance_matrix[prev][here]
+            if enforce_deadlines and pkg.deadline_minutes is not None and arr_minutes > pkg.deadline_minutes:
+                late += arr_minutes - pkg.deadline_minutes
+            prev = here
+        if route:
+            arr_minutes += minutes[prev][hub]
+            distance += distance_matrix[prev][hub]
+        return late, float(distance), arr_minutes
+
+
+    # The packages on a truck that may move, as tuples that move together: a lone package, or every package of a group on that truck. Groups holding a pinned package stay put.
+    def units(self, index):
+        groups = {}
+        units = []
+        for pkg in self.routes[index]:
+            if pkg.group is None:
+                units.append([pkg])
+            elif pkg.group in groups:
+                groups[pkg.group].append(pkg)
+            else:
+                groups[pkg.group] = [pkg]
+                units.append(groups[pkg.group])
+        return [tuple(unit) for unit in units if not any(is_pinned(pkg) for pkg in unit)]
+
+
+    # (position, run) for every run of 1 to MAX_SEGMENT consecutive stops on a truck that are neither pinned nor grouped.
+    def segments(self, index):
+        route = self.routes[index]
+        for i in range(len(route)):
+            for length in range(1, MAX_SEGMENT + 1):
+                segment = route[i:i + length]
+                if len(segment) < length or any(is_pinned(pkg) or pkg.group is not None for pkg in segment):
+                    break
+                yield i, segment
+
+
+    def apply(self):
+        for truck, route in zip(self.trucks, self.routes):
+            truck.package_list = route
+            truck.current_capacity = truck.maximum_capacity - len(route)
+            for pkg in route:
+                if pkg.truck != truck.truck_id:
+                    pkg.truck = truck.truck_id
+
+
+    def truck_number(self, index):
+        truck_id = self.trucks[index].truck_id
+        return truck_id + 1 if truck_id is not None else index + 1
+
+
+    def report(self, level, message):
+        if self.reporter is not None:
+            self.reporter.report(level, message)
+
+
+
+# Helper functions
+
+# 'T' packages are tied to their truck and 'X' packages get a new address mid-route.
+def is_pinned(pkg):
+    return get_note_tag(pkg.special_note) in ('T', 'X')
+
+def without(route, packages):
+    return [pkg for pkg in route if not any(pkg is other for other in packages)]
+
+def package_ids(packages):
+    return ', '.join(str(pkg.package_id) for pkg in packages)
+
+def better(cost, other):
+    return cost[0] < other[0] or (cost[0] == other[0] and cost[1] < other[1] - EPSILON)
+#jjg
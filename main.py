@@ -1,13 +1,16 @@
 from warehouse_repository import set_warehouse_hash, get_warehouse_hash, set_warehouse_base, reset_warehouse
 from address_repository import set_address_list
+from random_repository import set_planner_seed
 from distance_repository import set_distance_matrix, print_distance_matrix
 from project_data import read_package_data, read_address_data, read_distance_data
 from package import print_package_list, print_group_list
 from truck import Truck
 from fleet import Fleet
+from fleet_sizing import FleetSizer
 from package_handler import PackageHandler
 from package_loader import PackageLoader
 from delivery_handler import DeliveryHandler
+from sim_clock import CLOCKS, make_clock
 from tools.reporter import Reporter, VerbosityLevel
 import argparse
 
@@ -25,9 +28,73 @@ parser.add_argument(
     default="default.csv",
     help="CSV filename to load package data from"
 )
+parser.add_argument(
+    "-m", "--matrix",
+    choices=["list", "float32", "float64"],
+    default="list",
+    help="Distance matrix backend (list = pure Python, float32/float64 = NumPy ndarray)"
+)
+parser.add_argument(
+    "-l", "--loading",
+    choices=["rebuild", "incremental"],
+    default="rebuild",
+    help="How candidate truck routes are evaluated while loading (rebuild = nearest neighbor on the whole route, incremental = cheapest insertion into the current route)"
+)
+parser.add_argument(
+    "-c", "--columns",
+    action="store_true",
+    help="Run the priority and group/sort passes on a NumPy column copy of the packages instead of package by package"
+)
+parser.add_argument(
+    "-i", "--improve",
+    action="store_true",
+    help="Improve each candidate truck route with 2-opt, Or-opt and relocate moves before checking it against the deadlines"
+)
+parser.add_argument(
+    "-b", "--improve_budget",
+    type=float,
+    default=None,
+    metavar="SECONDS",
+    help="With --improve, spend at most SECONDS improving each route (default: run each route to a local optimum, which keeps seeded runs repeatable)"
+)
+parser.add_argument(
+    "-o", "--optimize",
+    type=float,
+    default=None,
+    metavar="SECONDS",
+    help="After loading, spend up to SECONDS moving packages between trucks (relocate, exchange, cross-exchange) to cut the total miles"
+)
+parser.add_argument(
+    "-s", "--seed",
+    type=int,
+    default=None,
+    help="Seed the planner's random choices (k-means starting centroids) so the same input always gives the same plan"
+)
+parser.add_argument(
+    "-k", "--clock",
+    choices=list(CLOCKS),
+    default="accelerated",
+    help="How simulated time passes while delivering (virtual = no waiting, accelerated = each leg sleeps its travel time sped up, wall = in step with the real clock)"
+)
+parser.add_argument(
+    "-q", "--quiet",
+    action="store_true",
+    help="Don't print each delivery event as it happens, only the final route distances (with --clock virtual, for headless runs)"
+)
 args = parser.parse_args()
+if args.improve_budget is not None and not args.improve:
+    parser.error("--improve_budget only applies with --improve")
 VERBOSITY = args.verbosity
 package_list = args.package_csv
+MATRIX_DTYPE = None if args.matrix == "list" else args.matrix
+INCREMENTAL_LOADING = args.loading == "incremental"
+COLUMNAR_PLANNING = args.columns
+IMPROVE_ROUTES = args.improve
+IMPROVE_BUDGET = args.improve_budget
+OPTIMIZE_SECONDS = args.optimize
+SEED = args.seed
+CLOCK = args.clock
+QUIET = args.quiet
 
 reporter = Reporter(VERBOSITY)
 
@@ -42,6 +109,16 @@ def read_data(package_list):
     reporter.report(VerbosityLevel.PROG, "-----------------------------------")
 
 
+    # Read address data from addressCSV.csv file and store in the 'address_list'. This comes first so that each package can cache the index of its address.
+    reporter.report(VerbosityLevel.PROG, "\nReading address data from addressCSV.csv file and storing in the 'address_list'...")
+
+    address_list = read_address_data('addressCSV.csv')
+    set_address_list(address_list)
+
+    reporter.report(VerbosityLevel.INFO, "\nPrinting address_list:")
+    reporter.run_if(VerbosityLevel.INFO, lambda: [print(a) for a in address_list])
+
+
     # Read package data from packageCSV.csv file and store in the data_repository module for global access
     reporter.report(VerbosityLevel.PROG, "\nReading package data from packageCSV.csv file and storing in the 'warehouse_hash' table...")
 
@@ -54,20 +131,10 @@ def read_data(package_list):
     reporter.run_if(VerbosityLevel.INFO, warehouse_hash.print_hash_table)
 
 
-    # Read address data from addressCSV.csv file and store in the 'address_list'
-    reporter.report(VerbosityLevel.PROG, "\nReading address data from addressCSV.csv file and storing in the 'address_list'...")
-
-    address_list = read_address_data('addressCSV.csv')
-    set_address_list(address_list)
-
-    reporter.report(VerbosityLevel.INFO, "\nPrinting address_list:")
-    reporter.run_if(VerbosityLevel.INFO, lambda: [print(a) for a in address_list])
-
-
     # Read distance data from distanceCSV.csv and store into a 2d symmetrical 'distance_matrix'
     reporter.report(VerbosityLevel.PROG, "\nReading distance data from distanceCSV.csv and storing into a 2d symmetrical 'distance_matrix'...")
 
-    distance_matrix = read_distance_data('distanceCSV.csv')
+    distance_matrix = read_distance_data('distanceCSV.csv', MATRIX_DTYPE)
     set_distance_matrix(distance_matrix)
 
     reporter.report(VerbosityLevel.INFO, "\nPrinting distance_matrix:")
@@ -78,29 +145,8 @@ def read_data(package_list):
     reporter.run_if(VerbosityLevel.PROG, input)
 
 
-def run(num_trucks, num_drivers):
-    reporter.report(VerbosityLevel.PROG, "\n\n")
-    reporter.report(VerbosityLevel.PROG, "-----------------------------------")
-    reporter.report(VerbosityLevel.PROG, "          PREPARING FLEET          ")
-    reporter.report(VerbosityLevel.PROG, "-----------------------------------")
-
-
-    # Instantiate a fleet with 3 trucks and 2 drivers
-    truck_word  = "truck"  if num_trucks  == 1 else "trucks"
-    driver_word = "driver" if num_drivers == 1 else "drivers"
-    drivers = [f"Driver{i+1}" for i in range(num_drivers)]
-    fleet = Fleet(num_trucks)
-    fleet.assign_drivers_to_trucks(drivers)
-
-    reporter.report(VerbosityLevel.PROG, f"\nInstantiating a fleet with {num_trucks} {truck_word} and {num_drivers} {driver_word}...")
-    reporter.report(VerbosityLevel.INFO, "\nPrinting fleet:")
-    reporter.run_if(VerbosityLevel.INFO, fleet.print_fleet)
-
-
-    reporter.report(VerbosityLevel.PROG, "\nPress Enter to continue...")
-    reporter.run_if(VerbosityLevel.PROG, input)
-
-
+# Everything about the packages that doesn't depend on the size of the fleet. fleet is only used to check the 'T' notes, so any fleet with FleetSizer's minimum number of trucks will do.
+def prepare_packages(fleet):
     reporter.report(VerbosityLevel.PROG, "\n\n")
     reporter.report(VerbosityLevel.PROG, "-----------------------------------")
     reporter.report(VerbosityLevel.PROG, "   HANDLING PACKAGE CONSTRAINTS    ")
@@ -109,7 +155,7 @@ def run(num_trucks, num_drivers):
 
     # Instantiate PackageHandler object, which contains the methods that manage sorting and categorization of packages.
     reporter.report(VerbosityLevel.PROG, "\nInstantiating PackageHandler object, which contains the methods that manage sorting and categorization of packages...")
-    package_handler = PackageHandler()
+    package_handler = PackageHandler(COLUMNAR_PLANNING)
 
 
     # Compare and set special notes and deadlines of packages that share an address. If no special note, create 'W' notes for each instead.
@@ -170,17 +216,6 @@ def run(num_trucks, num_drivers):
     reporter.run_if(VerbosityLevel.INFO, input)
 
 
-    reporter.report(VerbosityLevel.PROG, "\nHandling special note: 'Delayed on flight' ('D' notes) without a deadline...")
-    package_handler.handle_delayed_without_deadline_note(constraints_list, fleet)
-
-    reporter.report(VerbosityLevel.INFO, f"\nLength {len(constraints_list)} - all packages with special notes relating to delayed packages without a delivery deadline.\n")
-    reporter.run_if(VerbosityLevel.INFO, lambda: print_package_list(constraints_list))
-
-
-    reporter.report(VerbosityLevel.INFO, "\nPress Enter to continue...")
-    reporter.run_if(VerbosityLevel.INFO, input)
-
-
     # Handle special note: 'Must be delivered with x' ('W' notes). This clever algorithm uses the properties of sets to first build a list of sets before merging all sets that share common values into the smallest group of sets. The idea for handling this special note occured to me when I was boiling water; I watched while the condensation built until eventually the larger droplets bump into the smaller droplets and absorb them until their mass can no longer keep them hanging upside down and finally racing down the slope of the clear glass lid into the oblivion below. I had to work the KruskalsMinimumSpanningTree algorithm out by hand multiple times and augment it to fit my purposes, but I was thrilled enough with the results that I moved the logic for merging sets into a helper function. This algorithm also sets the package.group and the package.priority attributes of each package so they are sure to be loaded onto the same truck.
     reporter.report(VerbosityLevel.PROG, "\nHandling special note: 'Must be delivered with x' ('W' notes)...")
     constraints_list = package_handler.handle_with_package_note(constraints_list)
@@ -217,6 +252,54 @@ def run(num_trucks, num_drivers):
     reporter.run_if(VerbosityLevel.PROG, input)
 
 
+    return package_handler, load_ready_list
+
+
+# Loads a fleet of num_trucks trucks and num_drivers drivers from the prepared load_ready_list. Raises SystemExit when the loader can't find a feasible plan for this fleet, which FleetSizer takes as a failed attempt.
+def load_fleet(num_trucks, num_drivers, package_handler, load_ready_list):
+    # Put the warehouse back to the prepared packages, and re-seed, so an attempt's plan depends only on the input, the fleet and the seed, not on what earlier attempts did.
+    reset_warehouse()
+    set_planner_seed(SEED)
+
+    reporter.report(VerbosityLevel.PROG, "\n\n")
+    reporter.report(VerbosityLevel.PROG, "-----------------------------------")
+    reporter.report(VerbosityLevel.PROG, "          PREPARING FLEET          ")
+    reporter.report(VerbosityLevel.PROG, "-----------------------------------")
+
+
+    # Instantiate a fleet with 3 trucks and 2 drivers
+    truck_word  = "truck"  if num_trucks  == 1 else "trucks"
+    driver_word = "driver" if num_drivers == 1 else "drivers"
+    drivers = [f"Driver{i+1}" for i in range(num_drivers)]
+    fleet = Fleet(num_trucks)
+    fleet.assign_drivers_to_trucks(drivers)
+
+    reporter.report(VerbosityLevel.PROG, f"\nInstantiating a fleet with {num_trucks} {truck_word} and {num_drivers} {driver_word}...")
+    reporter.report(VerbosityLevel.INFO, "\nPrinting fleet:")
+    reporter.run_if(VerbosityLevel.INFO, fleet.print_fleet)
+
+
+    reporter.report(VerbosityLevel.PROG, "\nPress Enter to continue...")
+    reporter.run_if(VerbosityLevel.PROG, input)
+
+
+    # The 'D' notes without a deadline go on the first truck without a driver, so they are handled per fleet, along with the 'W' groups they drag along.
+    reporter.report(VerbosityLevel.PROG, "\nHandling special note: 'Delayed on flight' ('D' notes) without a deadline...")
+    package_list = [pkg for group in load_ready_list for pkg in group]
+    package_handler.assign_fleet_trucks(package_list, fleet)
+
+    reporter.report(VerbosityLevel.INFO, f"\nLength {len(package_list)} - all packages, with delayed packages without a delivery deadline (and their 'W' groups) assigned to a truck.\n")
+    reporter.run_if(VerbosityLevel.INFO, lambda: print_package_list(package_list))
+
+
+    reporter.report(VerbosityLevel.INFO, "\nPress Enter to continue...")
+    reporter.run_if(VerbosityLevel.INFO, input)
+
+
+    # The loader takes packages off the groups as it loads them, so every attempt gets its own copy.
+    load_ready_list = [list(group) for group in load_ready_list]
+
+
     reporter.report(VerbosityLevel.PROG, "\n\n")
     reporter.report(VerbosityLevel.PROG, "-----------------------------------")
     reporter.report(VerbosityLevel.PROG, "        LOADING THE TRUCKS         ")
@@ -224,7 +307,7 @@ def run(num_trucks, num_drivers):
 
     # Instantiate PackageLoader object, which contains the methods that manage decision around loading packages into trucks.
     reporter.report(VerbosityLevel.PROG, "\nInstantiating PackageLoader object, which contains the methods that manage decisions around loading packages into trucks...")
-    package_loader = PackageLoader()
+    package_loader = PackageLoader(INCREMENTAL_LOADING, IMPROVE_ROUTES, IMPROVE_BUDGET)
 
 
     # Iterate through the load_ready_list and load any package already assigned to a truck
@@ -255,6 +338,15 @@ def run(num_trucks, num_drivers):
     reporter.report(VerbosityLevel.PROG, "\nLoading the remaining packages onto remaining trucks...")
     package_loader.load_packages(fleet, load_ready_list, reporter)
 
+    return fleet, package_loader
+
+
+def deliver(fleet, package_loader):
+    # Optionally keep improving the whole load plan for a fixed number of seconds
+    if OPTIMIZE_SECONDS:
+        reporter.report(VerbosityLevel.PROG, f"\nImproving the load plan for up to {OPTIMIZE_SECONDS:g} seconds...")
+        package_loader.optimize_load_plan(fleet, reporter, OPTIMIZE_SECONDS)
+
     reporter.report(VerbosityLevel.INFO, "\nThe fleet is loaded and ready for delivery.")
     reporter.run_if(VerbosityLevel.INFO, lambda: fleet.print_fleet())
 
@@ -270,7 +362,7 @@ def run(num_trucks, num_drivers):
 
 
     # The deliver handler. It delivers the packages, of course.
-    delivery_handler = DeliveryHandler()
+    delivery_handler = DeliveryHandler(clock=make_clock(CLOCK), quiet=QUIET)
 
 
     # Build the delivery list by generating departure/arrival times of trucks and deliveries of packages and adding them in order of execution
@@ -281,37 +373,21 @@ def run(num_trucks, num_drivers):
 
 
     # Deliver the packages.
-    print("\nDelivering the packages in accelerated real-time...\n")
+    print(f"\nDelivering the packages {delivery_handler.clock.description}...\n")
     delivery_handler.deliver_packages(fleet)
 
 if __name__ == "__main__":
     read_data(package_list)
+    reset_warehouse()
+
+    # Size the fleet from the raw packages. The lower bounds never need the package handling, and the 'T' notes they include are what prepare_packages checks against.
+    fleet_sizer = FleetSizer(get_warehouse_hash().packages(), reporter)
+
+    # The package handling only depends on the packages, so it runs once. Snapshotting the warehouse afterwards makes every reset_warehouse in load_fleet come back to the prepared packages instead of the raw ones.
+    package_handler, load_ready_list = prepare_packages(Fleet(fleet_sizer.min_trucks))
+    set_warehouse_base(get_warehouse_hash())
+
+    trucks, drivers, (fleet, package_loader) = fleet_sizer.search(lambda num_trucks, num_drivers: load_fleet(num_trucks, num_drivers, package_handler, load_ready_list))
+    deliver(fleet, package_loader)
 
-    trucks, drivers = 1, 1
-    fail_count = 0
-
-    while True:
-        reset_warehouse()
-        try:
-            if fail_count > 0:
-                reporter.report(VerbosityLevel.PROG, "\n\n" + "=" * 100)
-                reporter.report(VerbosityLevel.PROG, f"    RESTARTING DELIVERY SIMULATION (Attempt #{fail_count})")
-                reporter.report(VerbosityLevel.PROG, f"    Fleet: {trucks} truck{'s' if trucks != 1 else ''}, {drivers} driver{'s' if drivers != 1 else ''}\n")
-                reporter.report(VerbosityLevel.PROG, "\n    Press Enter to continue...")
-                reporter.report(VerbosityLevel.PROG, "=" * 100 + "\n")
-                reporter.run_if(VerbosityLevel.PROG, input)
-
-            run(trucks, drivers)
-            break
-
-        except SystemExit:
-            fail_count += 1
-            if fail_count % 2 == 1:
-                trucks += 1
-                reporter.report(VerbosityLevel.PROG, f"[retry #{fail_count}] No feasible plan. Increasing trucks → {trucks}, drivers → {drivers}")
-            else:
-                drivers += 1
-                reporter.report(VerbosityLevel.PROG, f"[retry #{fail_count}] No feasible plan. Increasing drivers → {drivers}, trucks → {trucks}")
-            continue
-
-#jjg
\ No newline at end of file
+#jjg
@@ -1,3 +1,7 @@
+try:
+    import numpy as np
+except ImportError: # NumPy is optional; without it only the pure Python loop is available.
+    np = None
 from address_repository import get_address_list, address_to_index
 from distance_repository import get_distance_matrix
 from route_optimizer import convert_route_to_package_list
@@ -8,6 +12,10 @@ def nearest_neighbor(package_list, start_point='4001 South 700 East'): # Optiona
     address_list = get_address_list()
     distance_matrix = get_distance_matrix()
     
+    # An ndarray distance matrix can be scanned a whole row at a time.
+    if np is not None and isinstance(distance_matrix, np.ndarray):
+        return nearest_neighbor_vectorized(package_list, start_point)
+    
     '''# DEBUG ONLY
     print(f"\nPrior to adding to lists, here is the package_list of length: {len(package_list)}")
     print_package_list(package_list)
@@ -79,13 +87,54 @@ def nearest_neighbor(package_list, start_point='4001 South 700 East'): # Optiona
     return route_sum, route
     
 
+# Same algorithm as nearest_neighbor, but each step reads one row slice of an ndarray distance matrix instead of looping over the unvisited list. Visited vertices are masked out with inf, and argmin returns the first minimum, so ties are broken in the same order as the loop.
+def nearest_neighbor_vectorized(package_list, start_point='4001 South 700 East'):
+    distance_matrix = get_distance_matrix()
+    if np is None or not isinstance(distance_matrix, np.ndarray):
+        raise ValueError("nearest_neighbor_vectorized requires an ndarray distance matrix")
+    
+    start_index = address_to_index(start_point)
+    unvisited_tuples_list = build_vertices_list(package_list, start_point)
+    
+    visited_tuples_list = [(None, start_index)]
+    route_sum = 0
+    current_index = start_index
+    
+    if unvisited_tuples_list:
+        vertex_indices = np.fromiter((vertex[1] for vertex in unvisited_tuples_list), dtype=np.intp, count=len(unvisited_tuples_list))
+        visited = np.zeros(len(unvisited_tuples_list), dtype=bool)
+        
+        for _ in range(len(unvisited_tuples_list)):
+            candidate_distances = np.where(visited, np.inf, distance_matrix[current_index, vertex_indices])
+            min_index = int(np.argmin(candidate_distances))
+            min_distance = candidate_distances[min_index]
+            
+            # Every remaining vertex is unreachable, which is where the loop version stops as well.
+            if not min_distance < float('inf'):
+                break
+            
+            visited[min_index] = True
+            min_tuple = unvisited_tuples_list[min_index]
+            visited_tuples_list.append(min_tuple)
+            route_sum += float(min_distance)
+            current_index = min_tuple[1]
+    
+    # Include the distance for returning to the start point
+    route_sum += float(distance_matrix[current_index, start_index])
+    
+    route = convert_route_to_package_list(visited_tuples_list)
+    
+    return route_sum, route
+    
+
 # A list of tuples to store unvisited vertices: ( package_id, address_index )
 def build_vertices_list(package_list, start_point):
     vertices_list = []
 
     for package in package_list:
         if package.address != start_point:
-            address_index = address_to_index(package.address)
+            # Prefer the index cached at load time over resolving the address string.
+            address_index = package.address_index if package.address_index is not None else address_to_index(package.address)
             vertices_list.append((package.package_id, address_index))
             #print(f"{package.address} with Package ID {package.package_id} indexes to {address_index} in address_list") # DEBUG ONLY
     return vertices_list
@@ -1,7 +1,17 @@
 from datetime import time, datetime
+from time_utils import format_minutes_12h
 
 class Package:
     EOD_TIME = time(23, 59)
+    # Fields that HashTable keeps secondary indexes on (special_note is indexed by its tag, see get_note_tag).
+    INDEXED_FIELDS = ('delivery_status', 'delivery_deadline', 'special_note', 'truck', 'group')
+    # Every field planning or delivery may change. Watchers hear about all of these; warehouse_repository journals them so a reset only touches what changed.
+    WATCHED_FIELDS = INDEXED_FIELDS + ('priority', 'address', 'city', 'state', 'zip_code', 'address_index', 'address_history', 'time_of_delivery')
+    # The same, for the membership test on every assignment
+    WATCHED_FIELD_SET = frozenset(WATCHED_FIELDS)
+    # Slotted so a day's worth of packages doesn't carry a __dict__ each. address_history is a property over _address_history, which stays None until it is read or the address changes.
+    __slots__ = ('watchers', 'package_id', '_address_history', 'address', 'city', 'state', 'zip_code', 'delivery_deadline',
+                 'weight_kilo', 'special_note', 'delivery_status', 'time_of_delivery', 'truck', 'group', 'priority', 'delay_time', 'address_index')
     
     def __init__(self, 
                  package_id,
@@ -17,10 +27,12 @@ class Package:
                  truck=None,
                  group=None,
                  priority=None,
-                 delay_time=None):
+                 delay_time=None,
+                 address_index=None):
+        self.watchers = [] # Tables indexing this package. Set first so __setattr__ can rely on it.
         self.package_id = package_id
+        self._address_history = None # Set before address so __setattr__ can tell the first assignment from a change.
         self.address = address
-        self.address_history = [(None, address)]
         self.city = city
         self.state = state
         self.zip_code = zip_code
@@ -33,6 +45,7 @@ class Package:
         self.group = group
         self.priority = priority
         self.delay_time = delay_time
+        self.address_index = address_index # Index of the address in the distance matrix, resolved once at load time.
         
     
     def __str__(self):
@@ -67,6 +80,61 @@ class Package:
             )
         
     
+    # Assigning a watched field tells every watcher (the tables holding this package and the warehouse journal), so they follow PackageHandler and DeliveryHandler without either of them knowing about it. In-place edits (e.g. address_history.append) aren't seen; reassign the field instead.
+    def __setattr__(self, name, value):
+        # The first change of address keeps the original as the start of the history, which address_history would otherwise derive from the current address.
+        if name == 'address' and self._address_history is None and hasattr(self, 'address'):
+            object.__setattr__(self, '_address_history', [(None, self.address)])
+        
+        watchers = self.watchers if name in self.WATCHED_FIELD_SET else None
+        if not watchers:
+            object.__setattr__(self, name, value)
+            return
+        
+        old_value = getattr(self, name)
+        object.__setattr__(self, name, value)
+        for table in watchers:
+            table.package_changed(self, name, old_value)
+        
+    
+    # copy/deepcopy restore slots through setattr by default, which would notify watchers about a half-built copy. Restore them directly instead, as the old __dict__ update did.
+    def __setstate__(self, state):
+        _, slot_state = state
+        for name, value in slot_state.items():
+            object.__setattr__(self, name, value)
+        
+    
+    # [(time, address), ...] starting with (None, original address). Most packages are never asked for it, so the list is only built once something reads or assigns it or the address changes. A read keeps the list it builds, so it is the same list every time and an append isn't lost.
+    @property
+    def address_history(self):
+        if self._address_history is None:
+            object.__setattr__(self, '_address_history', [(None, self.address)])
+        return self._address_history
+    
+    @address_history.setter
+    def address_history(self, value):
+        object.__setattr__(self, '_address_history', value)
+        
+    
+    @property
+    def note_tag(self):
+        return get_note_tag(self.special_note)
+        
+    
+    # The key used for distance lookups: the cached matrix index when it has been resolved, otherwise the address string.
+    @property
+    def location(self):
+        return self.address_index if self.address_index is not None else self.address
+        
+    
+    # Delivery deadline in minutes since midnight, for comparing against the planner's integer-minute clock.
+    @property
+    def deadline_minutes(self):
+        if self.delivery_deadline is None:
+            return None
+        return self.delivery_deadline.hour * 60 + self.delivery_deadline.minute
+        
+    
     # Adding magic method so that packages can be compared by package_id
     def __lt__(self, other):
         return self.package_id < other.package_id
@@ -196,10 +264,21 @@ def parse_delayed_package(delayed_str):
 def get_time_str(time_object):
     if time_object is None:
         return 'None'
-    else:
-        return time_object.strftime("%I:%M %p")
+    # Delivery times are stored as minutes since midnight
+    if isinstance(time_object, int):
+        return format_minutes_12h(time_object)
+    return time_object.strftime("%I:%M %p")
         
     
+# Returns the leading tag ('D', 'T', 'W', 'X') of a special note, whether it has been parsed into a list yet or not.
+def get_note_tag(special_note):
+    if not special_note:
+        return None
+    if isinstance(special_note, str):
+        return special_note.split(',')[0].strip()
+    return special_note[0]
+    
+
 # Helper function that safely casts a value to int
 def try_casting_to_int(value):
     try:
@@ -0,0 +1,110 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from package import Package
+
+# Stands in for None in the integer columns. Every real id, index, minute, priority, group and truck is >= 0.
+MISSING = -1
+
+# Column-per-field copy of a set of packages, for the planning passes that only look at a few numeric fields. Row i of every column describes packages[i]; the Package objects are only handed back out through materialize().
+class PackageColumns:
+    FIELDS = ('package_id', 'address_index', 'deadline_minutes', 'weight', 'priority', 'group', 'truck')
+    # The columns planning assigns. The rest are read-only views of the packages (deadline_minutes is derived from delivery_deadline).
+    WRITABLE_FIELDS = ('address_index', 'priority', 'group', 'truck')
+
+    def __init__(self, packages):
+        if np is None:
+            raise ImportError("NumPy is required for PackageColumns; install numpy or leave columnar planning off")
+
+        self.packages = list(packages)
+        count = len(self.packages)
+
+        self.package_id = int_column((pkg.package_id for pkg in self.packages), count)
+        self.address_index = int_column((pkg.address_index for pkg in self.packages), count)
+        self.deadline_minutes = int_column((pkg.deadline_minutes for pkg in self.packages), count)
+        self.weight = np.fromiter((to_weight(pkg.weight_kilo) for pkg in self.packages), dtype=np.float64, count=count)
+        self.priority = int_column((pkg.priority for pkg in self.packages), count)
+        self.group = int_column((pkg.group for pkg in self.packages), count)
+        self.truck = int_column((pkg.truck for pkg in self.packages), count)
+        # Not one of the stored fields, but the priority rules need it. Same test as set_package_priorities: the note's first element is 'D'.
+        self.delayed = np.fromiter((bool(pkg.special_note) and pkg.special_note[0] == 'D' for pkg in self.packages), dtype=bool, count=count)
+
+
+    @classmethod
+    def from_table(cls, table):
+        return cls(table.packages())
+
+
+    def __len__(self):
+        return len(self.packages)
+
+
+    # Hands back the Package objects for the given rows (all rows if None), in the order given.
+    def materialize(self, rows=None):
+        if rows is None:
+            return list(self.packages)
+        return [self.packages[i] for i in rows]
+
+
+    # The rules from PackageHandler.set_package_priorities as array operations:
+    #   0: deadline and delayed, 1: deadline and not delayed, 2: EOD and not delayed, 3: EOD and delayed.
+    # A missing deadline counts as a deadline there too, since None != EOD_TIME.
+    def compute_priorities(self):
+        eod = self.deadline_minutes == eod_minutes()
+        return np.where(eod, np.where(self.delayed, 3, 2), np.where(self.delayed, 0, 1)).astype(np.int64)
+
+
+    # Writes values into one of the stored columns and onto the packages behind them. Only the packages whose value actually changed are touched, so the warehouse journal and indexes only hear about those.
+    def store(self, field, values, rows=None):
+        if field not in PackageColumns.WRITABLE_FIELDS:
+            raise ValueError(f"Column {field} can't be stored; writable columns are {PackageColumns.WRITABLE_FIELDS}")
+        column = getattr(self, field)
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.intp)
+        values = np.asarray(values, dtype=column.dtype)
+
+        changed = rows[column[rows] != values]
+        column[rows] = values
+        for i in changed:
+            value = column[i].item()
+            setattr(self.packages[i], field, None if value == MISSING else value)
+
+
+    # Rows whose priority lies in [low, high], in their original order.
+    def priority_rows(self, low, high):
+        return np.flatnonzero((self.priority >= low) & (self.priority <= high))
+
+
+    # Row order for group_and_sort_list: by priority, then within a priority by how many of its packages share the group (most first), then by group number (no group last), then by original position.
+    def sort_order(self, rows=None):
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.intp)
+        priority = self.priority[rows]
+        group = self.group[rows]
+
+        # Frequency of each (priority, group) pair among the rows. Packages with no group have a frequency of 0.
+        pairs = np.stack((priority, group), axis=1)
+        _, inverse, counts = np.unique(pairs, axis=0, return_inverse=True, return_counts=True)
+        frequency = np.where(group == MISSING, 0, counts[inverse.reshape(-1)])
+        group_key = np.where(group == MISSING, np.iinfo(np.int64).max, group)
+
+        # lexsort sorts by the last key first
+        return rows[np.lexsort((np.arange(len(rows)), group_key, -frequency, priority))]
+
+
+
+# Helper functions
+
+def int_column(values, count):
+    return np.fromiter((MISSING if value is None else value for value in values), dtype=np.int64, count=count)
+
+# Weights come straight from the CSV as strings, and generated manifests carry a placeholder. Anything that isn't a number becomes nan.
+def to_weight(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def eod_minutes():
+    return Package.EOD_TIME.hour * 60 + Package.EOD_TIME.minute
+#jjg
@@ -2,58 +2,41 @@ from fleet import Fleet
 from hash_table import HashTable
 from warehouse_repository import get_warehouse_hash
 from package import Package, print_package_list, print_group_list, parse_delayed_package
+from package_columns import PackageColumns
+from disjoint_set import DisjointSet
 from truck import Truck
 from datetime import time
 
 class PackageHandler:
-    def __init__(self):
+    def __init__(self, columnar=False):
         self.max_group_number = -1
+        # Run the priority and group/sort passes on a NumPy column copy of the packages (see package_columns.py) instead of package by package.
+        self.columnar = columnar
+        # The 'W' groups found by handle_with_package_note, kept so assign_fleet_trucks can spread trucks through them again.
+        self.package_groups = []
         
     
     def merge_addresses(self):
         warehouse_hash = get_warehouse_hash()
         package_list = list_builder()
         
-        for i_package in package_list[:]:
-            tag = i_package.special_note[0] if i_package.special_note else None
-
-            # Skip delayed packages
-            if tag in {"D"}:
-                continue
-
-            for j_package in package_list:
-                # Skip if comparing the same package
-                if i_package.package_id == j_package.package_id:
-                    continue
-                # Skip if addresses don't match
-                if i_package.address != j_package.address:
-                    continue
-
-                earliest_deadline = min(i_package.delivery_deadline, j_package.delivery_deadline)
-
-                # i_package has a special note (not 'X') and j_package does not
-                if tag and tag != 'X' and j_package.special_note is None:
-                    j_package.special_note = i_package.special_note
-                    i_package.delivery_deadline = j_package.delivery_deadline = earliest_deadline
-                    
-                # neither has a special note
-                elif i_package.special_note is None and j_package.special_note is None:
-                    i_package.special_note = f'W, {j_package.package_id}'
-                    i_package.parse_special_note()
-
-                    j_package.special_note = f'W, {i_package.package_id}'
-                    j_package.parse_special_note()
-
-                    i_package.delivery_deadline = j_package.delivery_deadline = earliest_deadline
+        # Packages only ever affect others at the same address, so bucket them by address once and run the rules inside each bucket instead of comparing every pair. Each bucket keeps package_list's order, which the rules depend on (the first package without a note is the one that gets the W link).
+        address_buckets = {}
+        for pkg in package_list:
+            address_buckets.setdefault(pkg.address, []).append(pkg)
+        
+        for bucket in address_buckets.values():
+            if len(bucket) > 1:
+                merge_bucket(bucket)
         
     
     # Returns the priority_list, which is the union of packages with special notes and delivery deadlines    
     def build_constraints_list(self):
         # The list of packages that have special notes for delivery. Per project specifications, there is a package with an incorrect address. This package, denoted with a special note of 'X' will be handled at the very last and is thus excluded from the special_notes_list.
-        special_note_list = list_builder('special_note', 'special_note', 'X')
+        special_note_list = index_list_builder('special_note', {None, 'X'})
         
         # The list of packages that have delivery deadlines
-        delivery_deadline_list = list_builder('delivery_deadline', 'delivery_deadline', Package.EOD_TIME)
+        delivery_deadline_list = index_list_builder('delivery_deadline', {None, Package.EOD_TIME})
         
         ''' DEBUG ONLY
         print(f"\nspecial_note_list of length {len(special_note_list)}:")
@@ -77,6 +60,11 @@ class PackageHandler:
     def set_package_priorities(self, ungrouped_list):
         warehouse_hash = get_warehouse_hash()
         
+        if self.columnar:
+            columns = PackageColumns(ungrouped_list)
+            columns.store('priority', columns.compute_priorities())
+            return
+        
         for pkg in ungrouped_list:
             #modified_package = hash_table.search(pkg.package_id)
             
@@ -230,27 +218,8 @@ class PackageHandler:
                 group_list.append(pkg)
             result_groups_list.append(group_list)
 
-        for package_group in result_groups_list:
-            truck_set = set()
-            for pkg in package_group:
-                if pkg.truck is not None:
-                    truck_set.add(pkg.truck)
-
-            if len(truck_set) == 0:
-                # No forced truck in this W-group; leave as-is.
-                continue
-            if len(truck_set) == 1:
-                # Exactly one forced truck; propagate to entire group.
-                truck_id = next(iter(truck_set))
-                for pkg in package_group:
-                    pkg.truck = truck_id
-                continue
-
-            # Conflicting truck constraints inside one W component.
-            raise ValueError(
-                f"Impossible W-group: multiple forced trucks {sorted(truck_set)} "
-                f"for package IDs {[p.package_id for p in package_group]}"
-            )
+        self.package_groups = result_groups_list
+        propagate_group_trucks(result_groups_list)
 
         '''# DEBUG ONLY
         print("\nGrouped packages:")
@@ -266,6 +235,7 @@ class PackageHandler:
                 pkg.group = next_group + i
         
         # Find the minimum priority in each package group, and assign each other package in that group with that priority.
+        in_package_list = set(package_list) # Packages compare by identity, so this is the same membership test without scanning the list.
         for package_group in result_groups_list:
             min_priority = float('inf')
             for pkg in package_group:
@@ -276,7 +246,8 @@ class PackageHandler:
                     min_priority = 4
                 
                 # We're adding to the package list so that this can be returned and update the constraints list.
-                if pkg not in package_list:
+                if pkg not in in_package_list:
+                    in_package_list.add(pkg)
                     package_list.append(pkg)
             
             # Finally, reiterate through the group and update the priority.
@@ -309,6 +280,12 @@ class PackageHandler:
     def group_and_sort_list(self, unsorted_list):
         return_list = [[] for _ in range(6)]
         
+        if self.columnar:
+            columns = PackageColumns(unsorted_list)
+            for row in columns.sort_order(columns.priority_rows(0, 5)):
+                return_list[columns.priority[row]].append(columns.packages[row])
+            return return_list
+        
         # Group packages by priority
         for pkg in unsorted_list:
             #print(f"  Priority: {pkg.priority}", end=", ") # DEBUG ONLY
@@ -363,75 +340,120 @@ class PackageHandler:
         return return_list
         
     
+    # The fleet-dependent part of the package handling: 'D' packages without a deadline go on the first truck without a driver, and each 'W' group found by handle_with_package_note takes on any truck one of its packages is tied to. The rest only depends on the packages, so FleetSizer's attempts rerun just this.
+    def assign_fleet_trucks(self, package_list, fleet):
+        self.handle_delayed_without_deadline_note(package_list, fleet)
+        propagate_group_trucks(self.package_groups)
+        
+    
 # Private functions
 
+# Helper function for merge_addresses: the shared-address rules for one bucket of packages that all have the same address.
+def merge_bucket(bucket):
+    for i_package in bucket:
+        tag = i_package.special_note[0] if i_package.special_note else None
+
+        # Skip delayed packages
+        if tag in {"D"}:
+            continue
+
+        for j_package in bucket:
+            # Skip if comparing the same package
+            if i_package.package_id == j_package.package_id:
+                continue
+
+            earliest_deadline = min(i_package.delivery_deadline, j_package.delivery_deadline)
+
+            # i_package has a special note (not 'X') and j_package does not
+            if tag and tag != 'X' and j_package.special_note is None:
+                j_package.special_note = i_package.special_note
+                i_package.delivery_deadline = j_package.delivery_deadline = earliest_deadline
+                
+            # neither has a special note
+            elif i_package.special_note is None and j_package.special_note is None:
+                i_package.special_note = f'W, {j_package.package_id}'
+                i_package.parse_special_note()
+
+                j_package.special_note = f'W, {i_package.package_id}'
+                j_package.parse_special_note()
+
+                i_package.delivery_deadline = j_package.delivery_deadline = earliest_deadline
+
+
 # Helper function that takes an attribute as input and returns a sorted list of packages with that attribute.
 # There are two optional arguments that can exclude an attribute with a target value
 def list_builder(attr=None, ex_attr=None, ex_val=None):
     warehouse_hash = get_warehouse_hash()
     
-    package_list = []
-    
     #print(f"Building package_list based on following input parameters: {attr}, {ex_attr}, {ex_val}") # DEBUG ONLY
     
+    # Stream straight off the table into sorted(); the only list built is the one returned.
+    return sorted(pkg for pkg in warehouse_hash.packages() if matches_attr(pkg, attr, ex_attr, ex_val))
+
+
+def matches_attr(pkg, attr, ex_attr, ex_val):
+    if attr is None:
+        return True
+    
     # Abbreviated variables to improve readability with the attr method.
-    for bucket in warehouse_hash:
-        for pkg in bucket:
-            if attr is None:
-                package_list.append(pkg)
-            else:
-                #print(f"Checking package: {pkg}") # DEBUG ONLY
-                attr_val = getattr(pkg, attr, None)
-                ex_attr_val = getattr(pkg, ex_attr, None) if ex_attr is not None else None
-                
-                #print(f"attr_val: {attr_val}, ex_attr_val: {ex_attr_val}") # DEBUG ONLY
-                
-                if attr_val is not None:
-                    # If no exclusion attribute, or exclusion passes
-                    if ex_attr_val is None:
-                        package_list.append(pkg)
-                    else:
-                        # Handle if ex_attr_val is a list
-                        if isinstance(ex_attr_val, list):
-                            if ex_val not in ex_attr_val:
-                                package_list.append(pkg)
-                        else:
-                            if ex_attr_val != ex_val:
-                                package_list.append(pkg)
-
-    return sorted(package_list)
+    #print(f"Checking package: {pkg}") # DEBUG ONLY
+    attr_val = getattr(pkg, attr, None)
+    ex_attr_val = getattr(pkg, ex_attr, None) if ex_attr is not None else None
+    
+    #print(f"attr_val: {attr_val}, ex_attr_val: {ex_attr_val}") # DEBUG ONLY
+    
+    if attr_val is None:
+        return False
+    # If no exclusion attribute, or exclusion passes
+    if ex_attr_val is None:
+        return True
+    # Handle if ex_attr_val is a list
+    if isinstance(ex_attr_val, list):
+        return ex_val not in ex_attr_val
+    return ex_attr_val != ex_val
+
+
+# Helper function that reads a sorted list of packages from one of the warehouse's secondary indexes, skipping the index values in ex_vals (e.g. the 'X' note tag or EOD deadlines).
+def index_list_builder(field, ex_vals):
+    warehouse_hash = get_warehouse_hash()
+    
+    return sorted(pkg for value in warehouse_hash.index_values(field) if value not in ex_vals for pkg in warehouse_hash.find_by(field, value))
 
 
 def anti_list_builder(package_list=[]):
     warehouse_hash = get_warehouse_hash()
-    anti_list = []
     
-    for bucket in warehouse_hash:
-        for pkg in bucket:
-            if pkg not in package_list:
-                anti_list.append(pkg)
+    # Packages compare by identity, so a set gives the same membership test as the list without the linear scan per package.
+    excluded = set(package_list)
     
-    return sorted(anti_list)
+    return sorted(pkg for pkg in warehouse_hash.packages() if pkg not in excluded)
     
 
 # Based partly on KruskalsMinimumSpanningTree algorithm from zyBook 5.12. I had originally included it in the 'handle_with_package_note' function, but the logic was so useful that I decided to keep it as helper function.
+# It used to pop a set and rescan the rest until nothing intersected, which got quadratic once manifests had thousands of W links. Now each set is unioned into a DisjointSet, which comes out the same in near-linear time.
 def merge_sets(set_list):
-    result_list = []
-    if not set_list:
-        return result_list
+    disjoint_set = DisjointSet()
+    for id_set in set_list:
+        first = None
+        for id in id_set:
+            if first is None:
+                first = id
+                disjoint_set.add(id)
+            else:
+                disjoint_set.union(first, id)
+    groups = disjoint_set.groups()
     
-    while set_list:
-        current_set = set_list.pop()
-        merged = True
-        
-        while merged:
-            merged = False
-            for other_set in set_list[:]:
-                if current_set.intersection(other_set):
-                    current_set = current_set.union(other_set)
-                    set_list.remove(other_set)
-                    merged = True
-        result_list.append(current_set)
+    # Same order the rescanning version produced: the merged set holding the last input set comes first, then the one holding the last set not yet used, and so on.
+    result_list = []
+    seen_roots = set()
+    for id_set in reversed(set_list):
+        if not id_set:
+            result_list.append(set())
+            continue
+        root = disjoint_set.find(next(iter(id_set)))
+        if root not in seen_roots:
+            seen_roots.add(root)
+            result_list.append(groups[root])
     #
     #print('\n'.join(f"{set}" for set in result_list)) # DEBUG ONLY
     #
@@ -454,4 +476,29 @@ def perform_union_on_lists(list1, list2):
     return sorted(union_list)
     
 
+# Helper function for handle_with_package_note and assign_fleet_trucks: a 'W' group goes on one truck, so a truck any of its packages is tied to becomes the whole group's truck.
+def propagate_group_trucks(package_groups):
+    for package_group in package_groups:
+        truck_set = set()
+        for pkg in package_group:
+            if pkg.truck is not None:
+                truck_set.add(pkg.truck)
+
+        if len(truck_set) == 0:
+            # No forced truck in this W-group; leave as-is.
+            continue
+        if len(truck_set) == 1:
+            # Exactly one forced truck; propagate to entire group.
+            truck_id = next(iter(truck_set))
+            for pkg in package_group:
+                pkg.truck = truck_id
+            continue
+
+        # Conflicting truck constraints inside one W component.
+        raise ValueError(
+            f"Impossible W-group: multiple forced trucks {sorted(truck_set)} "
+            f"for package IDs {[p.package_id for p in package_group]}"
+        )
+    
+
 #jjg
\ No newline at end of file
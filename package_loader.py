@@ -5,11 +5,25 @@ from truck import Truck
 from fleet import Fleet
 from k_means import split_package_list
 from nearest_neighbor import nearest_neighbor
-from route_optimizer import check_route_feasibility
+from route_optimizer import check_route_feasibility, insert_packages_into_route
+from two_opt import improve_route
+from load_optimizer import LoadPlanOptimizer
 from tools.reporter import Reporter, VerbosityLevel
 
 class PackageLoader:
-    pass
+    # With incremental=True, candidate routes are built by inserting the working packages into each truck's existing route instead of rerunning nearest_neighbor on the whole list.
+    # With improve=True, every candidate route (rebuilt by nearest_neighbor, or built by insertion) goes through the 2-opt/Or-opt improver before it is kept; improve_budget caps the seconds spent per route (None runs each route to a local optimum, which keeps seeded runs repeatable).
+    def __init__(self, incremental=False, improve=False, improve_budget=None):
+        self.incremental = incremental
+        self.improve = improve
+        self.improve_budget = improve_budget
+    
+    def find_feasible_routes(self, available_trucks, working_package_list, verbosity):
+        if self.incremental:
+            return build_insertion_routes(available_trucks, working_package_list, verbosity, self.improve, self.improve_budget)
+        if self.improve:
+            return build_improved_routes(available_trucks, working_package_list, verbosity, self.improve_budget)
+        return build_feasible_routes(available_trucks, working_package_list, verbosity)
 
     def load_assigned_trucks(self, fleet, package_groups, reporter):
         warehouse_hash = get_warehouse_hash()
@@ -50,7 +64,7 @@ class PackageLoader:
             # Testing the routes with each truck with available capacity. We want to find the best outcome for adding the priority package to one of the trucks.
             
             # Step 1: First build a list of feasible routes
-            feasible_routes_list = build_feasible_routes(trucks_with_drivers_list, [priority_package], verbosity)
+            feasible_routes_list = self.find_feasible_routes(trucks_with_drivers_list, [priority_package], verbosity)
             
             if not feasible_routes_list:
                 reporter.report(VerbosityLevel.INFO, "... package_id, deadline, delay_time, trucks considered ...")
@@ -114,7 +128,7 @@ class PackageLoader:
             # Testing the routes with each truck with available capacity. We want to find the best outcome for adding the working package list to one of the trucks.
             
             # Step 1: First build a list of feasible routes
-            feasible_routes_list = build_feasible_routes(available_trucks, working_package_list, verbosity)
+            feasible_routes_list = self.find_feasible_routes(available_trucks, working_package_list, verbosity)
             
             # If there are no feasible routes, exit.
             if not feasible_routes_list:
@@ -138,6 +152,11 @@ class PackageLoader:
         for truck in fleet:
             truck.route_distance = 0
     
+    
+    # Optional last step: spend time_budget seconds moving packages between the loaded trucks to cut the fleet's miles (see load_optimizer). Returns the plan's (minutes late, miles).
+    def optimize_load_plan(self, fleet, reporter, time_budget):
+        return LoadPlanOptimizer(fleet, time_budget, reporter).optimize()
+    
 
 # Helper functions
 
@@ -236,6 +255,49 @@ def build_feasible_routes(available_trucks, working_package_list, verbosity):
     return feasible_routes_list
 
 
+# Same contract as build_feasible_routes, but the nearest_neighbor route is improved before it is checked. The improver never makes a route later, so anything build_feasible_routes accepts is accepted here too, and some routes that were late come back on time.
+def build_improved_routes(available_trucks, working_package_list, verbosity, time_budget=None):
+    feasible_routes_list = []
+    for truck in available_trucks:
+        if verbosity == 2: print(f"\nTesting improved route for Truck {truck.truck_id + 1} for feasibility")
+
+        _, test_route = nearest_neighbor(truck.package_list + working_package_list)
+        test_route_distance, test_route = improve_route(test_route, truck.speed_mph, truck.departure_address, time_budget)
+
+        if check_route_feasibility(test_route, truck.speed_mph, verbosity):
+            feasible_routes_list.append((truck, test_route, test_route_distance))
+
+    return feasible_routes_list
+
+
+# Same contract as build_feasible_routes, but each candidate keeps the truck's current route order and only evaluates where the working packages can be inserted. This costs O(route length) per package rather than a full nearest_neighbor rebuild.
+# With improve=True the insertion route goes through the improver too (and the fallback rebuild is an improved one), within time_budget seconds per route.
+def build_insertion_routes(available_trucks, working_package_list, verbosity, improve=False, time_budget=None):
+    feasible_routes_list = []
+    for truck in available_trucks:
+        if verbosity == 2: print(f"\nTesting insertion into Truck {truck.truck_id + 1} for feasibility")
+
+        insertion = insert_packages_into_route(truck.package_list, working_package_list, truck.speed_mph, truck.departure_address)
+
+        # The current route order cannot absorb the working packages on time, so fall back to a full rebuild for this truck.
+        if insertion is None:
+            if improve:
+                feasible_routes_list.extend(build_improved_routes([truck], working_package_list, verbosity, time_budget))
+            else:
+                feasible_routes_list.extend(build_feasible_routes([truck], working_package_list, verbosity))
+            continue
+
+        test_route_distance, test_route = insertion
+        if improve:
+            improved_distance, improved_route = improve_route(test_route, truck.speed_mph, truck.departure_address, time_budget)
+            # The improver never makes a route later, but the insertion route is kept if the improved one somehow fails the check.
+            if check_route_feasibility(improved_route, truck.speed_mph, verbosity):
+                test_route_distance, test_route = improved_distance, improved_route
+        feasible_routes_list.append((truck, test_route, test_route_distance))
+
+    return feasible_routes_list
+
+
 def choose_best_option(feasible_routes_list):
     if len(feasible_routes_list) > 1:
         current_distances = [truck.route_distance for truck, _, _ in feasible_routes_list]
@@ -1,6 +1,11 @@
 import csv
+try:
+    import numpy as np
+except ImportError: # NumPy is optional; without it the distance matrix is a list of lists.
+    np = None
 from package import Package
 from hash_table import HashTable
+from address_repository import get_address_list, address_to_index
 
 # Function that returns a hash table generated from a csv input
 def read_package_data(input):
@@ -20,6 +25,10 @@ def read_package_data(input):
             # Parse, clean, and reassign the special note:
             new_package.special_note = new_package.parse_special_note()
             
+            # Cache the distance matrix index of the address so that routing never has to resolve the string again. This requires the address data to be read first.
+            if get_address_list() is not None:
+                new_package.address_index = address_to_index(address)
+            
             # Store the package object in the hash table
             hash_table.insert(package_id, new_package)
             #
@@ -49,8 +58,11 @@ def read_address_data(input):
     return address_list
     
 
-# Function that returns a 2d square matrix generated from a csv input
-def read_distance_data(input):
+# Function that returns a 2d square matrix generated from a csv input. Passing a dtype ('float32' or 'float64') returns a NumPy ndarray instead of a list of lists.
+def read_distance_data(input, dtype=None):
+    if dtype is not None:
+        return read_distance_array(input, dtype)
+    
     size = csv_line_count(input)
     
     # Initialize a squre matrix using the line count of the input    
@@ -72,9 +84,9 @@ def read_distance_data(input):
                     #print(f"Adding: {line[col_index]}") # DEBUG ONLY
                     distance_matrix[row_index][col_index] = float(line[col_index])
     
-    # Transpose the distance matrix: set each element at index (i, j) to the value at (j, i)
-    for i, row in enumerate(distance_matrix):
-        for j in range(size):
+    # Mirror the lower triangle into the upper triangle: set each element at index (i, j) above the diagonal to the value at (j, i)
+    for i in range(size):
+        for j in range(i + 1, size):
             distance_matrix[i][j] = distance_matrix[j][i]
     
     #
@@ -85,6 +97,26 @@ def read_distance_data(input):
     return distance_matrix
     
 
+# NumPy version of read_distance_data. Blank cells become inf, and the lower triangle is mirrored into the upper triangle in one vectorized step.
+def read_distance_array(input, dtype='float64'):
+    if np is None:
+        raise ImportError("NumPy is required for an ndarray distance matrix; install numpy or use dtype=None")
+    
+    size = csv_line_count(input)
+    distance_matrix = np.full((size, size), np.inf, dtype=dtype)
+    
+    with open(input, 'r') as distance_file:
+        csv_reader = csv.reader(distance_file)
+        for row_index, line in enumerate(csv_reader):
+            row = np.array([value if value != '' else 'inf' for value in line[:size]], dtype=dtype)
+            distance_matrix[row_index, :len(row)] = row
+    
+    upper = np.triu_indices(size, 1)
+    distance_matrix[upper] = distance_matrix.T[upper]
+    
+    return distance_matrix
+    
+
 # Helper function that returns the line count of the CSV input
 def csv_line_count(file):
     with open(file, 'r') as file:
@@ -0,0 +1,24 @@
+import random
+
+# The seed the planner was last given, and the generator built from it. Everything in planning that draws random numbers takes them from planner_rng, so the same inputs and the same seed always produce the same plan.
+planner_seed = None
+planner_rng = None
+
+def set_planner_seed(seed):
+    global planner_seed, planner_rng
+    # bool is an int, but True as a seed is almost certainly a mistake
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+        raise ValueError("planner seed must be an int or None")
+    planner_seed = seed
+    # A seed of None draws fresh entropy from the OS, same as the random module does at import.
+    planner_rng = random.Random(seed)
+
+
+def get_planner_seed():
+    return planner_seed
+
+
+# Returns None until set_planner_seed has been called; callers fall back to the global random module then.
+def get_planner_rng():
+    return planner_rng
+#jjg
@@ -1,8 +1,7 @@
 from warehouse_repository import get_warehouse_hash
 from distance_repository import get_distance
 from package import Package
-from datetime import time
-from time_utils import float_to_time, get_route_departure_time, get_arrival_time, calculate_travel_time
+from time_utils import get_route_departure_minutes, get_arrival_minutes, get_travel_minutes, format_minutes
 
 def check_route_feasibility(route, speed_mph, verbosity, start_address='4001 South 700 East'):
     has_delivery_deadline = False
@@ -15,19 +14,20 @@ def check_route_feasibility(route, speed_mph, verbosity, start_address='4001 Sou
             print("Route has no delivery deadlines. Is feasible.")
         return True
     
-    departure_time = get_route_departure_time(route)
-    #print(f"  Leaving the starting point at {departure_time}") # DEBUG ONLY
+    # Everything below works in minutes since midnight
+    departure_minutes = get_route_departure_minutes(route)
+    #print(f"  Leaving the starting point at {format_minutes(departure_minutes)}") # DEBUG ONLY
     
     # First calculate the arrival time from the starting point to the address of the first delivered package.
     curr_pkg = route[0]
     
     
-    arr_time = get_arrival_time(departure_time, start_address, curr_pkg.address, speed_mph)
+    arr_minutes = get_arrival_minutes(departure_minutes, start_address, curr_pkg.location, speed_mph)
     
-    # print(f"    Truck left {start_address} and arrived at {curr_pkg.address} at: {arr_time}")
-    if arr_time > curr_pkg.delivery_deadline:
+    # print(f"    Truck left {start_address} and arrived at {curr_pkg.address} at: {format_minutes(arr_minutes)}")
+    if arr_minutes > curr_pkg.deadline_minutes:
             if verbosity == "1":
-                print(f"ERROR: Route is not feasible: {arr_time} > {curr_pkg.delivery_deadline}")
+                print(f"ERROR: Route is not feasible: {format_minutes(arr_minutes)} > {format_minutes(curr_pkg.deadline_minutes)}")
             return False
             
     for i in range(len(route) - 1):
@@ -35,45 +35,132 @@ def check_route_feasibility(route, speed_mph, verbosity, start_address='4001 Sou
         next_pkg = route[i + 1]
         
         # Skip the iteration if the addresses of subsequent packages are the same.
-        if curr_pkg.address == next_pkg.address:
+        if curr_pkg.location == next_pkg.location:
             # Same address: arrival time does not change, but deadline feasibility still must be checked.
-            if arr_time > next_pkg.delivery_deadline:
+            if arr_minutes > next_pkg.deadline_minutes:
                 if verbosity == "1":
-                    print(f"ERROR: Route is not feasible: {arr_time} > {next_pkg.delivery_deadline}")
+                    print(f"ERROR: Route is not feasible: {format_minutes(arr_minutes)} > {format_minutes(next_pkg.deadline_minutes)}")
                 return False
             continue
         
-        arr_time = get_arrival_time(arr_time, curr_pkg.address, next_pkg.address, speed_mph)
-        end_address_deadline = route[i + 1].delivery_deadline
-        # print(f"    Arrival time: {arr_time} | Truck left {curr_pkg.address} and arrived at {next_pkg.address}")
-        if arr_time > end_address_deadline:
+        arr_minutes = get_arrival_minutes(arr_minutes, curr_pkg.location, next_pkg.location, speed_mph)
+        end_address_deadline = next_pkg.deadline_minutes
+        # print(f"    Arrival time: {format_minutes(arr_minutes)} | Truck left {curr_pkg.address} and arrived at {next_pkg.address}")
+        if arr_minutes > end_address_deadline:
             if verbosity == "1":
-                print(f"ERROR: Route is not feasible: {arr_time} > {end_address_deadline}")
+                print(f"ERROR: Route is not feasible: {format_minutes(arr_minutes)} > {format_minutes(end_address_deadline)}")
             return False
     
     if verbosity == "1":
-        print(f"SUCCESS: Route is feasible. Arrival time at {arr_time}")
+        print(f"SUCCESS: Route is feasible. Arrival time at {format_minutes(arr_minutes)}")
     return True
     
 
-def convert_route_to_package_list(route):
-    warehouse_hash = get_warehouse_hash()
+# Per-stop arrival times and slack of a fixed route, in minutes since midnight. Slack at a stop is how many minutes every arrival from that stop onward can be pushed back before a deadline is missed, so an insertion can be checked in O(1) and a whole route in O(route length) without rebuilding it.
+class RouteSchedule:
+    def __init__(self, route, speed_mph, departure_minutes, enforce_deadlines, start_address='4001 South 700 East'):
+        self.route = list(route)
+        self.speed_mph = speed_mph
+        self.departure_minutes = departure_minutes
+        self.enforce_deadlines = enforce_deadlines
+        self.start_address = start_address
+        self.rebuild()
     
-    package_list = []
     
-    # tup: (package_id, address_index)
-    for tup in route:
-        package_id = tup[0]
-        if package_id is not None:
-            package = warehouse_hash.search(package_id)
-            package_list.append(package)
+    def rebuild(self):
+        # locations[0] is the hub; locations[i + 1] is the stop of route[i].
+        self.locations = [self.start_address] + [pkg.location for pkg in self.route]
+        self.arrivals = []
+        self.distance = 0
+        
+        arr_minutes = self.departure_minutes
+        for i, pkg in enumerate(self.route):
+            arr_minutes += get_travel_minutes(self.locations[i], self.locations[i + 1], self.speed_mph)
+            self.distance += get_distance(self.locations[i], self.locations[i + 1])
+            self.arrivals.append(arr_minutes)
+        self.distance += get_distance(self.locations[-1], self.start_address)
+        
+        # slack[i] covers route[i:]; the return leg to the hub has no deadline.
+        self.slack = [float('inf')] * (len(self.route) + 1)
+        for i in range(len(self.route) - 1, -1, -1):
+            self.slack[i] = min(self.deadline_minutes(self.route[i]) - self.arrivals[i], self.slack[i + 1])
+    
+    
+    def deadline_minutes(self, pkg):
+        if not self.enforce_deadlines or pkg.delivery_deadline is None:
+            return float('inf')
+        return pkg.deadline_minutes
+    
+    
+    def is_feasible(self):
+        return self.slack[0] >= 0
+    
+    
+    # Returns (position, added_distance) for the cheapest position that keeps every deadline, or None. Ties go to the earliest position.
+    def best_insertion(self, pkg):
+        location = pkg.location
+        deadline = self.deadline_minutes(pkg)
+        best = None
+        
+        for i in range(len(self.route) + 1):
+            prev_location = self.locations[i]
+            next_location = self.locations[i + 1] if i < len(self.route) else self.start_address
+            prev_minutes = self.arrivals[i - 1] if i > 0 else self.departure_minutes
+            
+            to_new = get_travel_minutes(prev_location, location, self.speed_mph)
+            if prev_minutes + to_new > deadline:
+                continue
+            
+            if i < len(self.route):
+                delay = to_new + get_travel_minutes(location, next_location, self.speed_mph) - get_travel_minutes(prev_location, next_location, self.speed_mph)
+                if delay > self.slack[i]:
+                    continue
+            
+            added_distance = get_distance(prev_location, location) + get_distance(location, next_location) - get_distance(prev_location, next_location)
+            if best is None or added_distance < best[1]:
+                best = (i, added_distance)
+        
+        return best
+    
+    
+    def insert(self, pkg, position):
+        self.route.insert(position, pkg)
+        self.rebuild()
+    
+
+# Inserts each new package into an existing route at its cheapest feasible position instead of rebuilding the route. Returns (route_distance, route), or None if the existing route or any new package cannot be kept on time.
+def insert_packages_into_route(route, new_packages, speed_mph, start_address='4001 South 700 East'):
+    combined = list(route) + list(new_packages)
+    
+    # Mirror check_route_feasibility: a route without delivery deadlines is always feasible.
+    enforce_deadlines = any(pkg.delivery_deadline != Package.EOD_TIME for pkg in combined)
+    departure_minutes = get_route_departure_minutes(combined)
+    
+    schedule = RouteSchedule(route, speed_mph, departure_minutes, enforce_deadlines, start_address)
+    if not schedule.is_feasible():
+        return None
+    
+    # Place the tightest deadlines first, while there is the most room to fit them.
+    for pkg in sorted(new_packages, key=schedule.deadline_minutes):
+        insertion = schedule.best_insertion(pkg)
+        if insertion is None:
+            return None
+        schedule.insert(pkg, insertion[0])
     
-    '''#
-    print("\nReturning this package list:")
-    print_package_list(package_list
-    '''#
+    return schedule.distance, schedule.route
     
-    return package_list
+
+def convert_route_to_package_list(route):
+    return list(route_packages(route))
+    
+
+# Yields the package for each stop of a route of (package_id, address_index) tuples, skipping the hub stops (package_id None).
+def route_packages(route):
+    warehouse_hash = get_warehouse_hash()
+    
+    for package_id, _ in route:
+        if package_id is not None:
+            yield warehouse_hash.search(package_id)
     
 
 #jjg
\ No newline at end of file
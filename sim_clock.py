@@ -0,0 +1,64 @@
+import time as simulate_real_time
+
+# How DeliveryHandler lets simulated time pass. The handlers call advance(from_minutes, to_minutes) for every leg a truck drives, with both ends in simulation minutes since midnight; what that costs in real time is up to the clock:
+#   virtual      - nothing; the simulation runs as fast as it can (batch runs, tests, capacity planning)
+#   accelerated  - sleeps each leg's travel minutes divided by rate, the way the simulation always has
+#   wall         - keeps simulation time in step with the real clock (rate simulated minutes per real minute), so an event happens when its time comes round, however long the handlers took
+class VirtualClock:
+    description = "in virtual time"
+
+    def advance(self, from_minutes, to_minutes):
+        pass
+
+
+class AcceleratedClock:
+    description = "in accelerated real-time"
+
+    def __init__(self, rate=80):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+
+
+    def advance(self, from_minutes, to_minutes):
+        simulate_real_time.sleep((to_minutes - from_minutes) / self.rate)
+
+
+class WallClock:
+    description = "in step with the wall clock"
+
+    def __init__(self, rate=1.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        # The real second and the simulation minute the first leg started at; every later event is paced from there.
+        self.origin_seconds = None
+        self.origin_minutes = None
+
+
+    def advance(self, from_minutes, to_minutes):
+        if self.origin_seconds is None:
+            self.origin_seconds = simulate_real_time.monotonic()
+            self.origin_minutes = from_minutes
+
+        due = self.origin_seconds + (to_minutes - self.origin_minutes) * 60 / self.rate
+        wait = due - simulate_real_time.monotonic()
+        # Trucks drive at the same time but the handlers take their legs one at a time, so a leg that ends before the last one did is already due.
+        if wait > 0:
+            simulate_real_time.sleep(wait)
+
+
+CLOCKS = {
+    "virtual": VirtualClock,
+    "accelerated": AcceleratedClock,
+    "wall": WallClock,
+}
+
+
+def make_clock(name, rate=None):
+    if name not in CLOCKS:
+        raise ValueError(f"Unknown clock '{name}'. Choose from: {', '.join(CLOCKS)}")
+    if rate is None or name == "virtual":
+        return CLOCKS[name]()
+    return CLOCKS[name](rate)
+#jjg
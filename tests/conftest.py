@@ -0,0 +1,13 @@
+# tests/conftest.py
+# Helpers shared by the planner tests (k_means, two_opt, load_optimizer, fleet_sizing). Each test file still patches its own module's lookups in its own world fixture.
+import package
+
+
+# Stops on a line: the distance between two stops is the gap between their positions. Index 0 is the hub wherever a hub is needed.
+def line_matrix(positions):
+    return [[abs(a - b) for b in positions] for a in positions]
+
+
+# A package at stop index, with its distance matrix index already resolved. The deadline is EOD unless one is given.
+def make_stop_pkg(id_, index, deadline=None, group=None, note=None):
+    return package.Package(id_, f"Address{index}", "City", "ST", 99999, deadline or package.Package.EOD_TIME, 1.0, note, group=group, address_index=index)
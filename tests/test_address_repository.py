@@ -101,3 +101,13 @@ def test_index_to_address_returns_none_on_not_found(sample_table, bad):
     addresses = sample_table
     ar.set_address_list(addresses)
     assert ar.index_to_address(bad) is None
+
+def test_duplicate_address_resolves_to_first_row():
+    ar.set_address_list([[0, "Hub", "1 Main St"], [1, "Dup", "1 Main St"]])
+    assert ar.address_to_index("1 Main St") == 0
+
+def test_set_rebuilds_lookup_tables(sample_table):
+    ar.set_address_list(sample_table)
+    ar.set_address_list([[9, "Riverfront Park", "507 N Howard St"]])
+    assert ar.address_to_index("10 S Post St") is None
+    assert ar.index_to_address(9) == "507 N Howard St"
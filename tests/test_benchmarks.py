@@ -0,0 +1,161 @@
+# tests/test_benchmarks.py
+import pytest
+import address_repository
+import benchmarks
+import warehouse_repository
+
+@pytest.fixture(autouse=True)
+def restore_address_list(monkeypatch):
+    monkeypatch.setattr(address_repository, "address_list", None, raising=False)
+
+@pytest.fixture
+def restore_warehouse(monkeypatch):
+    for name in ("warehouse_hash", "warehouse_base", "warehouse_journal", "working_hash", "working_version"):
+        monkeypatch.setattr(warehouse_repository, name, None, raising=False)
+
+class TestAddressLookupBenchmark:
+    def test_linear_reference_matches_repository(self):
+        address_list = benchmarks.make_address_list(50)
+        address_repository.set_address_list(address_list)
+
+        for row in address_list:
+            assert benchmarks.linear_address_to_index(address_list, row[2]) == address_repository.address_to_index(row[2])
+
+    def test_bench_address_lookup_reports_timings(self):
+        results = benchmarks.bench_address_lookup(num_addresses=100, num_lookups=10, repeat=1)
+
+        assert results["num_addresses"] == 100
+        assert results["num_lookups"] == 10
+        assert results["linear_seconds"] >= 0
+        assert results["indexed_seconds"] >= 0
+
+class TestWarehouseResetBenchmark:
+    def test_bench_warehouse_reset_reports_timings_and_leaves_packages_reset(self, restore_warehouse):
+        results = benchmarks.bench_warehouse_reset(num_packages=50, num_changed=10, repeat=1)
+
+        assert results["num_packages"] == 50
+        assert results["deepcopy_seconds"] >= 0
+        assert results["journal_seconds"] >= 0
+        assert all(pkg.group is None for pkg in warehouse_repository.get_warehouse_hash())
+
+class TestPackageMemoryBenchmark:
+    def test_dict_reference_has_the_same_fields_as_package(self):
+        ref = benchmarks.DictPackage(1, "A", "City", "ST", 84101, None, 1.0, None)
+        pkg = benchmarks.Package(1, "A", "City", "ST", 84101, None, 1.0, None)
+
+        for name in vars(ref):
+            assert getattr(pkg, name) == getattr(ref, name)
+
+    def test_bench_package_memory_reports_slots_smaller(self):
+        results = benchmarks.bench_package_memory(num_packages=1000)
+
+        assert results["num_packages"] == 1000
+        assert results["slots_bytes"] < results["dict_bytes"]
+
+class TestKMedoidsBenchmark:
+    @pytest.fixture(autouse=True)
+    def restore_distance_matrix(self, monkeypatch):
+        import distance_repository
+        monkeypatch.setattr(distance_repository, "distance_matrix", None)
+        monkeypatch.setattr(distance_repository, "travel_minutes_matrices", {})
+
+    def test_engine_finds_clusters_no_worse_than_voronoi_reference(self):
+        import random
+        import k_means
+        package_list = benchmarks.make_stop_world(60)
+        centroids = k_means.select_unique_package_address(package_list, 2, random.Random(1))
+
+        engine = k_means.MedoidClustering(package_list)
+        engine.fit(centroids)
+        reference = benchmarks.voronoi_k_medoids(package_list, centroids)
+
+        assert sum(map(len, engine.clusters())) == sum(map(len, reference)) == 60
+        reference_engine = k_means.MedoidClustering(package_list)
+        reference_engine.medoids = [reference_engine.point_of_index[k_means.find_new_centroid(c).address_index] for c in reference]
+        reference_engine.labels = reference_engine.nearest_labels()
+        assert engine.total_distance() <= reference_engine.total_distance() + 1e-9
+
+    def test_bench_k_medoids_reports_timings(self):
+        results = benchmarks.bench_k_medoids(num_stops=50, repeat=1)
+
+        assert results["num_stops"] == 50
+        assert results["voronoi_seconds"] >= 0
+        assert results["engine_seconds"] >= 0
+
+class TestRouteImprovementBenchmark:
+    @pytest.fixture(autouse=True)
+    def restore_distance_matrix(self, monkeypatch):
+        import distance_repository
+        monkeypatch.setattr(distance_repository, "distance_matrix", None)
+        monkeypatch.setattr(distance_repository, "travel_minutes_matrices", {})
+
+    def test_greedy_route_visits_every_stop_nearest_first(self):
+        package_list = benchmarks.make_stop_world(20)[1:]
+
+        route = benchmarks.greedy_route(package_list)
+
+        assert sorted(pkg.package_id for pkg in route) == list(range(1, 20))
+        distance_matrix = benchmarks.distance_repository.get_distance_matrix()
+        nearest = min(package_list, key=lambda pkg: distance_matrix[0][pkg.address_index])
+        assert route[0] is nearest
+
+    def test_bench_route_improvement_never_lengthens_the_greedy_route(self):
+        results = benchmarks.bench_route_improvement(num_stops=40, repeat=1)
+
+        assert results["num_stops"] == 40
+        assert results["improved_distance"] <= results["greedy_distance"]
+        assert results["improve_seconds"] >= 0
+
+class TestDeliverySimulationBenchmark:
+    @pytest.fixture(autouse=True)
+    def restore_distance_matrix(self, monkeypatch):
+        import distance_repository
+        monkeypatch.setattr(distance_repository, "distance_matrix", None)
+        monkeypatch.setattr(distance_repository, "travel_minutes_matrices", {})
+
+    def test_make_delivery_fleet_shares_out_the_packages(self):
+        fleet = benchmarks.make_delivery_fleet(num_events=46, num_trucks=3, num_stops=10)
+
+        package_ids = sorted(pkg.package_id for truck in fleet for pkg in truck.package_list)
+        assert package_ids == list(range(40))
+        assert all(truck.driver for truck in fleet)
+
+    def test_bench_delivery_simulation_reports_timings_and_does_not_sleep(self, monkeypatch):
+        import sim_clock
+        monkeypatch.setattr(sim_clock.simulate_real_time, "sleep", lambda seconds: pytest.fail("slept"))
+
+        results = benchmarks.bench_delivery_simulation(num_events=300, num_trucks=4, repeat=1)
+
+        assert results["num_events"] == 300
+        assert results["simulate_seconds"] >= 0
+        assert results["simulate_printing_seconds"] >= 0
+
+    # The target the event queue was brought in for: 100k events well under a second once nothing sleeps or prints.
+    def test_hundred_thousand_events_simulate_in_under_a_second(self):
+        results = benchmarks.bench_delivery_simulation(num_events=100000, num_trucks=10, repeat=1)
+
+        assert results["simulate_seconds"] < 1.0
+
+class TestStatusQueryBenchmark:
+    @pytest.fixture(autouse=True)
+    def restore_distance_matrix(self, monkeypatch):
+        import distance_repository
+        monkeypatch.setattr(distance_repository, "distance_matrix", None)
+        monkeypatch.setattr(distance_repository, "travel_minutes_matrices", {})
+
+    def test_timeline_matches_the_replay_reference(self):
+        import delivery_handler
+        fleet = benchmarks.make_delivery_fleet(num_events=60, num_trucks=3, num_stops=10)
+        handler = delivery_handler.DeliveryHandler()
+        handler.build_delivery_list(fleet)
+
+        for _, _, time, _ in handler.delivery_list:
+            for t in (time - 1, time):
+                assert benchmarks.timeline_package_statuses(handler, fleet, t) == benchmarks.replay_package_statuses(handler.delivery_list, fleet, t)
+
+    def test_bench_status_query_reports_timings(self):
+        results = benchmarks.bench_status_query(num_packages=50, num_trucks=3, num_queries=2, repeat=1)
+
+        assert results["num_packages"] == 50
+        assert results["timeline_query_seconds"] >= 0
+        assert results["replay_query_seconds"] >= 0
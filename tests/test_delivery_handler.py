@@ -3,6 +3,7 @@
 import pytest
 from datetime import time
 import delivery_handler as dh
+import sim_clock
 import fleet
 import package
 import truck
@@ -21,20 +22,23 @@ def make_fleet_four_trucks_even_ids_have_drivers():
             tr.driver = f"Driver-{tr.truck_id}"
     return fl
 
+def minutes(h, m):
+    return h * 60 + m
+
 def make_pkg(id_):
     return package.Package(id_, "Address", "City", "ST", 99999, None, 1.0, None, "at_the_hub", None, None, 0, 0)
 
 @pytest.fixture
 def handler_truck_package():
     handler = dh.DeliveryHandler()
-    handler.previous_locations = []
-    handler.previous_times = []
     handler.delivery_list = []
-    handler.RATE = 60 # Avoid strange time division
+    handler.clock = sim_clock.AcceleratedClock(60) # Avoid strange time division
 
     trk = truck.Truck(0)
     trk.speed_mph = 18
     trk.route_distance = 0.0
+    # The truck is out on its route: last seen downtown at 8:00
+    handler.truck_states = {trk.truck_id: dh.TruckState("1002 W Riverside Ave", minutes(8, 0))}
 
     pkg = make_pkg(0)
     pkg.address = "1702 S Grand"
@@ -50,21 +54,9 @@ def handler_truck_package():
 def fake_time_and_distance(monkeypatch):
     calls = {}
 
-    def fake_get_previous_location(prev_list, truck_id):
-        calls["get_previous_location"] = (list(prev_list), truck_id)
-        return "1002 W Riverside Ave"
-
-    def fake_get_previous_time(prev_times, truck_id):
-        calls["get_previous_time"] = (list(prev_times), truck_id)
-        return time(8, 0)
-
-    def fake_get_arrival_time(last_time, last_loc, dest_addr, speed_mph):
-        calls["get_arrival_time"] = (last_time, last_loc, dest_addr, speed_mph)
-        return time(8, 5)
-
-    def fake_get_travel_time_in_minutes(start, end):
-        calls["get_travel_time_in_minutes"] = (start, end)
-        return 5
+    def fake_get_arrival_minutes(last_time, last_loc, dest_addr, speed_mph):
+        calls["get_arrival_minutes"] = (last_time, last_loc, dest_addr, speed_mph)
+        return minutes(8, 5)
 
     def fake_get_distance(start, end):
         calls["get_distance"] = (start, end)
@@ -73,22 +65,9 @@ def fake_time_and_distance(monkeypatch):
     def fake_sleep(_minutes):
         calls["sleep"] = _minutes
 
-    def fake_update_prev_location(prev_list, truck_id, addr):
-        calls["update_prev_location"] = (list(prev_list), truck_id, addr)
-        prev_list.append((truck_id, addr))
-
-    def fake_update_prev_time(prev_times, truck_id, new_time):
-        calls["update_prev_time"] = (list(prev_times), truck_id, new_time)
-        prev_times.append((truck_id, new_time))
-
-    monkeypatch.setattr(dh, "get_previous_location", fake_get_previous_location)
-    monkeypatch.setattr(dh, "get_previous_time", fake_get_previous_time)
-    monkeypatch.setattr(dh, "get_arrival_time", fake_get_arrival_time)
-    monkeypatch.setattr(dh, "get_travel_time_in_minutes", fake_get_travel_time_in_minutes)
+    monkeypatch.setattr(dh, "get_arrival_minutes", fake_get_arrival_minutes)
     monkeypatch.setattr(dh, "get_distance", fake_get_distance)
-    monkeypatch.setattr(dh.simulate_real_time, "sleep", fake_sleep)
-    monkeypatch.setattr(dh, "update_previous_location", fake_update_prev_location)
-    monkeypatch.setattr(dh, "update_previous_time", fake_update_prev_time)
+    monkeypatch.setattr(sim_clock.simulate_real_time, "sleep", fake_sleep)
 
     return calls
 
@@ -158,19 +137,19 @@ class TestBuildDeliveryList:
         fl = fleet.Fleet(3)
         tr1, tr2, tr3 = fl.truck_list
         tr1.driver, tr2.driver = "Bill", "Ted"
-        tr1.return_time, tr2.return_time = time(8, 0), time(9, 0)
+        tr1.return_time, tr2.return_time = minutes(8, 0), minutes(9, 0)
 
         handler = dh.DeliveryHandler()
         handler.build_delivery_list(fl)
 
-        assert tr3.departure_time == time(8, 0)
+        assert tr3.departure_time == minutes(8, 0)
 
     def test_does_not_change_departure_time_for_available_trucks(self, monkeypatch):
         fl, tr1, tr2 = make_fleet_with_two_trucks()
         tr1.driver, tr2.driver = "Bill", "Ted"
 
-        ititial_departure1 = tr1.departure_time = time(8, 0)
-        ititial_departure2 = tr2.departure_time = time(9, 0)
+        ititial_departure1 = tr1.departure_time = minutes(8, 0)
+        ititial_departure2 = tr2.departure_time = minutes(9, 0)
 
         def fake_separate_trucks_by_driver_status(fleet_):
             return [tr1, tr2], []
@@ -179,7 +158,7 @@ class TestBuildDeliveryList:
 
         def fake_generate_delivery_timeline(self, truck_list):
             for tr in truck_list:
-                tr.return_time = time(10, 0)
+                tr.return_time = minutes(10, 0)
 
         monkeypatch.setattr(dh.DeliveryHandler, "generate_delivery_timeline", fake_generate_delivery_timeline)
 
@@ -203,9 +182,9 @@ class TestBuildDeliveryList:
             if not truck_list: return
             tr = truck_list[0]
             self.delivery_list.extend([
-                (tr, None, time(10, 0), dh.DeliveryAction.DEPART),
-                (tr, None, time(9, 0), dh.DeliveryAction.DEPART),
-                (tr, None, time(11, 0), dh.DeliveryAction.DEPART),
+                (tr, None, minutes(10, 0), dh.DeliveryAction.DEPART),
+                (tr, None, minutes(9, 0), dh.DeliveryAction.DEPART),
+                (tr, None, minutes(11, 0), dh.DeliveryAction.DEPART),
             ])
 
         monkeypatch.setattr(dh.DeliveryHandler, "generate_delivery_timeline", fake_generate_delivery_timeline)
@@ -215,47 +194,47 @@ class TestBuildDeliveryList:
 
         times = [delivery[2] for delivery in handler.delivery_list]
 
-        assert times == [time(9, 0), time(10, 0), time(11, 0)]
+        assert times == [minutes(9, 0), minutes(10, 0), minutes(11, 0)]
 
 class TestGenerateDeliveryTimeline:
     def test_adds_depart_deliver_and_return_events_for_single_truck_single_package(self, monkeypatch):
         tr = truck.Truck(0)
         tr.package_list = [make_pkg(0)]
-        tr.departure_time = time(8, 0)
+        tr.departure_time = minutes(8, 0)
         tr.departure_address = "Departure Address"
 
-        monkeypatch.setattr(dh, "get_arrival_time", lambda *_: time(8, 30))
+        monkeypatch.setattr(dh, "get_arrival_minutes", lambda *_: minutes(8, 30))
 
         handler = dh.DeliveryHandler()
         handler.generate_delivery_timeline([tr])
 
         assert len(handler.delivery_list) == 3
         assert handler.delivery_list == [
-            (tr, None, time(8, 0), dh.DeliveryAction.DEPART),
-            (tr, tr.package_list[0], time(8, 30), dh.DeliveryAction.DELIVER),
-            (tr, None, time(8, 30), dh.DeliveryAction.RETURN)
+            (tr, None, minutes(8, 0), dh.DeliveryAction.DEPART),
+            (tr, tr.package_list[0], minutes(8, 30), dh.DeliveryAction.DELIVER),
+            (tr, None, minutes(8, 30), dh.DeliveryAction.RETURN)
         ]
 
     def test_sets_truck_return_time_to_time_from_return_event(self, monkeypatch):
         tr = truck.Truck(0)
         tr.package_list = [make_pkg(0)]
-        tr.departure_time = time(8, 0)
+        tr.departure_time = minutes(8, 0)
         tr.departure_address = "Departure Address"
 
-        monkeypatch.setattr(dh, "get_arrival_time", lambda *_: time(8, 30))
+        monkeypatch.setattr(dh, "get_arrival_minutes", lambda *_: minutes(8, 30))
 
         handler = dh.DeliveryHandler()
         handler.generate_delivery_timeline([tr])
 
-        assert tr.return_time == time(8, 30)
+        assert tr.return_time == minutes(8, 30)
 
     def test_adds_one_deliver_event_per_package_on_route(self, monkeypatch):
         tr = truck.Truck(0)
         tr.package_list = [make_pkg(i) for i in range(10)]
-        tr.departure_time = time(8, 0)
+        tr.departure_time = minutes(8, 0)
         tr.departure_address = "Departure Address"
 
-        monkeypatch.setattr(dh, "get_arrival_time", lambda *_: time(8, 30))
+        monkeypatch.setattr(dh, "get_arrival_minutes", lambda *_: minutes(8, 30))
 
         handler = dh.DeliveryHandler()
         handler.generate_delivery_timeline([tr])
@@ -266,19 +245,19 @@ class TestGenerateDeliveryTimeline:
         delivered_pkgs = [delivery[1] for delivery in handler.delivery_list if delivery[3] == dh.DeliveryAction.DELIVER]
         assert delivered_pkgs == tr.package_list
 
-    def test_calls_get_arrival_time_for_first_leg_with_departure_address_and_first_package_address(self, monkeypatch):
+    def test_calls_get_arrival_minutes_for_first_leg_with_departure_address_and_first_package_address(self, monkeypatch):
         tr = truck.Truck(0)
         first_pkg = make_pkg(0)
         tr.package_list = [first_pkg]
-        tr.departure_time = time(8, 0)
+        tr.departure_time = minutes(8, 0)
         tr.departure_address = "Departure Address"
 
         calls = []
-        def fake_get_arrival_time(departure_time, start_point, end_point, speed_mph):
+        def fake_get_arrival_minutes(departure_time, start_point, end_point, speed_mph):
             calls.append((departure_time, start_point, end_point, speed_mph))
-            return time(9, 15)
+            return minutes(9, 15)
 
-        monkeypatch.setattr(dh, "get_arrival_time", fake_get_arrival_time)
+        monkeypatch.setattr(dh, "get_arrival_minutes", fake_get_arrival_minutes)
 
         handler = dh.DeliveryHandler()
         handler.generate_delivery_timeline([tr])
@@ -291,26 +270,26 @@ class TestGenerateDeliveryTimeline:
 
         _, pkg_in_tup, timestamp, _ = handler.delivery_list[1]
         assert pkg_in_tup is first_pkg
-        assert timestamp == time(9, 15)
+        assert timestamp == minutes(9, 15)
 
-    def test_calls_get_arrival_time_for_each_subsequent_leg_starting_from_previous_arrival_time(self, monkeypatch):
+    def test_calls_get_arrival_minutes_for_each_subsequent_leg_starting_from_previous_arrival_time(self, monkeypatch):
         tr = truck.Truck(0)
         tr.package_list = [make_pkg(i) for i in range(3)]
-        tr.departure_time = time(8, 0)
+        tr.departure_time = minutes(8, 0)
         tr.departure_address = "Departure Address"
 
         calls = []
         returns = []
         sentinels = [object() for _ in range(10)]
 
-        def fake_get_arrival_time(departure_time, start_point, end_point, speed_mph):
+        def fake_get_arrival_minutes(departure_time, start_point, end_point, speed_mph):
             idx = len(calls)
             calls.append((departure_time, start_point, end_point, speed_mph))
             ret = sentinels[idx]
             returns.append(ret)
             return ret
 
-        monkeypatch.setattr(dh, "get_arrival_time", fake_get_arrival_time)
+        monkeypatch.setattr(dh, "get_arrival_minutes", fake_get_arrival_minutes)
 
         handler = dh.DeliveryHandler()
         handler.generate_delivery_timeline([tr])
@@ -320,20 +299,20 @@ class TestGenerateDeliveryTimeline:
             departure_time, _, _, _ = calls[i]
             assert departure_time is returns[i - 1]
 
-    def test_calls_get_arrival_time_for_each_subsequent_leg_with_previous_and_current_package_addresses(self, monkeypatch):
+    def test_calls_get_arrival_minutes_for_each_subsequent_leg_with_previous_and_current_package_addresses(self, monkeypatch):
         tr = truck.Truck(0)
         tr.package_list = [make_pkg(i) for i in range(3)]
-        tr.departure_time = time(8, 0)
+        tr.departure_time = minutes(8, 0)
         tr.departure_address = "Departure Address"
         for i, pkg in enumerate(tr.package_list):
             pkg.address = f"Address {i}"
 
         calls = []
-        def fake_get_arrival_time(departure_time, start_point, end_point, speed_mph):
+        def fake_get_arrival_minutes(departure_time, start_point, end_point, speed_mph):
             calls.append((departure_time, start_point, end_point, speed_mph))
             return object()
 
-        monkeypatch.setattr(dh, "get_arrival_time", fake_get_arrival_time)
+        monkeypatch.setattr(dh, "get_arrival_minutes", fake_get_arrival_minutes)
 
         handler = dh.DeliveryHandler()
         handler.generate_delivery_timeline([tr])
@@ -350,20 +329,20 @@ class TestGenerateDeliveryTimeline:
             assert start_point == prev_pkg.address
             assert end_point == curr_pkg.address
 
-    def test_calls_get_arrival_time_for_return_leg_with_last_package_address_and_departure_address(self, monkeypatch):
+    def test_calls_get_arrival_minutes_for_return_leg_with_last_package_address_and_departure_address(self, monkeypatch):
         tr = truck.Truck(0)
         tr.package_list = [make_pkg(0), make_pkg(1)]
-        tr.departure_time = time(8, 0)
+        tr.departure_time = minutes(8, 0)
         tr.departure_address = "Warehouse"
         for i, pkg in enumerate(tr.package_list):
             pkg.address = f"Address {i}"
 
         calls = []
-        def fake_get_arrival_time(departure_time, start_point, end_point, speed_mph):
+        def fake_get_arrival_minutes(departure_time, start_point, end_point, speed_mph):
             calls.append((departure_time, start_point, end_point, speed_mph))
-            return time(9, 0)
+            return minutes(9, 0)
 
-        monkeypatch.setattr(dh, "get_arrival_time", fake_get_arrival_time)
+        monkeypatch.setattr(dh, "get_arrival_minutes", fake_get_arrival_minutes)
 
         handler = dh.DeliveryHandler()
         handler.generate_delivery_timeline([tr])
@@ -372,21 +351,34 @@ class TestGenerateDeliveryTimeline:
         _, last_pkg_addr, departure_address, _ = calls[-1]
         assert last_pkg_addr == "Address 1"
         assert departure_address == "Warehouse"
-        assert tr.return_time == time(9, 0)
+        assert tr.return_time == minutes(9, 0)
+
+    def test_timeline_runs_past_midnight(self, monkeypatch):
+        tr = truck.Truck(0)
+        tr.package_list = [make_pkg(0)]
+        tr.departure_time = minutes(23, 50)
+
+        monkeypatch.setattr(dh, "get_arrival_minutes", lambda departure_time, *_: departure_time + 30)
+
+        handler = dh.DeliveryHandler()
+        handler.generate_delivery_timeline([tr])
+
+        assert [event[2] for event in handler.delivery_list] == [minutes(23, 50), minutes(24, 20), minutes(24, 50)]
+        assert tr.return_time == minutes(24, 50)
 
     def test_appends_events_to_existing_delivery_list_without_clearing_it(self, monkeypatch):
         tr = truck.Truck(0)
         tr.package_list = [make_pkg(0)]
-        tr.departure_time = time(8, 0)
+        tr.departure_time = minutes(8, 0)
         tr.departure_address = "Warehouse"
         tr.package_list[0].address = "Pkg Address"
 
         calls = []
-        def fake_get_arrival_time(departure_time, start_point, end_point, speed_mph):
+        def fake_get_arrival_minutes(departure_time, start_point, end_point, speed_mph):
             calls.append((departure_time, start_point, end_point, speed_mph))
             return object()
 
-        monkeypatch.setattr(dh, "get_arrival_time", fake_get_arrival_time)
+        monkeypatch.setattr(dh, "get_arrival_minutes", fake_get_arrival_minutes)
 
         handler = dh.DeliveryHandler()
         sentinal = ("truck", "Package", "Arrival time", "Action")
@@ -401,14 +393,14 @@ class TestGenerateDeliveryTimeline:
         tr1 = truck.Truck(1)
         tr0.package_list = [make_pkg(0), make_pkg(1)]
         tr1.package_list = [make_pkg(2), make_pkg(3)]
-        test_departure_time = time(8, 0)
+        test_departure_time = minutes(8, 0)
         tr0.departure_time = test_departure_time
         tr1.departure_time = test_departure_time
 
-        def fake_get_arrival_time(departure_time, start_point, end_point, speed_mph):
-            return time(9, 0)
+        def fake_get_arrival_minutes(departure_time, start_point, end_point, speed_mph):
+            return minutes(9, 0)
 
-        monkeypatch.setattr(dh, "get_arrival_time", fake_get_arrival_time)
+        monkeypatch.setattr(dh, "get_arrival_minutes", fake_get_arrival_minutes)
 
         handler = dh.DeliveryHandler()
         handler.generate_delivery_timeline([tr0, tr1])
@@ -426,37 +418,37 @@ class TestActionHandlers:
 
         assert all([pkg.delivery_status == 'en_route' for pkg in tr.package_list])
 
-    def test_handle_delivery_action_departed_updates_previous_location_with_departure_address(self):
-        tr = truck.Truck(0)
+    def test_handle_delivery_action_departed_starts_truck_state_at_departure_address_and_time(self):
+        tr = truck.Truck(3)
         tr.departure_address = "5018 W. Montrose Ave"
+        tr.departure_time = minutes(11, 30)
 
         handler = dh.DeliveryHandler()
         handler.handle_delivery_action_departed(tr)
 
-        assert handler.previous_locations[0] == (tr.truck_id, "5018 W. Montrose Ave")
+        state = handler.truck_states[3]
+        assert (state.location, state.time) == ("5018 W. Montrose Ave", minutes(11, 30))
 
-    def test_handle_delivery_action_departed_updates_previous_time_with_departure_time(self):
+    def test_handle_delivery_action_departed_replaces_state_left_from_an_earlier_trip(self):
         tr = truck.Truck(0)
-        tr.departure_time = time(11, 30)
+        tr.departure_address = "5018 W. Montrose Ave"
+        tr.departure_time = minutes(11, 30)
 
         handler = dh.DeliveryHandler()
+        handler.truck_states = {0: dh.TruckState("Somewhere", minutes(10, 0))}
         handler.handle_delivery_action_departed(tr)
 
-        assert handler.previous_times[0] == (tr.truck_id, time(11, 30))
+        assert (handler.truck_states[0].location, handler.truck_states[0].time) == ("5018 W. Montrose Ave", minutes(11, 30))
 
     def test_handle_delivery_action_delivered_updates_truck_and_package_and_previous_state(self, handler_truck_package, fake_time_and_distance):
         handler, tr, pkg = handler_truck_package
-        handler.previous_locations = [(tr.truck_id, "507 N Howard St")]
-        handler.previous_times = [(tr.truck_id, time(7, 0))]
 
-        new_time = handler.handle_delivery_action_delivered(time(8, 30), pkg, tr)
+        new_time = handler.handle_delivery_action_delivered(minutes(8, 30), pkg, tr)
 
         calls = fake_time_and_distance
 
-        assert calls["get_previous_location"][1] == tr.truck_id
-        assert calls["get_previous_time"][1] == tr.truck_id
-
-        last_time, last_loc, dest_addr, speed = calls["get_arrival_time"]
+        last_time, last_loc, dest_addr, speed = calls["get_arrival_minutes"]
+        assert (last_time, last_loc) == (minutes(8, 0), "1002 W Riverside Ave")
         assert dest_addr == pkg.address
         assert speed == tr.speed_mph
 
@@ -465,55 +457,13 @@ class TestActionHandlers:
         assert end == pkg.address
 
         assert "sleep" in calls
-        assert calls["sleep"] == 5 / handler.RATE
+        assert calls["sleep"] == 5 / handler.clock.rate
 
         assert tr.route_distance == 2.3
 
-        assert handler.previous_locations[-1] == (tr.truck_id, pkg.address)
-        assert handler.previous_times[-1][0] == tr.truck_id
-
-        assert pkg.delivery_status == "delivered"
-        assert pkg.time_of_delivery == new_time
-
-    def test_handle_delivery_action_delivered_ignores_special_note_until_correction_time(self, handler_truck_package, fake_time_and_distance):
-        handler, tr, pkg = handler_truck_package
-
-        correction_time = time(9, 30)
-        pkg.special_note = ['X', correction_time, "9711 W Charles Rd", "Nine Mile Falls", "_WA_", 99026]
-
-        handler.delivery_list = [(tr, pkg, time(10, 0), "Before address")]
-        original_delivery_list = list(handler.delivery_list)
-
-        new_time = handler.handle_delivery_action_delivered(time(8, 30), pkg, tr)
-
-        assert handler.delivery_list == original_delivery_list
-
-        assert pkg.address == "1702 S Grand"
-        assert pkg.city == "Spokane"
-        assert pkg.state == "WA"
-        assert pkg.zip_code == 99203
-        assert pkg.address_history == []
-        assert pkg.delivery_status == "delivered"
-        assert pkg.time_of_delivery == new_time
-
-    def test_handle_delivery_action_delivered_updates_special_note_at_correction_time(self, handler_truck_package, fake_time_and_distance):
-        handler, tr, pkg = handler_truck_package
-
-        correction_time = time(8, 0)
-        pkg.special_note = ['X', correction_time, "9711 W Charles Rd", "Nine Mile Falls", "_WA_", 99026]
+        state = handler.truck_states[tr.truck_id]
+        assert (state.location, state.time) == (pkg.address, minutes(8, 5))
 
-        handler.delivery_list = [(tr, pkg, time(10, 0), "Before address")]
-
-        new_time = handler.handle_delivery_action_delivered(time(9, 30), pkg, tr)
-
-        (tr_entry, pkg_entry, event_time, action) = handler.delivery_list[0]
-
-        assert pkg_entry is pkg  # same object
-        assert pkg_entry.address == "9711 W Charles Rd"
-        assert pkg.city == "Nine Mile Falls"
-        assert pkg.state == "_WA_"
-        assert pkg.zip_code == 99026
-        assert pkg.address_history == [(time(8, 0), "9711 W Charles Rd")]
         assert pkg.delivery_status == "delivered"
         assert pkg.time_of_delivery == new_time
 
@@ -521,11 +471,12 @@ class TestActionHandlers:
         handler, tr, _ = handler_truck_package
         tr.departure_address = "4001 South 700 East"
         
-        handler.handle_delivery_action_returned(tr)
+        returned_at = handler.handle_delivery_action_returned(tr)
         
+        assert returned_at == minutes(8, 5)
         assert tr.route_distance == 2.3
-        assert handler.previous_locations == [(tr.truck_id, tr.departure_address), (tr.truck_id, tr.departure_address)]
-        assert handler.previous_times == [(tr.truck_id, time(8, 5))]
+        state = handler.truck_states[tr.truck_id]
+        assert (state.location, state.time) == (tr.departure_address, minutes(8, 5))
 
     def test_handle_delivery_action_returned_calls_time_and_distance_helpers_with_departure_address(self, handler_truck_package, fake_time_and_distance):
         handler, tr, pkg = handler_truck_package
@@ -535,13 +486,157 @@ class TestActionHandlers:
 
         calls = fake_time_and_distance
 
-        assert calls["get_previous_location"] == ([], tr.truck_id)
-        assert calls["get_previous_time"] == ([], tr.truck_id)
-        assert calls["get_arrival_time"] == (time(8, 0), "1002 W Riverside Ave", tr.departure_address, tr.speed_mph)
+        assert calls["get_arrival_minutes"] == (minutes(8, 0), "1002 W Riverside Ave", tr.departure_address, tr.speed_mph)
         assert calls["get_distance"] == ("1002 W Riverside Ave", tr.departure_address)
-        assert calls["get_travel_time_in_minutes"] == (time(8, 0), time(8, 5))
         assert calls["sleep"] == pytest.approx(5/60)
 
+    def test_handlers_let_each_leg_pass_on_the_handlers_clock(self, handler_truck_package, fake_time_and_distance):
+        class RecordingClock:
+            def __init__(self):
+                self.legs = []
+            def advance(self, from_minutes, to_minutes):
+                self.legs.append((from_minutes, to_minutes))
+        handler, tr, pkg = handler_truck_package
+        handler.clock = RecordingClock()
+
+        handler.handle_delivery_action_delivered(minutes(8, 5), pkg, tr)
+        handler.handle_delivery_action_returned(tr)
+
+        # The fake arrival is always 8:05, so the return leg starts and ends where the delivery left off
+        assert handler.clock.legs == [(minutes(8, 0), minutes(8, 5)), (minutes(8, 5), minutes(8, 5))]
+        assert "sleep" not in fake_time_and_distance
+
+    def test_default_clock_is_accelerated_at_rate(self):
+        handler = dh.DeliveryHandler()
+
+        assert isinstance(handler.clock, sim_clock.AcceleratedClock)
+        assert handler.clock.rate == dh.DeliveryHandler.RATE
+
+class TestAddressChanges:
+    def make_handler(self, *packages):
+        tr = truck.Truck(0)
+        handler = dh.DeliveryHandler()
+        handler.delivery_list = [(tr, None, minutes(8, 0), dh.DeliveryAction.DEPART)]
+        handler.delivery_list += [(tr, pkg, minutes(9, i), dh.DeliveryAction.DELIVER) for i, pkg in enumerate(packages)]
+        handler.index_package_events()
+        return handler
+
+    def test_index_package_events_maps_package_ids_to_positions(self):
+        pkg1, pkg2 = make_pkg(1), make_pkg(2)
+        handler = self.make_handler(pkg1, pkg2)
+
+        assert handler.package_events == {1: [1], 2: [2]}
+
+    def test_change_is_not_applied_before_its_time(self):
+        pkg = make_pkg(9)
+        handler = self.make_handler(pkg)
+        handler.queue_address_change(minutes(10, 20), 9, "410 S State St", "Salt Lake City", "UT", 84111)
+
+        handler.apply_address_changes(minutes(10, 19))
+
+        assert pkg.address == "Address"
+        assert len(handler.address_changes) == 1
+
+    def test_change_updates_the_package_and_its_history_at_its_time(self):
+        pkg = make_pkg(9)
+        handler = self.make_handler(pkg)
+        handler.queue_address_change(minutes(10, 20), 9, "410 S State St", "Salt Lake City", "UT", 84111)
+
+        handler.apply_address_changes(minutes(10, 20))
+
+        assert (pkg.address, pkg.city, pkg.state, pkg.zip_code) == ("410 S State St", "Salt Lake City", "UT", 84111)
+        assert pkg.address_history == [(None, "Address"), (minutes(10, 20), "410 S State St")]
+        assert len(handler.address_changes) == 0
+
+    def test_change_only_touches_its_own_package(self):
+        pkg1, pkg2 = make_pkg(1), make_pkg(2)
+        handler = self.make_handler(pkg1, pkg2)
+        handler.queue_address_change(minutes(10, 0), 2, "New St", "City", "ST", 11111)
+
+        handler.apply_address_changes(minutes(11, 0))
+
+        assert pkg1.address == "Address"
+        assert pkg2.address == "New St"
+
+    def test_change_updates_cached_address_index(self, monkeypatch):
+        pkg = make_pkg(9)
+        pkg.address_index = 3
+        monkeypatch.setattr(dh, "address_to_index", lambda address: 7 if address == "9711 W Charles Rd" else None)
+        handler = self.make_handler(pkg)
+        handler.queue_address_change(minutes(8, 0), 9, "9711 W Charles Rd", "Nine Mile Falls", "_WA_", 99026)
+
+        handler.apply_address_changes(minutes(8, 0))
+
+        assert pkg.address_index == 7
+        assert pkg.location == 7
+
+    def test_many_changes_apply_in_time_order_and_the_last_one_wins(self):
+        pkg = make_pkg(9)
+        handler = self.make_handler(pkg)
+        handler.queue_address_change(minutes(11, 0), 9, "Third St", "City", "ST", 3)
+        handler.queue_address_change(minutes(9, 0), 9, "First St", "City", "ST", 1)
+        handler.queue_address_change(minutes(10, 0), 9, "Second St", "City", "ST", 2)
+
+        handler.apply_address_changes(minutes(12, 0))
+
+        assert pkg.address == "Third St"
+        assert pkg.address_history[1:] == [(minutes(9, 0), "First St"), (minutes(10, 0), "Second St"), (minutes(11, 0), "Third St")]
+
+    def test_change_after_delivery_is_dropped(self):
+        pkg = make_pkg(9)
+        pkg.delivery_status = "delivered"
+        handler = self.make_handler(pkg)
+        handler.queue_address_change(minutes(10, 0), 9, "New St", "City", "ST", 11111)
+
+        handler.apply_address_changes(minutes(10, 0))
+
+        assert pkg.address == "Address"
+        assert len(handler.address_changes) == 0
+
+    def test_change_for_a_package_not_on_any_truck_is_dropped(self):
+        handler = self.make_handler(make_pkg(1))
+        handler.queue_address_change(minutes(10, 0), 42, "New St", "City", "ST", 11111)
+
+        handler.apply_address_changes(minutes(10, 0))
+
+        assert len(handler.address_changes) == 0
+
+    def test_queue_noted_address_changes_queues_x_notes_at_their_correction_time(self):
+        pkg = make_pkg(9)
+        pkg.special_note = ['X', time(10, 20), "410 S State St", "Salt Lake City", "UT", 84111]
+        handler = self.make_handler(make_pkg(1), pkg)
+
+        handler.queue_noted_address_changes()
+
+        assert handler.address_changes.pop() == (minutes(10, 20), 0, (9, "410 S State St", "Salt Lake City", "UT", 84111))
+        assert len(handler.address_changes) == 0
+
+    def test_deliver_packages_applies_x_note_once_the_simulation_reaches_it(self, fake_delivery_action_handlers, monkeypatch, capsys):
+        fl, t1, _ = make_fleet_with_two_trucks()
+        early, rerouted = make_pkg(1), make_pkg(9)
+        early.delivery_deadline = rerouted.delivery_deadline = package.Package.EOD_TIME
+        rerouted.special_note = ['X', time(10, 20), "410 S State St", "Salt Lake City", "UT", 84111]
+
+        seen_at_delivery = {}
+        def fake_delivered(self, time_, package_, truck_):
+            seen_at_delivery[package_.package_id] = package_.address
+            return time_
+        monkeypatch.setattr(dh.DeliveryHandler, "handle_delivery_action_delivered", fake_delivered)
+
+        handler = dh.DeliveryHandler()
+        handler.delivery_list = [
+            (t1, None, minutes(8, 0), dh.DeliveryAction.DEPART),
+            (t1, early, minutes(10, 0), dh.DeliveryAction.DELIVER),
+            (t1, rerouted, minutes(10, 30), dh.DeliveryAction.DELIVER),
+            (t1, None, minutes(11, 0), dh.DeliveryAction.RETURN),
+        ]
+        handler.deliver_packages(fl)
+
+        assert seen_at_delivery == {1: "Address", 9: "410 S State St"}
+        assert rerouted.address_history[-1] == (minutes(10, 20), "410 S State St")
+        out = capsys.readouterr().out
+        assert out.index("Address correction for package 9") < out.index("Package: 9")
+
 class TestDeliverPackages:
     def test_deliver_packages_processes_delivery_list_in_order_and_dispatches_handlers(self, fake_delivery_action_handlers):
         fl, t1, _ = make_fleet_with_two_trucks()
@@ -550,16 +645,16 @@ class TestDeliverPackages:
 
         handler = dh.DeliveryHandler()
         handler.delivery_list = [
-            (t1, None, time(8, 0), dh.DeliveryAction.DEPART),
-            (t1, pkg0, time(8, 30), dh.DeliveryAction.DELIVER),
-            (t1, None, time(9, 0), dh.DeliveryAction.RETURN),
+            (t1, None, minutes(8, 0), dh.DeliveryAction.DEPART),
+            (t1, pkg0, minutes(8, 30), dh.DeliveryAction.DELIVER),
+            (t1, None, minutes(9, 0), dh.DeliveryAction.RETURN),
         ]
 
         handler.deliver_packages(fl)
 
         assert fake_delivery_action_handlers == [
             (dh.DeliveryAction.DEPART, t1),
-            (dh.DeliveryAction.DELIVER, time(8, 30), pkg0, t1),
+            (dh.DeliveryAction.DELIVER, minutes(8, 30), pkg0, t1),
             (dh.DeliveryAction.RETURN, t1),
         ]
 
@@ -569,10 +664,10 @@ class TestDeliverPackages:
 
         handler = dh.DeliveryHandler()
         handler.delivery_list = [
-            (t1, None, time(8, 0), dh.DeliveryAction.DEPART),
-            (t1, None, time(9, 0), dh.DeliveryAction.RETURN),
-            (t2, None, time(10, 0), dh.DeliveryAction.DEPART),
-            (t2, None, time(11, 0), dh.DeliveryAction.RETURN),
+            (t1, None, minutes(8, 0), dh.DeliveryAction.DEPART),
+            (t1, None, minutes(9, 0), dh.DeliveryAction.RETURN),
+            (t2, None, minutes(10, 0), dh.DeliveryAction.DEPART),
+            (t2, None, minutes(11, 0), dh.DeliveryAction.RETURN),
         ]
 
         handler.deliver_packages(fl)
@@ -580,18 +675,16 @@ class TestDeliverPackages:
         assert t1.driver == "Bill"
         assert t2.driver == "Bill"
 
-    def test_deliver_packages_resets_previous_state_lists_at_end(self, fake_delivery_action_handlers):
+    def test_deliver_packages_resets_truck_states_at_end(self, fake_delivery_action_handlers):
         fl, t1, _ = make_fleet_with_two_trucks()
 
         handler = dh.DeliveryHandler()
-        handler.previous_locations = [(0, "123 Main St")]
-        handler.previous_times = [(0, time(8, 0))]
+        handler.truck_states = {0: dh.TruckState("123 Main St", minutes(8, 0))}
         assert handler.delivery_list == []
 
         handler.deliver_packages(fl)
 
-        assert handler.previous_locations == []
-        assert handler.previous_times == []
+        assert handler.truck_states == {}
 
     def test_deliver_packages_prints_actual_time_returned_by_delivered_handler(self, monkeypatch, capsys):
         fl, t1, _ = make_fleet_with_two_trucks()
@@ -603,12 +696,12 @@ class TestDeliverPackages:
 
         handler = dh.DeliveryHandler()
         handler.delivery_list = [
-            (t1, None, time(8, 0), dh.DeliveryAction.DEPART),
-            (t1, pkg0, time(8, 30), dh.DeliveryAction.DELIVER),  # queued time
+            (t1, None, minutes(8, 0), dh.DeliveryAction.DEPART),
+            (t1, pkg0, minutes(8, 30), dh.DeliveryAction.DELIVER),  # queued time
         ]
 
         def fake_delivered(self, time_, package_, truck_):
-            return time(10, 0)
+            return minutes(10, 0)
 
         monkeypatch.setattr(dh.DeliveryHandler, "handle_delivery_action_delivered", fake_delivered)
 
@@ -630,12 +723,12 @@ class TestDeliverPackages:
 
         handler = dh.DeliveryHandler()
         handler.delivery_list = [
-            (t1, None, time(8, 0), dh.DeliveryAction.DEPART),
-            (t1, pkg0, time(8, 30), dh.DeliveryAction.DELIVER),  # queued time would look "on time"
+            (t1, None, minutes(8, 0), dh.DeliveryAction.DEPART),
+            (t1, pkg0, minutes(8, 30), dh.DeliveryAction.DELIVER),  # queued time would look "on time"
         ]
 
         def fake_delivered(self, time_, package_, truck_):
-            return time(10, 0)
+            return minutes(10, 0)
 
         monkeypatch.setattr(dh.DeliveryHandler, "handle_delivery_action_delivered", fake_delivered)
 
@@ -656,12 +749,12 @@ class TestDeliverPackages:
 
         handler = dh.DeliveryHandler()
         handler.delivery_list = [
-            (t1, None, time(8, 0), dh.DeliveryAction.DEPART),
-            (t1, pkg0, time(8, 30), dh.DeliveryAction.DELIVER),
+            (t1, None, minutes(8, 0), dh.DeliveryAction.DEPART),
+            (t1, pkg0, minutes(8, 30), dh.DeliveryAction.DELIVER),
         ]
 
         def fake_delivered(self, time_, package_, truck_):
-            return time(10, 0)
+            return minutes(10, 0)
 
         monkeypatch.setattr(dh.DeliveryHandler, "handle_delivery_action_delivered", fake_delivered)
 
@@ -672,6 +765,106 @@ class TestDeliverPackages:
         assert "Delivery Deadline: EOD" in out
         assert "Met deadline:" not in out
 
+    def test_deliver_packages_moves_a_late_trucks_later_events_behind_other_trucks(self, fake_delivery_action_handlers, monkeypatch):
+        fl, t1, t2 = make_fleet_with_two_trucks()
+        t1.driver, t2.driver = "Bill", "Ann"
+        pkg1, pkg2 = make_pkg(1), make_pkg(2)
+        pkg1.delivery_deadline = pkg2.delivery_deadline = package.Package.EOD_TIME
+
+        handler = dh.DeliveryHandler()
+        handler.delivery_list = [
+            (t1, None, minutes(8, 0), dh.DeliveryAction.DEPART),
+            (t2, None, minutes(8, 0), dh.DeliveryAction.DEPART),
+            (t1, pkg1, minutes(8, 10), dh.DeliveryAction.DELIVER),
+            (t2, pkg2, minutes(8, 15), dh.DeliveryAction.DELIVER),
+            (t1, None, minutes(8, 20), dh.DeliveryAction.RETURN),
+            (t2, None, minutes(8, 30), dh.DeliveryAction.RETURN),
+        ]
+
+        # Truck 1 gets to package 1 fifteen minutes late, so it is back at 8:35, after truck 2
+        def fake_delivered(self, time_, package_, truck_):
+            fake_delivery_action_handlers.append((dh.DeliveryAction.DELIVER, time_, package_, truck_))
+            return time_ + 15 if package_ is pkg1 else time_
+        monkeypatch.setattr(dh.DeliveryHandler, "handle_delivery_action_delivered", fake_delivered)
+
+        handler.deliver_packages(fl)
+
+        assert fake_delivery_action_handlers == [
+            (dh.DeliveryAction.DEPART, t1),
+            (dh.DeliveryAction.DEPART, t2),
+            (dh.DeliveryAction.DELIVER, minutes(8, 10), pkg1, t1),
+            (dh.DeliveryAction.DELIVER, minutes(8, 15), pkg2, t2),
+            (dh.DeliveryAction.RETURN, t2),
+            (dh.DeliveryAction.RETURN, t1),
+        ]
+
+    def test_deliver_packages_waiting_truck_leaves_when_a_late_driver_gets_back(self, fake_delivery_action_handlers, monkeypatch, capsys):
+        fl, t1, t2 = make_fleet_with_two_trucks()
+        t1.driver = "Bill"
+        t2.departure_time = minutes(8, 20)
+        pkg1, pkg2 = make_pkg(1), make_pkg(2)
+        pkg1.delivery_deadline = pkg2.delivery_deadline = package.Package.EOD_TIME
+
+        handler = dh.DeliveryHandler()
+        handler.delivery_list = [
+            (t1, None, minutes(8, 0), dh.DeliveryAction.DEPART),
+            (t1, pkg1, minutes(8, 10), dh.DeliveryAction.DELIVER),
+            (t1, None, minutes(8, 20), dh.DeliveryAction.RETURN),
+            (t2, None, minutes(8, 20), dh.DeliveryAction.DEPART),
+            (t2, pkg2, minutes(8, 30), dh.DeliveryAction.DELIVER),
+            (t2, None, minutes(8, 40), dh.DeliveryAction.RETURN),
+        ]
+
+        def fake_delivered(self, time_, package_, truck_):
+            fake_delivery_action_handlers.append((dh.DeliveryAction.DELIVER, time_, package_, truck_))
+            return time_ + 5 if package_ is pkg1 else time_
+        monkeypatch.setattr(dh.DeliveryHandler, "handle_delivery_action_delivered", fake_delivered)
+
+        handler.deliver_packages(fl)
+
+        assert t2.driver == "Bill"
+        assert t2.departure_time == minutes(8, 25)
+        assert (dh.DeliveryAction.DELIVER, minutes(8, 35), pkg2, t2) in fake_delivery_action_handlers
+        assert "Departed  08:25 | Truck ID: 2" in capsys.readouterr().out
+
+    def test_deliver_packages_prints_actual_return_time(self, monkeypatch, capsys):
+        fl, t1, _ = make_fleet_with_two_trucks()
+        t1.driver = "Bill"
+        t1.departure_address = "4001 South 700 East"
+
+        handler = dh.DeliveryHandler()
+        handler.delivery_list = [
+            (t1, None, minutes(8, 0), dh.DeliveryAction.DEPART),
+            (t1, None, minutes(9, 0), dh.DeliveryAction.RETURN),
+        ]
+        monkeypatch.setattr(dh.DeliveryHandler, "handle_delivery_action_departed", lambda self, truck_: None)
+        monkeypatch.setattr(dh.DeliveryHandler, "handle_delivery_action_returned", lambda self, truck_: minutes(8, 57))
+
+        handler.deliver_packages(fl)
+
+        assert "Returned  08:57 | Truck ID: 1" in capsys.readouterr().out
+
+    def test_quiet_handler_only_prints_the_final_route_distances(self, fake_delivery_action_handlers, capsys):
+        fl, t1, _ = make_fleet_with_two_trucks()
+        pkg0 = make_pkg(0)
+        pkg0.delivery_deadline = time(10, 30)
+        pkg9 = make_pkg(9)
+        pkg9.special_note = ['X', time(8, 10), "410 S State St", "Salt Lake City", "UT", 84111]
+
+        handler = dh.DeliveryHandler(quiet=True)
+        handler.delivery_list = [
+            (t1, None, minutes(8, 0), dh.DeliveryAction.DEPART),
+            (t1, pkg0, minutes(8, 30), dh.DeliveryAction.DELIVER),
+            (t1, pkg9, minutes(8, 40), dh.DeliveryAction.DELIVER),
+            (t1, None, minutes(9, 0), dh.DeliveryAction.RETURN),
+        ]
+
+        handler.deliver_packages(fl)
+
+        assert len(fake_delivery_action_handlers) == 4
+        assert pkg9.address == "410 S State St"
+        assert capsys.readouterr().out.splitlines() == ["", "Truck ID: 1, Final Route Distance: 0.0", "Truck ID: 2, Final Route Distance: 0.0"]
+
 class TestPrintDeliveryList:
     def test_print_delivery_list_outputs_expected_lines(self, capsys):
         fl, t1, _ = make_fleet_with_two_trucks()
@@ -682,8 +875,8 @@ class TestPrintDeliveryList:
 
         handler = dh.DeliveryHandler()
         handler.delivery_list = [
-            (t1, None, time(8, 0), dh.DeliveryAction.DEPART),
-            (t1, pkg0, time(8, 30), dh.DeliveryAction.DELIVER),
+            (t1, None, minutes(8, 0), dh.DeliveryAction.DEPART),
+            (t1, pkg0, minutes(8, 30), dh.DeliveryAction.DELIVER),
         ]
 
         handler.print_delivery_list()
@@ -716,8 +909,8 @@ class TestPrintPackageStatusesAt:
 
         handler = dh.DeliveryHandler()
         handler.delivery_list = [
-            (t1, None, time(8, 0), dh.DeliveryAction.DEPART),
-            (t1, pkg0, time(9, 0), dh.DeliveryAction.DELIVER),
+            (t1, None, minutes(8, 0), dh.DeliveryAction.DEPART),
+            (t1, pkg0, minutes(9, 0), dh.DeliveryAction.DELIVER),
         ]
 
         handler.print_package_statuses_at(time(8, 30), fl)
@@ -729,12 +922,112 @@ class TestPrintPackageStatusesAt:
         assert "Delivery Status: en_route" in output
         assert "Time of Delivery: NA" in output
 
+    def test_print_package_statuses_at_accepts_minutes_past_midnight(self, capsys):
+        fl, t1, _ = make_fleet_with_two_trucks()
+
+        pkg0 = make_pkg(0)
+        pkg0.delivery_deadline = package.Package.EOD_TIME
+        t1.package_list = [pkg0]
+
+        handler = dh.DeliveryHandler()
+        handler.delivery_list = [
+            (t1, None, minutes(23, 30), dh.DeliveryAction.DEPART),
+            (t1, pkg0, minutes(24, 15), dh.DeliveryAction.DELIVER),
+        ]
+
+        handler.print_package_statuses_at(minutes(24, 30), fl)
+
+        output = capsys.readouterr().out
+
+        assert "Delivery Status: delivered" in output
+        assert "Time of Delivery: 00:15 +1d" in output
+
+    def test_print_package_statuses_at_marks_packages_delivered_or_at_the_hub(self, capsys):
+        fl, t1, t2 = make_fleet_with_two_trucks()
+        pkg0, pkg1 = make_pkg(0), make_pkg(1)
+        pkg0.delivery_deadline = pkg1.delivery_deadline = package.Package.EOD_TIME
+        t1.package_list, t2.package_list = [pkg0], [pkg1]
+
+        handler = dh.DeliveryHandler()
+        handler.delivery_list = [
+            (t1, None, minutes(8, 0), dh.DeliveryAction.DEPART),
+            (t1, pkg0, minutes(8, 20), dh.DeliveryAction.DELIVER),
+            (t2, None, minutes(9, 5), dh.DeliveryAction.DEPART),
+            (t2, pkg1, minutes(9, 30), dh.DeliveryAction.DELIVER),
+        ]
+
+        handler.print_package_statuses_at(time(9, 0), fl)
+
+        lines = capsys.readouterr().out.splitlines()
+        assert "Delivery Status: delivered" in lines[0] and "Time of Delivery: 08:20" in lines[0]
+        assert "Delivery Status: at_the_hub" in lines[1] and "Time of Delivery: NA" in lines[1]
+
+    def test_print_package_statuses_at_shows_the_address_at_the_query_time(self, capsys):
+        fl, t1, _ = make_fleet_with_two_trucks()
+        pkg0 = make_pkg(0)
+        pkg0.delivery_deadline = package.Package.EOD_TIME
+        pkg0.address_history = [(None, "300 State St"), (minutes(10, 20), "410 S State St")]
+        t1.package_list = [pkg0]
+
+        handler = dh.DeliveryHandler()
+        handler.delivery_list = [(t1, None, minutes(8, 0), dh.DeliveryAction.DEPART)]
+
+        handler.print_package_statuses_at(time(10, 0), fl)
+        handler.print_package_statuses_at(time(10, 30), fl)
+
+        lines = capsys.readouterr().out.splitlines()
+        assert "Address: 300 State St " in lines[0]
+        assert "Address: 410 S State St " in lines[1]
+
+    def test_status_timeline_is_built_once_per_fleet(self, monkeypatch):
+        fl, t1, _ = make_fleet_with_two_trucks()
+        t1.package_list = [make_pkg(0)]
+        handler = dh.DeliveryHandler()
+
+        builds = []
+        original = dh.DeliveryHandler.build_status_timeline
+        def counting_build(self, fleet_):
+            builds.append(fleet_)
+            return original(self, fleet_)
+        monkeypatch.setattr(dh.DeliveryHandler, "build_status_timeline", counting_build)
+
+        first = handler.status_timeline_for(fl)
+        assert handler.status_timeline_for(fl) is first
+        other_fleet, _, _ = make_fleet_with_two_trucks()
+        handler.status_timeline_for(other_fleet)
+
+        assert builds == [fl, other_fleet]
+
+    def test_build_delivery_list_drops_the_status_timeline(self):
+        fl, _, _ = make_fleet_with_two_trucks()
+        handler = dh.DeliveryHandler()
+        handler.status_timeline_for(fl)
+
+        handler.build_delivery_list(fleet.Fleet(0))
+
+        assert handler.status_timeline is None
+
+    def test_address_change_updates_the_status_timeline(self):
+        fl, t1, _ = make_fleet_with_two_trucks()
+        pkg0 = make_pkg(0)
+        t1.package_list = [pkg0]
+        handler = dh.DeliveryHandler()
+        handler.delivery_list = [(t1, pkg0, minutes(11, 0), dh.DeliveryAction.DELIVER)]
+        handler.index_package_events()
+        timeline = handler.status_timeline_for(fl)[0]
+
+        handler.queue_address_change(minutes(10, 20), 0, "410 S State St", "Salt Lake City", "UT", 84111)
+        handler.apply_address_changes(minutes(10, 20))
+
+        assert timeline.address_at(minutes(10, 0)) == "Address"
+        assert timeline.address_at(minutes(10, 20)) == "410 S State St"
+
 class TestHelper:
     def test_separate_trucks_by_driver_status_places_trucks_with_drivers_in_available(self, monkeypatch):
         fl, tr1, tr2 = make_fleet_with_two_trucks()
         tr1.driver, tr2.driver = "Leonard", "Mary"
         
-        monkeypatch.setattr(dh, "get_route_departure_time", lambda t: None)
+        monkeypatch.setattr(dh, "get_route_departure_minutes", lambda t: None)
         
         available, _ = dh.separate_trucks_by_driver_status(fl)
         
@@ -744,7 +1037,7 @@ class TestHelper:
     def test_separate_trucks_by_driver_status_places_trucks_without_drivers_in_waiting(self, monkeypatch):
         fl, tr1, tr2 = make_fleet_with_two_trucks()
         
-        monkeypatch.setattr(dh, "get_route_departure_time", lambda t: None)
+        monkeypatch.setattr(dh, "get_route_departure_minutes", lambda t: None)
         
         _, waiting = dh.separate_trucks_by_driver_status(fl)
         
@@ -755,17 +1048,17 @@ class TestHelper:
         fl, tr1, tr2 = make_fleet_with_two_trucks()
         tr1.driver, tr2.driver = "Leonard", "Mary"
         
-        monkeypatch.setattr(dh, "get_route_departure_time", lambda t: time(8, 0))
+        monkeypatch.setattr(dh, "get_route_departure_minutes", lambda t: minutes(8, 0))
         
         dh.separate_trucks_by_driver_status(fl)
         
-        assert tr1.departure_time == time(8, 0)
-        assert tr2.departure_time == time(8, 0)
+        assert tr1.departure_time == minutes(8, 0)
+        assert tr2.departure_time == minutes(8, 0)
 
     def test_separate_trucks_by_driver_status_does_not_set_departure_time_for_waiting_trucks(self, monkeypatch):
         fl, tr1, tr2 = make_fleet_with_two_trucks()
         
-        monkeypatch.setattr(dh, "get_route_departure_time", lambda t: time(8, 0))
+        monkeypatch.setattr(dh, "get_route_departure_minutes", lambda t: minutes(8, 0))
         
         dh.separate_trucks_by_driver_status(fl)
         
@@ -775,7 +1068,7 @@ class TestHelper:
     def test_separate_trucks_by_driver_status_returns_lists_in_original_order(self, monkeypatch):
         fl = make_fleet_four_trucks_even_ids_have_drivers()
         
-        monkeypatch.setattr(dh, "get_route_departure_time", lambda t: time(8, 0))
+        monkeypatch.setattr(dh, "get_route_departure_minutes", lambda t: minutes(8, 0))
         
         available, waiting = dh.separate_trucks_by_driver_status(fl)
         
@@ -788,21 +1081,21 @@ class TestHelper:
     def test_separate_trucks_by_driver_status_handles_empty_fleet(self, monkeypatch):
         fl = fleet.Fleet(0)
         
-        monkeypatch.setattr(dh, "get_route_departure_time", lambda t: time(8, 0))
+        monkeypatch.setattr(dh, "get_route_departure_minutes", lambda t: minutes(8, 0))
         
         available, waiting = dh.separate_trucks_by_driver_status(fl)
         
         assert available == [] and waiting == []
         
-    def test_separate_trucks_by_driver_status_invokes_get_route_departure_time_once_per_available_truck(self, monkeypatch):
+    def test_separate_trucks_by_driver_status_invokes_get_route_departure_minutes_once_per_available_truck(self, monkeypatch):
         fl = make_fleet_four_trucks_even_ids_have_drivers()
                 
         call_count = {"count": 0}
-        def fake_get_route_departure_time(package_list):
+        def fake_get_route_departure_minutes(package_list):
             call_count["count"] += 1
-            return time(8, 0)
+            return minutes(8, 0)
             
-        monkeypatch.setattr(dh, "get_route_departure_time", fake_get_route_departure_time)
+        monkeypatch.setattr(dh, "get_route_departure_minutes", fake_get_route_departure_minutes)
         
         dh.separate_trucks_by_driver_status(fl)
         
@@ -844,284 +1137,55 @@ class TestHelper:
         after = snapshot(pkg)
         assert before == after
 
-    def test_update_previous_location_appends_new_entry_when_list_is_empty(self):
-        previous_locations = []
-        truck_id = 0
-        address = "Address"
-
-        dh.update_previous_location(previous_locations, truck_id, address)
-
-        assert len(previous_locations) == 1
-        assert previous_locations == [(truck_id, address)]
-
-    def test_update_previous_location_appends_new_entry_for_new_truck_id(self):
-        previous_locations = [(0, "Address1")]
-        truck_id = 1
-        address = "Address2"
-
-        dh.update_previous_location(previous_locations, truck_id, address)
-
-        assert len(previous_locations) == 2
-        assert previous_locations[1] == (truck_id, address)
-
-    def test_update_previous_location_updates_existing_entry_for_same_truck_id(self):
-        previous_locations = [(0, "OldAddress")]
-        truck_id = 0
-        address = "NewAddress"
-
-        dh.update_previous_location(previous_locations, truck_id, address)
-
-        assert len(previous_locations) == 1
-        assert previous_locations[0] == (truck_id, address)
-
-    def test_update_previous_location_preserves_order_when_updating_existing_entry(self):
-        first = (0, "First")
-        second = (1, "Second")
-        previous_locations = [first, second]
-        truck_id = 1
-        address = "NewSecond"
-
-        dh.update_previous_location(previous_locations, truck_id, address)
-
-        assert len(previous_locations) == 2
-        assert previous_locations[0] == first
-        assert previous_locations[1] == (truck_id, address)
-
-    def test_update_previous_location_mutates_list_in_place(self):
-        original = (0, "Address1")
-        previous_locations = [original]
-        truck_id = 1
-        address = "Address2"
-
-        before_id = id(previous_locations)
-        dh.update_previous_location(previous_locations, truck_id, address)
-
-        assert id(previous_locations) == before_id
-
-    @pytest.mark.parametrize("truck_id", [
-        "String",
-        1.0,
-        (True, False),
-        frozenset([1, 2]),
-        None,
-        [1, 2, 3],
-        {"id": 5},
-    ])
-    def test_update_previous_location_accepts_any_truck_id_type(self, truck_id):
-        previous_locations = []
-
-        dh.update_previous_location(previous_locations, truck_id, "Address")
-
-        assert previous_locations == [(truck_id, "Address")]
-
-    def test_get_previous_location_returns_address_when_truck_id_exists(self):
-        previous_locations = [(0, "Address1"), (1, "Address2")]
-
-        address = dh.get_previous_location(previous_locations, 1)
-
-        assert address == "Address2"
-
-    def test_get_previous_location_returns_none_when_truck_id_not_present(self):
-        previous_locations = [(0, "Address1"), (1, "Address2")]
-
-        address = dh.get_previous_location(previous_locations, 2)
-
-        assert address is None
-
-    def test_get_previous_location_returns_none_when_prev_locations_list_empty(self):
-        previous_locations = []
-
-        address = dh.get_previous_location(previous_locations, 1)
-
-        assert address is None
-
-    def test_update_previous_time_appends_new_entry_when_list_is_empty(self):
-        previous_times = []
-        truck_id = 0
-        timestamp = time(8, 0)
-
-        dh.update_previous_time(previous_times, truck_id, timestamp)
-
-        assert len(previous_times) == 1
-        assert previous_times == [(truck_id, timestamp)]
-
-    def test_update_previous_time_appends_new_entry_for_new_truck_id(self):
-        previous_times = [(0, time(8, 0))]
-        truck_id = 1
-        timestamp = time(8, 30)
-
-        dh.update_previous_time(previous_times, truck_id, timestamp)
-
-        assert len(previous_times) == 2
-        assert previous_times[1] == (truck_id, timestamp)
-
-    def test_update_previous_time_updates_existing_entry_for_same_truck_id(self):
-        previous_times = [(0, time(8, 30))]
-        truck_id = 0
-        timestamp = time(18, 30)
-
-        dh.update_previous_time(previous_times, truck_id, timestamp)
-
-        assert len(previous_times) == 1
-        assert previous_times[0] == (truck_id, timestamp)
-
-    def test_update_previous_time_preserves_order_when_updating_existing_entry(self):
-        first = (0, time(1, 0))
-        second = (1, time(2, 0))
-        previous_times = [first, second]
-        truck_id = 1
-        timestamp = time(3, 0)
-
-        dh.update_previous_time(previous_times, truck_id, timestamp)
-
-        assert len(previous_times) == 2
-        assert previous_times[0] == first
-        assert previous_times[1] == (truck_id, timestamp)
-
-    def test_update_previous_time_mutates_list_in_place(self):
-        original = (0, time(8, 0))
-        previous_times = [original]
-        truck_id = 1
-        timestamp = time(9, 30)
-
-        before_id = id(previous_times)
-        dh.update_previous_time(previous_times, truck_id, timestamp)
-
-        assert id(previous_times) == before_id
-
-    @pytest.mark.parametrize("truck_id", [
-        "String",
-        1.0,
-        (True, False),
-        frozenset([1, 2]),
-        None,
-        [1, 2, 3],
-        {"id": 5},
-    ])
-    def test_update_previous_time_accepts_any_truck_id_type(self, truck_id):
-        previous_times = []
-
-        dh.update_previous_time(previous_times, truck_id, time(8, 30))
-        assert previous_times == [(truck_id, time(8, 30))]
-
-    def test_get_previous_time_returns_time_when_truck_id_exists(self):
-        previous_times = [(0, time(1, 0)), (1, time(2, 0))]
-
-        timestamp = dh.get_previous_time(previous_times, 1)
-
-        assert timestamp == time(2, 0)
-
-    def test_get_previous_time_returns_none_when_truck_id_not_present(self):
-        previous_times = [(0, time(1, 0)), (1, time(2, 0))]
-
-        timestamp = dh.get_previous_time(previous_times, 2)
-
-        assert timestamp is None
-
-    def test_get_previous_time_returns_none_when_prev_times_list_empty(self):
-        previous_times = []
-
-        timestamp = dh.get_previous_time(previous_times, 1)
-
-        assert timestamp is None
-
-    def test_copy_package_creates_new_package_with_copied_fields_and_overrides(self):
-        def snapshot(pkg):
-            return (pkg.address, pkg.city, pkg.state, pkg.zip_code, pkg.delivery_deadline, pkg.weight_kilo, pkg.special_note, pkg.group, pkg.priority)
-
-        pkg = make_pkg(0)
-        pkg.delivery_status = 'X'
-        pkg.time_of_delivery = 'X'
-        pkg.truck = '0'
-        before = snapshot(pkg)
-
-        new_pkg = dh.copy_package(pkg, 1)
-
-        after = snapshot(new_pkg)
-
-        assert new_pkg is not pkg
-        assert before == after
-        assert new_pkg.delivery_status == 'at_the_hub'
-        assert new_pkg.time_of_delivery is None
-        assert new_pkg.truck == 1
-
-    def test_copy_package_uses_separate_address_history_list(self):
-        pkg = make_pkg(0)
-        pkg.address_history = [(time(9, 0), "First Address"), (time(9, 30), "Second Address")]
+    def test_truck_state_move_to_updates_location_and_time(self):
+        state = dh.TruckState("Hub", minutes(8, 0))
 
-        new_pkg = dh.copy_package(pkg, 1)
+        state.move_to("Address1", minutes(8, 10))
 
-        assert new_pkg.address_history == pkg.address_history
-        assert id(new_pkg.address_history) != id(pkg.address_history)
+        assert (state.location, state.time) == ("Address1", minutes(8, 10))
 
-        new_pkg.address_history.append((time(10, 0), "Third Address"))
-        assert (time(10, 0), "Third Address") not in pkg.address_history
+    def test_package_timeline_status_at_follows_depart_and_deliver(self):
+        timeline = dh.PackageTimeline(make_pkg(0), 0, minutes(8, 0), minutes(9, 0))
 
-    def test_copy_package_handles_empty_address_history(self):
-        pkg = make_pkg(0)
-        pkg.address_history = []
+        assert timeline.status_at(minutes(7, 59)) == ('at_the_hub', None)
+        assert timeline.status_at(minutes(8, 0)) == ('en_route', None)
+        assert timeline.status_at(minutes(9, 0)) == ('delivered', minutes(9, 0))
 
-        new_pkg = dh.copy_package(pkg, 1)
+    def test_package_timeline_stays_at_the_hub_without_a_departure(self):
+        timeline = dh.PackageTimeline(make_pkg(0), 0, None, None)
 
-        assert new_pkg.address_history == []
-        assert id(new_pkg.address_history) != id(pkg.address_history)
+        assert timeline.status_at(minutes(23, 59)) == ('at_the_hub', None)
 
-    def test_get_address_at_time_returns_first_address_when_time_before_first_timestamp(self):
+    def test_package_timeline_address_at_returns_first_address_before_first_change(self):
         pkg = make_pkg(0)
-        pkg.address_history = [
-            (time(9, 0), "First Address"),
-            (time(10, 0), "Second Address"),
-            (time(11, 0), "Third Address"),
-        ]
-
-        address = dh.get_address_at_time(pkg, time(8, 30))
+        pkg.address_history = [(None, "First Address"), (minutes(10, 0), "Second Address")]
 
-        assert address == "First Address"
+        assert dh.PackageTimeline(pkg, 0, None, None).address_at(minutes(9, 59)) == "First Address"
 
-    def test_get_address_at_time_returns_matching_address_for_exact_timestamp(self):
+    def test_package_timeline_address_at_returns_matching_address_for_exact_time(self):
         pkg = make_pkg(0)
-        pkg.address_history = [
-            (time(9, 0), "First Address"),
-            (time(10, 0), "Second Address"),
-            (time(11, 0), "Third Address"),
-        ]
-
-        address = dh.get_address_at_time(pkg, time(10, 0))
+        pkg.address_history = [(None, "First Address"), (minutes(10, 0), "Second Address"), (minutes(11, 0), "Third Address")]
 
-        assert address == "Second Address"
+        assert dh.PackageTimeline(pkg, 0, None, None).address_at(minutes(10, 0)) == "Second Address"
 
-    def test_get_address_at_time_returns_most_recent_address_before_time_input(self):
+    def test_package_timeline_address_at_returns_most_recent_address(self):
         pkg = make_pkg(0)
-        pkg.address_history = [
-            (time(9, 0), "First Address"),
-            (time(10, 0), "Second Address"),
-            (time(11, 0), "Third Address"),
-        ]
-
-        address = dh.get_address_at_time(pkg, time(10, 30))
+        pkg.address_history = [(None, "First Address"), (minutes(10, 0), "Second Address"), (minutes(11, 0), "Third Address")]
+        timeline = dh.PackageTimeline(pkg, 0, None, None)
 
-        assert address == "Second Address"
+        assert timeline.address_at(minutes(10, 30)) == "Second Address"
+        assert timeline.address_at(minutes(11, 30)) == "Third Address"
 
-    def test_get_address_at_time_returns_last_address_when_time_after_last_timestamp(self):
+    def test_package_timeline_sorts_address_history_by_time(self):
         pkg = make_pkg(0)
-        pkg.address_history = [
-            (time(9, 0), "First Address"),
-            (time(10, 0), "Second Address"),
-            (time(11, 0), "Third Address"),
-        ]
-
-        address = dh.get_address_at_time(pkg, time(11, 30))
+        pkg.address_history = [(None, "First Address"), (minutes(11, 0), "Third Address"), (minutes(10, 0), "Second Address")]
+        timeline = dh.PackageTimeline(pkg, 0, None, None)
 
-        assert address == "Third Address"
+        assert timeline.change_times == [minutes(10, 0), minutes(11, 0)]
+        assert timeline.address_at(minutes(10, 30)) == "Second Address"
 
-    def test_get_address_at_time_uses_first_address_when_first_timestamp_is_none(self):
+    def test_package_timeline_uses_first_address_when_first_time_is_set(self):
         pkg = make_pkg(0)
-        pkg.address_history = [
-            (None, "First Address"),
-            (time(10, 0), "Second Address"),
-            (time(11, 0), "Third Address"),
-        ]
-
-        address = dh.get_address_at_time(pkg, time(9, 30))
+        pkg.address_history = [(minutes(9, 0), "First Address"), (minutes(10, 0), "Second Address")]
 
-        assert address == "First Address"
\ No newline at end of file
+        assert dh.PackageTimeline(pkg, 0, None, None).address_at(minutes(8, 30)) == "First Address"
\ No newline at end of file
@@ -0,0 +1,52 @@
+# tests/test_disjoint_set.py
+import pytest
+from disjoint_set import DisjointSet
+
+def test_new_items_are_their_own_root():
+    ds = DisjointSet()
+    ds.add(1)
+    assert ds.find(1) == 1
+    assert ds.find(2) == 2
+    assert len(ds) == 2
+    assert 2 in ds
+
+def test_union_joins_sets_transitively():
+    ds = DisjointSet()
+    ds.union(1, 2)
+    ds.union(3, 4)
+    assert ds.find(1) == ds.find(2)
+    assert ds.find(1) != ds.find(3)
+
+    ds.union(2, 4)
+    assert len({ds.find(i) for i in (1, 2, 3, 4)}) == 1
+
+def test_union_of_same_set_is_a_no_op():
+    ds = DisjointSet()
+    root = ds.union(1, 2)
+    assert ds.union(2, 1) == root
+    assert ds.rank[root] == 1
+
+def test_union_by_rank_hangs_smaller_tree_under_larger():
+    ds = DisjointSet()
+    big = ds.union(1, 2)
+    small = ds.find(3)
+    assert ds.union(small, big) == big
+
+def test_find_compresses_long_chains():
+    ds = DisjointSet()
+    # Build a chain by hand, deeper than the recursion limit
+    for i in range(1, 5000):
+        ds.add(i)
+        ds.parent[i] = i - 1
+    ds.add(0)
+
+    assert ds.find(4999) == 0
+    assert ds.parent[4999] == 0
+    assert ds.parent[2500] == 0
+
+def test_groups_returns_every_set():
+    ds = DisjointSet()
+    ds.union("a", "b")
+    ds.union("c", "d")
+    ds.add("e")
+    assert sorted(map(sorted, ds.groups().values())) == [["a", "b"], ["c", "d"], ["e"]]
@@ -3,10 +3,12 @@
 import pytest
 import distance_repository as dr
 
+
 @pytest.fixture(autouse=True)
 def reset_repository_state(monkeypatch):
     monkeypatch.setattr(dr, "distance_matrix", None, raising=False)
 
+
 @pytest.fixture
 def distances():
     return [
@@ -17,11 +19,13 @@ def distances():
         [4,3,2,1,0]
     ]
 
+
 @pytest.mark.parametrize("too_small", [[], [0]])
 def test_set_distance_matrix_must_have_at_least_two_addresses(too_small):
     with pytest.raises(ValueError):
         dr.set_distance_matrix(too_small)
 
+
 def test_set_distance_matrix_accepts_floats_and_inf():
     inf = float('inf')
     distances = [
@@ -32,6 +36,7 @@ def test_set_distance_matrix_accepts_floats_and_inf():
     dr.set_distance_matrix(distances)
     assert dr.get_distance_matrix() is distances
 
+
 def test_set_distance_matrix_rejects_assymetric_matrix(distances):
     bad1 = distances + [5,4,3,2,1,0]
     bad2 = [
@@ -44,6 +49,7 @@ def test_set_distance_matrix_rejects_assymetric_matrix(distances):
     with pytest.raises(ValueError):
         dr.set_distance_matrix(bad2)
 
+
 def test_set_distance_matrix_rejects_non_numeric_distances():
     bad = [
         [0,1,2,3,4],
@@ -55,10 +61,12 @@ def test_set_distance_matrix_rejects_non_numeric_distances():
     with pytest.raises(ValueError):
         dr.set_distance_matrix(bad)
 
+
 def test_set_then_get_returns_same_object_identity(distances):
     dr.set_distance_matrix(distances)
     assert dr.get_distance_matrix() is distances
 
+
 def test_set_overwrites_previous_value(distances):
     distances1 = distances
     distances2 = [[0,10],[10,0]]
@@ -68,6 +76,7 @@ def test_set_overwrites_previous_value(distances):
     dr.set_distance_matrix(distances2)
     assert dr.get_distance_matrix() is distances2
 
+
 def test_mutating_original_object_reflects_in_repository(distances):
     dr.set_distance_matrix(distances)
     distances[0][4] = 5
@@ -76,15 +85,18 @@ def test_mutating_original_object_reflects_in_repository(distances):
     assert repo[0][4] == 5
     assert repo[4][0] == 5
 
+
 def test_cannot_set_to_none_explicitly(distances):
     dr.set_distance_matrix(distances)
     with pytest.raises(ValueError):
         dr.set_distance_matrix(None)
 
+
 def test_get_distance_matrix_requires_initialization():
     with pytest.raises(RuntimeError):
         dr.get_distance_matrix()
 
+
 def test_print_distance_matrix(distances, capsys):
     dr.print_distance_matrix(distances)
     out = capsys.readouterr()
@@ -95,6 +107,7 @@ def test_print_distance_matrix(distances, capsys):
     assert any("3.0 |  2.0 |  1.0 |  0.0 |  1.0\n" in line for line in out)
     assert any("4.0 |  3.0 |  2.0 |  1.0 |  0.0\n" in line for line in out)
 
+
 def test_get_distance_returns_correct_distance(distances, monkeypatch):
     monkeypatch.setattr(dr, "address_to_index", lambda x: x)
     dr.set_distance_matrix(distances)
@@ -103,10 +116,52 @@ def test_get_distance_returns_correct_distance(distances, monkeypatch):
         for b in range(3):
             assert dr.get_distance(a, b) == distances[a][b]
 
+
 def test_get_distance_with_string_addresses(distances, monkeypatch):
     mapping = {"HUB": 0, "A": 1, "B": 2}
     monkeypatch.setattr(dr, "address_to_index", lambda x: mapping[x])
     dr.set_distance_matrix(distances)
     
     assert dr.get_distance("HUB", "B") == distances[0][2]
-    assert dr.get_distance("A", "A") == distances[1][1]
\ No newline at end of file
+    assert dr.get_distance("A", "A") == distances[1][1]
+
+
+def test_get_distance_accepts_matrix_indices_without_lookup(distances, monkeypatch):
+    def fail_lookup(_address):
+        raise AssertionError("address_to_index should not be called for indices")
+    monkeypatch.setattr(dr, "address_to_index", fail_lookup)
+    dr.set_distance_matrix(distances)
+
+    assert dr.get_distance(1, 4) == distances[1][4]
+
+
+class TestNdarrayBackend:
+
+    def test_accepts_ndarray_and_keeps_identity(self, distances):
+        np = pytest.importorskip("numpy")
+        matrix = np.array(distances, dtype=np.float32)
+
+        dr.set_distance_matrix(matrix)
+
+        assert dr.get_distance_matrix() is matrix
+        assert dr.get_distance_matrix()[1][3] == 2
+
+    @pytest.mark.parametrize("bad", [
+        [[0, 1, 2]],
+        [[0, 1, 2], [1, 0, 3]],
+        [[0, -1], [-1, 0]],
+        [[1, 1], [1, 0]],
+    ])
+
+    def test_rejects_invalid_ndarray(self, bad):
+        np = pytest.importorskip("numpy")
+        with pytest.raises(ValueError):
+            dr.set_distance_matrix(np.array(bad, dtype=np.float64))
+
+    def test_allows_inf_entries(self):
+        np = pytest.importorskip("numpy")
+        matrix = np.array([[np.inf, 1.0], [1.0, 0.0]])
+
+        dr.set_distance_matrix(matrix)
+
+        assert dr.get_distance_matrix() is matrix
@@ -0,0 +1,108 @@
+# tests/test_event_queue.py
+import random
+import pytest
+from event_queue import EventQueue
+
+def drain(queue):
+    events = []
+    while queue:
+        events.append(queue.pop())
+    return events
+
+def test_pops_in_time_order():
+    queue = EventQueue()
+    for time, event in [(30, "c"), (10, "a"), (20, "b")]:
+        queue.push(time, event)
+
+    assert [event for _, _, event in drain(queue)] == ["a", "b", "c"]
+
+def test_ties_come_out_in_seq_order():
+    queue = EventQueue()
+    queue.push(10, "second", seq=5)
+    queue.push(10, "first", seq=2)
+    queue.push(10, "third")
+
+    assert drain(queue) == [(10, 2, "first"), (10, 5, "second"), (10, 6, "third")]
+
+def test_events_are_never_compared():
+    class Uncomparable:
+        def __lt__(self, other):
+            raise AssertionError("events were compared")
+    queue = EventQueue()
+    queue.push(10, Uncomparable(), seq=1)
+    queue.push(10, Uncomparable(), seq=1)
+
+    assert len(drain(queue)) == 2
+
+def test_reschedule_moves_an_event_and_keeps_its_seq():
+    queue = EventQueue()
+    early = queue.push(10, "early")
+    queue.push(20, "middle")
+
+    queue.reschedule(early, 30)
+
+    assert drain(queue) == [(20, 1, "middle"), (30, 0, "early")]
+
+def test_reschedule_earlier():
+    queue = EventQueue()
+    queue.push(10, "a")
+    late = queue.push(50, "b")
+
+    queue.reschedule(late, 5)
+
+    assert queue.peek_time() == 5
+    assert [event for _, _, event in drain(queue)] == ["b", "a"]
+
+def test_remove_drops_an_event():
+    queue = EventQueue()
+    entry = queue.push(10, "gone")
+    queue.push(20, "kept")
+
+    queue.remove(entry)
+
+    assert len(queue) == 1
+    assert drain(queue) == [(20, 1, "kept")]
+
+def test_stale_entries_cannot_be_removed_or_rescheduled():
+    queue = EventQueue()
+    entry = queue.push(10, "a")
+    moved = queue.reschedule(entry, 20)
+
+    with pytest.raises(ValueError):
+        queue.remove(entry)
+    queue.pop()
+    with pytest.raises(ValueError):
+        queue.reschedule(moved, 30)
+    assert len(queue) == 0
+
+def test_pop_and_peek_on_empty_queue():
+    queue = EventQueue()
+
+    assert queue.peek_time() is None
+    with pytest.raises(IndexError):
+        queue.pop()
+
+def test_events_pushed_while_draining_take_their_place():
+    queue = EventQueue()
+    queue.push(10, "a")
+    queue.push(30, "c")
+
+    assert queue.pop()[2] == "a"
+    queue.push(20, "b")
+
+    assert [event for _, _, event in drain(queue)] == ["b", "c"]
+
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_a_stable_sort_with_random_reschedules(seed):
+    rng = random.Random(seed)
+    queue = EventQueue()
+    times = {}
+    entries = {}
+    for i in range(200):
+        times[i] = rng.randint(0, 50)
+        entries[i] = queue.push(times[i], i, seq=i)
+    for i in rng.sample(range(200), 50):
+        times[i] = rng.randint(0, 50)
+        entries[i] = queue.reschedule(entries[i], times[i])
+
+    assert [event for _, _, event in drain(queue)] == sorted(range(200), key=lambda i: (times[i], i))
@@ -0,0 +1,155 @@
+# tests/test_fleet_sizing.py
+from conftest import line_matrix, make_stop_pkg
+from datetime import time
+import fleet_sizing as fs
+import pytest
+import truck
+
+# Index 0 is the hub. Travel minutes are the matrix entries themselves.
+@pytest.fixture
+def world(monkeypatch):
+    def _set(minutes_matrix):
+        monkeypatch.setattr(fs, "get_travel_minutes_matrix", lambda speed: minutes_matrix)
+        return minutes_matrix
+    return _set
+
+def make_sizer(packages, capacity=truck.Truck.MAX):
+    return fs.FleetSizer(packages, truck=truck.Truck(maximum_capacity=capacity, departure_address=0))
+
+# attempt that works for any fleet with at least trucks and drivers, and records what it was asked
+def feasible_from(trucks, drivers, calls):
+    def attempt(num_trucks, num_drivers):
+        calls.append((num_trucks, num_drivers))
+        if num_trucks < trucks or num_drivers < drivers:
+            raise SystemExit(1)
+        return (num_trucks, num_drivers)
+    return attempt
+
+def ladder_answer(trucks, drivers):
+    rung = 0
+    while True:
+        fleet = fs.rung_fleet(rung)
+        if fleet[0] >= trucks and fleet[1] >= drivers:
+            return fleet
+        rung += 1
+
+
+class TestLowerBounds:
+    def test_capacity_sets_the_truck_bound(self, world):
+        world(line_matrix([0, 1]))
+        sizer = make_sizer([make_stop_pkg(i, 1) for i in range(1, 34)])
+
+        assert (sizer.min_trucks, sizer.min_drivers) == (3, 1)
+        assert sizer.max_trucks == 33
+
+    def test_truck_note_sets_the_truck_bound(self, world):
+        world(line_matrix([0, 1]))
+        sizer = make_sizer([make_stop_pkg(1, 1, note=['T', 4]), make_stop_pkg(2, 1)])
+
+        assert sizer.min_trucks == 4
+
+    def test_deadlines_the_second_wave_cannot_make_need_drivers(self, world):
+        # The shortest round trip is 2 minutes, so a truck without a driver can't reach index 2 (10 minutes out) before 8:12
+        world(line_matrix([0, 1, 10]))
+        urgent = [make_stop_pkg(i, 2, deadline=time(8, 11)) for i in range(1, 4)]
+        relaxed = [make_stop_pkg(i, 2, deadline=time(8, 12)) for i in range(4, 7)]
+        sizer = make_sizer(urgent + relaxed + [make_stop_pkg(7, 1)], capacity=2)
+
+        assert sizer.deadline_critical_packages() == urgent
+        assert (sizer.min_trucks, sizer.min_drivers) == (4, 2)
+
+    def test_shortest_minutes_may_go_through_another_stop(self, world):
+        # Per-leg rounding can make a detour quicker than the direct leg
+        world([[0, 2, 5], [2, 0, 2], [5, 2, 0]])
+        sizer = make_sizer([make_stop_pkg(1, 1), make_stop_pkg(2, 2)])
+
+        assert sizer.shortest_minutes_from_hub() == {0: 0, 1: 2, 2: 4}
+
+    def test_rerouted_packages_are_left_out(self, world):
+        world(line_matrix([0, 1, 100]))
+        rerouted = make_stop_pkg(1, 2, deadline=time(8, 5), note="X, 10:20 AM")
+
+        assert make_sizer([rerouted, make_stop_pkg(2, 1)]).deadline_critical_packages() == []
+
+    def test_unreachable_deadline_raises_systemexit(self, world):
+        world(line_matrix([0, 30]))
+
+        with pytest.raises(SystemExit, match="Package 1"):
+            make_sizer([make_stop_pkg(1, 1, deadline=time(8, 20))])
+
+    def test_delay_counts_towards_reachability(self, world):
+        world(line_matrix([0, 10]))
+
+        with pytest.raises(SystemExit):
+            make_sizer([make_stop_pkg(1, 1, deadline=time(9, 5), note=['D', time(9, 0)])])
+
+
+class TestSearch:
+    @pytest.mark.parametrize("trucks, drivers", [(3, 2), (4, 3), (5, 2), (6, 6), (9, 4)])
+    def test_finds_the_same_fleet_as_the_old_retry_ladder(self, world, trucks, drivers):
+        world(line_matrix([0, 1]))
+        calls = []
+        sizer = make_sizer([make_stop_pkg(i, 1) for i in range(1, 41)])
+
+        found = sizer.search(feasible_from(trucks, drivers, calls))
+
+        expected = ladder_answer(trucks, drivers)
+        assert found == expected + (expected,)
+        assert calls[-1] == expected
+
+    def test_starts_at_the_lower_bound(self, world):
+        world(line_matrix([0, 1]))
+        calls = []
+        sizer = make_sizer([make_stop_pkg(i, 1) for i in range(1, 41)])
+
+        sizer.search(feasible_from(1, 1, calls))
+
+        assert calls == [(3, 2)]
+
+    def test_takes_fewer_attempts_than_walking_the_ladder(self, world):
+        world(line_matrix([0, 1]))
+        calls = []
+        sizer = make_sizer([make_stop_pkg(i, 1) for i in range(1, 41)])
+
+        sizer.search(feasible_from(12, 11, calls))
+
+        # The old loop would have tried every rung from (1, 1) up to (12, 11), 22 fleets
+        assert len(calls) <= 10
+        assert sizer.attempts[-1] == (12, 11, True)
+
+    def test_loads_the_winner_again_when_the_last_attempt_failed(self, world):
+        world(line_matrix([0, 1]))
+        calls = []
+        sizer = make_sizer([make_stop_pkg(i, 1) for i in range(1, 41)])
+
+        # Rungs tried: (3, 2) no, (3, 3) no, (4, 4) yes, (4, 3) no, so (4, 4) is loaded again
+        trucks, drivers, result = sizer.search(feasible_from(4, 4, calls))
+
+        assert (trucks, drivers, result) == (4, 4, (4, 4))
+        assert calls == [(3, 2), (3, 3), (4, 4), (4, 3), (4, 4)]
+
+    def test_gives_up_when_every_package_has_its_own_truck(self, world):
+        world(line_matrix([0, 1]))
+        calls = []
+        sizer = make_sizer([make_stop_pkg(i, 1) for i in range(1, 4)])
+
+        with pytest.raises(SystemExit, match="up to 3 trucks"):
+            sizer.search(feasible_from(10, 10, calls))
+        assert calls[-1] == (3, 3)
+
+    def test_other_errors_are_not_swallowed(self, world):
+        world(line_matrix([0, 1]))
+        def attempt(num_trucks, num_drivers):
+            raise ValueError("Impossible W-group")
+
+        with pytest.raises(ValueError):
+            make_sizer([make_stop_pkg(1, 1)]).search(attempt)
+
+def test_rung_fleet_follows_the_old_retry_ladder():
+    assert [fs.rung_fleet(rung) for rung in range(6)] == [(1, 1), (2, 1), (2, 2), (3, 2), (3, 3), (4, 3)]
+
+@pytest.mark.parametrize("trucks, drivers", [(1, 1), (2, 1), (3, 1), (3, 2), (2, 3), (5, 5), (7, 2)])
+def test_first_rung_is_the_lowest_rung_meeting_both_bounds(trucks, drivers):
+    rung = fs.first_rung(trucks, drivers)
+
+    assert fs.rung_fleet(rung) == ladder_answer(trucks, drivers)
@@ -1,6 +1,8 @@
 # tests/test_hash_table.py
+import copy
 import hash_table
 import package
+import pickle
 import pytest
 
 @pytest.fixture
@@ -48,23 +50,22 @@ def test_hash_with_non_integer_key_raises():
     (4, 'obj4'),
     (5, 'obj5'),
 ])
-def test_insert_adds_package_to_correct_bucket(key, obj):
+def test_insert_places_entry_at_home_slot_when_free(key, obj):
     table = hash_table.HashTable(size=5)
     table.insert(key, obj)
     expected_index = table.hash(key)
-    assert obj in table.table[expected_index]
+    assert table.table[expected_index] == (key, obj)
 
 def test_insert_duplicate_key_does_not_duplicate_object(sample_table):
     table, packages = sample_table
     obj = packages[0]
-    idx = table.hash(obj.package_id)
 
-    before_len = len(table.table[idx])
+    before_len = len(table)
     table.insert(obj.package_id, obj)
-    after_len  = len(table.table[idx])
+    after_len = len(table)
 
     assert after_len == before_len
-    assert table.table[idx].count(obj) == 1
+    assert list(table).count(obj) == 1
 
 @pytest.mark.parametrize("index", [0, 1, 2])
 def test_search_returns_correct_package(index, sample_table):
@@ -97,16 +98,16 @@ def test_remove_nonexistent_object_returns_false(sample_table, key):
     ghost = package.Package(key, "Z Rd", "Nowhere", "ST", "00000", "EOD", 1, "None")
     assert table.remove(key, ghost) is False
     
-def test_print_hash_table_outputs_only_nonempty_buckets(sample_table, capsys):
+def test_print_hash_table_outputs_only_occupied_slots(sample_table, capsys):
     table, _ = sample_table
     table.print_hash_table()
     out = capsys.readouterr().out
     
-    assert "  Bucket 1:" in out
-    assert "  Bucket 2:" in out
-    assert "  Bucket 3:" in out
-    assert "  Bucket 4:" not in out    
-    assert "  Bucket 4:" not in out     
+    assert "  Slot 1:" in out
+    assert "  Slot 2:" in out
+    assert "  Slot 3:" in out
+    assert "  Slot 0:" not in out
+    assert "  Slot 4:" not in out
 
 def test_collision_handling_all_items_retrievable(sample_table):
     _, packages = sample_table
@@ -121,8 +122,8 @@ def test_collision_handling_all_items_retrievable(sample_table):
 
 def test_empty_table_iteration_yields_nothing():
     empty_table = hash_table.HashTable(5)
-    for empty_bucket in empty_table:
-        assert len(empty_bucket) == 0
+    assert list(empty_table) == []
+    assert len(empty_table) == 0
 
 def test_overwrite_behavior_replaces_existing_entry(sample_table):
     table, package_list= sample_table
@@ -136,4 +137,186 @@ def test_overwrite_behavior_replaces_existing_entry(sample_table):
     
     assert table.search(1).address != "Z Rd"
     assert table.search(2).address != "Z Rd"
-    assert table.search(3).address != "Z Rd"
\ No newline at end of file
+    assert table.search(3).address != "Z Rd"
+
+def make_packages(n):
+    return [package.Package(i, f"{i} Main St", "Salt Lake City", "ST", "84101", "EOD", 1, "None") for i in range(1, n + 1)]
+
+def test_len_and_contains_track_inserts_and_removes(sample_table):
+    table, packages = sample_table
+    assert len(table) == 3
+    assert 1 in table and 4 not in table
+    assert "1" not in table
+
+    table.remove(1, packages[0])
+
+    assert len(table) == 2
+    assert 1 not in table
+
+def test_iteration_yields_packages_and_items_yields_key_package_pairs(sample_table):
+    table, packages = sample_table
+    assert sorted(table) == packages
+    assert sorted(table.items(), key=lambda item: item[0]) == [(pkg.package_id, pkg) for pkg in packages]
+
+def test_nested_iteration_over_same_table(sample_table):
+    table, packages = sample_table
+    pairs = [(a.package_id, b.package_id) for a in table for b in table]
+    assert len(pairs) == len(packages) ** 2
+
+def test_table_grows_past_initial_size_and_keeps_every_entry():
+    table = hash_table.HashTable(4)
+    packages = make_packages(100)
+    for pkg in packages:
+        table.insert(pkg.package_id, pkg)
+
+    assert len(table) == 100
+    assert table.size > 100
+    assert table.used <= table.size * table.MAX_LOAD_FACTOR
+    assert all(table.search(pkg.package_id) is pkg for pkg in packages)
+
+def test_search_probes_past_removed_entries():
+    table = hash_table.HashTable(10)
+    packages = make_packages(3)
+    colliding = package.Package(11, "11 Main St", "Salt Lake City", "ST", "84101", "EOD", 1, "None")
+    table.insert(1, packages[0])
+    table.insert(11, colliding)  # probes past slot 1
+
+    table.remove(1, packages[0])
+
+    assert table.search(11) is colliding
+    assert table.lookup_function(11)[0] == "11 Main St"
+
+def test_insert_reuses_tombstone_slot():
+    table = hash_table.HashTable(10)
+    packages = make_packages(1)
+    table.insert(1, packages[0])
+    table.remove(1, packages[0])
+    used = table.used
+
+    table.insert(1, packages[0])
+
+    assert table.used == used
+    assert table.search(1) is packages[0]
+
+def test_remove_requires_matching_object(sample_table):
+    table, packages = sample_table
+    assert table.remove(1, packages[1]) is False
+    assert table.search(1) is packages[0]
+
+def test_deepcopy_keeps_tombstones_recognisable():
+    table = hash_table.HashTable(10)
+    packages = make_packages(2)
+    table.insert(1, packages[0])
+    table.insert(11, packages[1])
+    table.remove(1, packages[0])
+
+    clone = copy.deepcopy(table)
+
+    assert clone.table[1] is hash_table.DELETED
+    assert clone.search(11).address == packages[1].address
+    assert len(clone) == 1
+
+def test_pickle_keeps_tombstones_recognisable():
+    table = hash_table.HashTable(10)
+    packages = make_packages(2)
+    table.insert(1, packages[0])
+    table.insert(11, packages[1])
+    table.remove(1, packages[0])
+
+    clone = pickle.loads(pickle.dumps(table))
+
+    assert clone.table[1] is hash_table.DELETED
+    assert clone.search(11).address == packages[1].address
+
+def test_views_yield_packages_ids_and_status_matches(sample_table):
+    table, packages = sample_table
+    packages[1].delivery_status = "delivered"
+
+    assert sorted(table.packages()) == packages
+    assert sorted(table.ids()) == [1, 2, 3]
+    assert list(table.by_status("delivered")) == [packages[1]]
+    assert sorted(table.by_status("at_the_hub")) == [packages[0], packages[2]]
+
+class TestSecondaryIndexes:
+    def test_insert_indexes_every_field(self, sample_table):
+        table, packages = sample_table
+        packages[0].special_note = packages[0].parse_special_note()
+
+        assert table.find_by('delivery_status', 'at_the_hub') == packages
+        assert table.find_by('delivery_deadline', package.Package.EOD_TIME) == packages[1:]
+        assert table.find_by('truck', None) == packages
+        assert table.find_by('group', None) == packages
+        assert sorted(table.index_values('special_note')) == ['None']
+
+    def test_special_note_is_indexed_by_tag_before_and_after_parsing(self):
+        table = hash_table.HashTable(5)
+        pkg = package.Package(1, "123 Main St", "Salt Lake City", "ST", "84101", "EOD", 5, "D, 9:05 AM")
+        table.insert(1, pkg)
+        assert table.find_by('special_note', 'D') == [pkg]
+
+        pkg.parse_special_note()
+        pkg.special_note = ['W', 2]
+
+        assert table.find_by('special_note', 'D') == []
+        assert table.find_by('special_note', 'W') == [pkg]
+        assert table.index_values('special_note') == ['W']
+
+    def test_reassigning_fields_moves_package_between_buckets(self, sample_table):
+        table, packages = sample_table
+
+        packages[0].truck = 1
+        packages[0].group = 4
+        packages[1].delivery_status = 'delivered'
+
+        assert table.find_by('truck', 1) == [packages[0]]
+        assert table.find_by('truck', None) == packages[1:]
+        assert table.find_by('group', 4) == [packages[0]]
+        assert list(table.by_status('delivered')) == [packages[1]]
+        assert 'delivered' in table.index_values('delivery_status')
+
+    def test_find_by_returns_snapshot_safe_to_mutate_through(self, sample_table):
+        table, packages = sample_table
+
+        for pkg in table.find_by('delivery_status', 'at_the_hub'):
+            pkg.delivery_status = 'en_route'
+
+        assert table.find_by('delivery_status', 'at_the_hub') == []
+        assert len(table.find_by('delivery_status', 'en_route')) == 3
+
+    def test_remove_drops_package_from_indexes_and_stops_tracking(self, sample_table):
+        table, packages = sample_table
+        table.remove(1, packages[0])
+
+        packages[0].truck = 2
+
+        assert table.find_by('truck', 2) == []
+        assert packages[0] not in table.find_by('delivery_status', 'at_the_hub')
+        assert packages[0].watchers == []
+
+    def test_indexes_survive_resize(self):
+        table = hash_table.HashTable(2)
+        packages = make_packages(20)
+        for pkg in packages:
+            table.insert(pkg.package_id, pkg)
+
+        packages[7].truck = 0
+
+        assert table.find_by('truck', 0) == [packages[7]]
+        assert len(table.find_by('delivery_status', 'at_the_hub')) == 20
+        assert all(pkg.watchers == [table] for pkg in packages)
+
+    def test_deepcopy_indexes_follow_copied_packages(self, sample_table):
+        table, packages = sample_table
+        clone = copy.deepcopy(table)
+
+        clone.search(1).truck = 1
+
+        assert [pkg.package_id for pkg in clone.find_by('truck', 1)] == [1]
+        assert table.find_by('truck', 1) == []
+        assert packages[0].truck is None
+
+    def test_non_package_values_are_not_indexed(self):
+        table = hash_table.HashTable(5)
+        table.insert(1, 'obj1')
+        assert table.find_by('delivery_status', 'at_the_hub') == []
+        assert table.remove(1, 'obj1') is True
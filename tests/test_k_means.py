@@ -1,4 +1,5 @@
 # /tests/test_k_means.py
+from conftest import line_matrix
 import k_means as km
 import package
 import pytest
@@ -36,8 +37,8 @@ def fake_world(monkeypatch):
     def fake_get_distance_matrix():
         return distance_matrix
 
-    def fake_address_to_index(address, addr_list):
-        for row in addr_list:
+    def fake_address_to_index(address):
+        for row in address_list:
             if row[2] == address:
                 return int(row[0])
         raise KeyError(f"Unknown address: {address}")
@@ -119,8 +120,8 @@ class TestFindNewCentroid:
         def fake_get_distance_matrix():
             return distance_matrix
 
-        def fake_address_to_index(address, addr_list):
-            for row in addr_list:
+        def fake_address_to_index(address):
+            for row in address_list:
                 if row[2] == address:
                     return int(row[0])
             raise KeyError(address)
@@ -148,7 +149,7 @@ class TestKMeansClustering:
         ]
 
         # Deterministic initial centroids: pick Address0 and Address3
-        monkeypatch.setattr(km, "select_unique_package_address", lambda _pkgs, k: [pkgs[0], pkgs[3]])
+        monkeypatch.setattr(km, "select_unique_package_address", lambda _pkgs, k, rng=None: [pkgs[0], pkgs[3]])
 
         clusters = km.k_means_clustering(pkgs, 2)
 
@@ -170,7 +171,7 @@ class TestKMeansClustering:
         ]
 
         # Centroids force 4 items near Address0, 1 item near Address4
-        monkeypatch.setattr(km, "select_unique_package_address", lambda _pkgs, k: [pkgs[0], pkgs[4]])
+        monkeypatch.setattr(km, "select_unique_package_address", lambda _pkgs, k, rng=None: [pkgs[0], pkgs[4]])
 
         clusters = km.k_means_clustering(pkgs, 2)
 
@@ -185,31 +186,23 @@ class TestKMeansClustering:
             make_pkg(3, "Address3"),
         ]
 
-        calls = {"select": 0, "centroid": 0}
+        calls = {"select": 0}
 
-        def fake_select_unique(_pkgs, k):
+        def fake_select_unique(_pkgs, k, rng=None):
             calls["select"] += 1
             return [pkgs[0], pkgs[3]]
 
-        def wrapped_find_new_centroid(cluster):
-            calls["centroid"] += 1
-            return km.find_new_centroid.__wrapped__(cluster)  # will fail if not set below
-
-        # Preserve original function so we can count calls without changing behavior
-        original_find_new_centroid = km.find_new_centroid
-
-        def counting_find_new_centroid(cluster):
-            calls["centroid"] += 1
-            return original_find_new_centroid(cluster)
-
         monkeypatch.setattr(km, "select_unique_package_address", fake_select_unique)
-        monkeypatch.setattr(km, "find_new_centroid", counting_find_new_centroid)
 
         clusters = km.k_means_clustering(pkgs, 2)
 
         assert calls["select"] == 1
-        assert calls["centroid"] >= 2
         assert len(clusters) == 2
+        # Converged: every cluster's medoid is what find_new_centroid picks for it
+        engine = km.MedoidClustering(pkgs)
+        medoids = engine.fit([pkgs[0], pkgs[3]])
+        for c, cluster in enumerate(engine.clusters()):
+            assert km.get_package_index(km.find_new_centroid(cluster)) == engine.point_indices[medoids[c]]
 
 
 class TestSplitPackageList:
@@ -225,7 +218,7 @@ class TestSplitPackageList:
 
         group0 = [p0, p1, p2]  # fits capacity 3
         group1 = [p3]          # returned
-        monkeypatch.setattr(km, "k_means_clustering", lambda pkgs, k: [group0, group1])
+        monkeypatch.setattr(km, "k_means_clustering", lambda pkgs, k, rng=None: [group0, group1])
 
         result = km.split_package_list(truck, package_groups, package_list)
 
@@ -244,7 +237,7 @@ class TestSplitPackageList:
 
         group0 = [p0, p1, p2]  # does not fit
         group1 = [p3, p2]      # fits
-        monkeypatch.setattr(km, "k_means_clustering", lambda pkgs, k: [group0, group1])
+        monkeypatch.setattr(km, "k_means_clustering", lambda pkgs, k, rng=None: [group0, group1])
 
         result = km.split_package_list(truck, package_groups, package_list)
 
@@ -269,7 +262,7 @@ class TestSplitPackageList:
         ]
         calls = {"count": 0}
 
-        def fake_k_means(pkgs, k):
+        def fake_k_means(pkgs, k, rng=None):
             calls["count"] += 1
             g0, g1 = groups.pop(0)
             return [g0, g1]
@@ -280,4 +273,113 @@ class TestSplitPackageList:
 
         assert calls["count"] == 2
         assert result == [p0]
-        assert package_groups[0] == [p2, p3, p1]
\ No newline at end of file
+        assert package_groups[0] == [p2, p3, p1]
+
+    def test_split_package_list_draws_centroids_from_planner_rng(self, monkeypatch):
+        truck = DummyTruck(current_capacity=1)
+        p0 = make_pkg(0, "Address0")
+        p1 = make_pkg(1, "Address1")
+        planner_rng = random.Random(7)
+        seen = []
+
+        def fake_k_means(pkgs, k, rng=None):
+            seen.append(rng)
+            return [[p0], [p1]]
+
+        monkeypatch.setattr(km, "get_planner_rng", lambda: planner_rng)
+        monkeypatch.setattr(km, "k_means_clustering", fake_k_means)
+
+        km.split_package_list(truck, [], [p0, p1])
+
+        assert seen == [planner_rng]
+
+@pytest.fixture(params=["numpy", "lists"])
+def backend(request, monkeypatch):
+    if request.param == "lists":
+        monkeypatch.setattr(km, "np", None)
+    return request.param
+
+def make_line_world(monkeypatch, positions):
+    distance_matrix = line_matrix(positions)
+    monkeypatch.setattr(km, "get_distance_matrix", lambda: distance_matrix)
+    monkeypatch.setattr(km, "print_group_list", lambda *_: None)
+    return distance_matrix
+
+def make_indexed_pkg(id_, index):
+    pkg = make_pkg(id_, f"Address{index}")
+    pkg.address_index = index
+    return pkg
+
+
+class TestMedoidClustering:
+    def test_packages_at_one_address_become_one_weighted_point(self, monkeypatch, backend):
+        make_line_world(monkeypatch, [0, 1, 2])
+        pkgs = [make_indexed_pkg(0, 2), make_indexed_pkg(1, 0), make_indexed_pkg(2, 2)]
+
+        engine = km.MedoidClustering(pkgs)
+
+        assert engine.point_indices == [2, 0]
+        assert list(engine.weights) == [2, 1]
+        assert engine.package_points == [0, 1, 0]
+
+    def test_cached_sums_match_recomputed_sums_after_fit(self, monkeypatch, backend):
+        positions = [0, 1, 2, 3, 10, 11, 12, 30]
+        make_line_world(monkeypatch, positions)
+        pkgs = [make_indexed_pkg(i, i) for i in range(len(positions))] + [make_indexed_pkg(99, 4)]
+
+        engine = km.MedoidClustering(pkgs)
+        engine.fit([pkgs[0], pkgs[1]])
+
+        for c in range(2):
+            for q in range(len(engine.point_indices)):
+                expected = sum(engine.weights[p] * engine.distances[p][q] for p, label in enumerate(engine.labels) if label == c)
+                assert engine.sums[c][q] == pytest.approx(expected)
+
+    def test_swap_phase_leaves_no_improving_swap(self, monkeypatch, backend):
+        positions = [0, 1, 2, 20, 21, 22, 40, 41, 42]
+        make_line_world(monkeypatch, positions)
+        pkgs = [make_indexed_pkg(i, i) for i in range(len(positions))]
+
+        engine = km.MedoidClustering(pkgs)
+        medoids = engine.fit([pkgs[0], pkgs[1], pkgs[2]])
+        best = engine.total_distance()
+
+        for slot in range(3):
+            for candidate in range(len(positions)):
+                if candidate in medoids:
+                    continue
+                trial = km.MedoidClustering(pkgs)
+                trial.medoids = list(medoids)
+                trial.medoids[slot] = candidate
+                trial.labels = trial.nearest_labels()
+                assert trial.total_distance() >= best - 1e-9
+
+        assert sorted(positions[engine.point_indices[m]] for m in medoids) == [1, 21, 41]
+
+    def test_backends_agree(self, monkeypatch):
+        rng = random.Random(7)
+        positions = [rng.randint(0, 100) for _ in range(40)]
+        make_line_world(monkeypatch, positions)
+        pkgs = [make_indexed_pkg(i, i) for i in range(len(positions))]
+
+        vectorized = km.k_means_clustering(pkgs, 3, random.Random(1))
+        monkeypatch.setattr(km, "np", None)
+        lists = km.k_means_clustering(pkgs, 3, random.Random(1))
+
+        assert vectorized == lists
+
+    def test_seeded_rng_gives_repeatable_clusters(self, monkeypatch):
+        rng = random.Random(3)
+        positions = [rng.randint(0, 100) for _ in range(30)]
+        make_line_world(monkeypatch, positions)
+        pkgs = [make_indexed_pkg(i, i) for i in range(len(positions))]
+
+        first = km.k_means_clustering(pkgs, 2, random.Random(42))
+        second = km.k_means_clustering(pkgs, 2, random.Random(42))
+
+        assert first == second
+
+    def test_select_unique_package_address_raises_without_enough_addresses(self):
+        pkgs = [make_pkg(0, "Address0"), make_pkg(1, "Address0")]
+        with pytest.raises(ValueError):
+            km.select_unique_package_address(pkgs, 2)
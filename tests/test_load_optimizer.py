@@ -0,0 +1,167 @@
+# tests/test_load_optimizer.py
+from conftest import line_matrix, make_stop_pkg
+from datetime import time
+import random
+import distance_repository
+import fleet
+import load_optimizer as lo
+import pytest
+import truck
+from tools.reporter import Reporter
+
+# At 60 mph a mile takes a minute, so the clock is easy to follow. Index 0 is the hub.
+SPEED = 60
+
+@pytest.fixture
+def world(monkeypatch):
+    monkeypatch.setattr(distance_repository, "travel_minutes_matrices", {})
+    def _set(distance_matrix):
+        monkeypatch.setattr(distance_repository, "distance_matrix", distance_matrix)
+        distance_repository.travel_minutes_matrices.clear()
+        return distance_matrix
+    return _set
+
+def make_fleet(*routes, drivers=None):
+    trucks = []
+    for i, route in enumerate(routes):
+        t = truck.Truck(i, speed_mph=SPEED, departure_address=0, package_list=list(route))
+        t.current_capacity = t.maximum_capacity - len(route)
+        t.driver = f"Driver{i + 1}" if drivers is None or i < drivers else None
+        for pkg in route:
+            pkg.truck = i
+        trucks.append(t)
+    return fleet.Fleet(len(trucks), trucks)
+
+def truck_of(the_fleet, pkg):
+    return next(t.truck_id for t in the_fleet.truck_list if any(p is pkg for p in t.package_list))
+
+
+class TestLoadPlanOptimizer:
+    def test_relocates_a_stop_to_the_truck_already_going_that_way(self, world):
+        world(line_matrix([0, 1, 10, 11]))
+        near, far, farther = make_stop_pkg(1, 1), make_stop_pkg(2, 2), make_stop_pkg(3, 3)
+        the_fleet = make_fleet([near, far], [farther])
+
+        late, miles = lo.LoadPlanOptimizer(the_fleet, 5).optimize()
+
+        assert (late, miles) == (0, 24)
+        assert truck_of(the_fleet, far) == 1
+        assert far.truck == 1
+        assert [t.current_capacity for t in the_fleet] == [15, 14]
+
+    def test_moves_a_group_as_one(self, world):
+        world(line_matrix([0, 1, 10, 11]))
+        grouped = [make_stop_pkg(1, 1, group=7), make_stop_pkg(2, 2, group=7)]
+        the_fleet = make_fleet(grouped + [make_stop_pkg(3, 1)], [make_stop_pkg(4, 3)])
+
+        lo.LoadPlanOptimizer(the_fleet, 5).optimize()
+
+        assert truck_of(the_fleet, grouped[0]) == truck_of(the_fleet, grouped[1])
+
+    def test_pinned_packages_stay_on_their_truck(self, world):
+        world(line_matrix([0, 1, 10, 11]))
+        pinned = make_stop_pkg(2, 2, note=['T', 1])
+        the_fleet = make_fleet([make_stop_pkg(1, 1), pinned], [make_stop_pkg(3, 3)])
+
+        lo.LoadPlanOptimizer(the_fleet, 5).optimize()
+
+        assert truck_of(the_fleet, pinned) == 0
+        assert pinned.truck == 0
+
+    def test_respects_capacity(self, world):
+        world(line_matrix([0, 1, 10, 11]))
+        far = make_stop_pkg(2, 2)
+        the_fleet = make_fleet([make_stop_pkg(1, 1), far], [make_stop_pkg(3, 3)])
+        the_fleet.truck_list[1].maximum_capacity = 1
+        the_fleet.truck_list[1].current_capacity = 0
+
+        lo.LoadPlanOptimizer(the_fleet, 5).optimize()
+
+        assert len(the_fleet.truck_list[1].package_list) == 1
+
+    def test_waiting_truck_leaves_when_the_first_driver_returns(self, world):
+        world(line_matrix([0, 5, 20]))
+        the_fleet = make_fleet([make_stop_pkg(1, 1)], [make_stop_pkg(2, 2)], drivers=1)
+        optimizer = lo.LoadPlanOptimizer(the_fleet, 0)
+
+        assert optimizer.departures(optimizer.routes) == [8 * 60, 8 * 60 + 10]
+
+    def test_does_not_move_a_deadline_onto_a_waiting_truck_that_leaves_too_late(self, world):
+        # Truck 2 is closer, but has no driver and only leaves once truck 1 is back at 8:12
+        world(line_matrix([0, 6, 7, 8]))
+        urgent = make_stop_pkg(2, 2, deadline=time(8, 10))
+        the_fleet = make_fleet([make_stop_pkg(1, 1), urgent], [make_stop_pkg(3, 3)], drivers=1)
+
+        late, _ = lo.LoadPlanOptimizer(the_fleet, 5).optimize()
+
+        assert late == 0
+        assert truck_of(the_fleet, urgent) == 0
+
+    def test_driver_trucks_are_never_emptied(self, world):
+        world(line_matrix([0, 10, 11]))
+        the_fleet = make_fleet([make_stop_pkg(1, 1)], [make_stop_pkg(2, 2)])
+
+        lo.LoadPlanOptimizer(the_fleet, 5).optimize()
+
+        assert all(t.package_list for t in the_fleet)
+
+    def test_zero_budget_keeps_the_greedy_plan(self, world):
+        world(line_matrix([0, 1, 10, 11]))
+        route_a, route_b = [make_stop_pkg(1, 1), make_stop_pkg(2, 2)], [make_stop_pkg(3, 3)]
+        the_fleet = make_fleet(route_a, route_b)
+
+        assert lo.LoadPlanOptimizer(the_fleet, 0).optimize() == (0, 42)
+        assert the_fleet.truck_list[0].package_list == route_a
+        assert the_fleet.truck_list[1].package_list == route_b
+
+    def test_reports_progress(self, world, capsys):
+        world(line_matrix([0, 1, 10, 11]))
+        the_fleet = make_fleet([make_stop_pkg(1, 1), make_stop_pkg(2, 2)], [make_stop_pkg(3, 3)])
+
+        lo.LoadPlanOptimizer(the_fleet, 5, Reporter(2)).optimize()
+
+        out = capsys.readouterr().out
+        assert "Load plan: relocate 2 from Truck 1 to Truck 2: 42.0 -> 24.0 miles" in out
+        assert "Load plan optimizer: 42.0 -> 24.0 miles after 1 moves" in out
+
+    def test_stays_quiet_without_reporter_output(self, world, capsys):
+        world(line_matrix([0, 1, 10, 11]))
+        the_fleet = make_fleet([make_stop_pkg(1, 1), make_stop_pkg(2, 2)], [make_stop_pkg(3, 3)])
+
+        lo.LoadPlanOptimizer(the_fleet, 5, Reporter(0)).optimize()
+
+        assert capsys.readouterr().out == ""
+
+    @pytest.mark.parametrize("seed", range(6))
+    def test_never_worse_than_the_greedy_plan_and_repeatable(self, world, seed):
+        rng = random.Random(seed)
+        positions = [0] + [rng.randint(-40, 40) for _ in range(18)]
+        world(line_matrix(positions))
+
+        def build():
+            pkgs = [make_stop_pkg(i, i, deadline=time(8, rng.randint(30, 59)) if rng.random() < 0.3 else None) for i in range(1, 19)]
+            return make_fleet(pkgs[:6], pkgs[6:12], pkgs[12:], drivers=2)
+
+        rng.seed(seed)
+        first = build()
+        initial = lo.LoadPlanOptimizer(first, 0).cost
+        result = lo.LoadPlanOptimizer(first, 5).optimize()
+        rng.seed(seed)
+        second = build()
+        lo.LoadPlanOptimizer(second, 5).optimize()
+
+        assert not lo.better(initial, result)
+        assert sorted(p.package_id for t in first for p in t.package_list) == list(range(1, 19))
+        assert [[p.package_id for p in t.package_list] for t in first] == [[p.package_id for p in t.package_list] for t in second]
+
+def test_better_orders_by_lateness_then_miles():
+    assert lo.better((0, 50.0), (1, 10.0))
+    assert lo.better((0, 9.0), (0, 10.0))
+    assert not lo.better((0, 10.0), (0, 10.0))
+    assert not lo.better((1, 1.0), (0, 10.0))
+
+def test_is_pinned_for_truck_and_wrong_address_notes():
+    assert lo.is_pinned(make_stop_pkg(1, 1, note=['T', 2]))
+    assert lo.is_pinned(make_stop_pkg(1, 1, note="X, 10:20 AM"))
+    assert not lo.is_pinned(make_stop_pkg(1, 1, note=['W', 3]))
+    assert not lo.is_pinned(make_stop_pkg(1, 1))
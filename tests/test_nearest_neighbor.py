@@ -3,6 +3,7 @@ import pytest
 import nearest_neighbor as nn
 import package
 
+
 @pytest.fixture
 def pkg_list():
     pkgs = []
@@ -10,6 +11,7 @@ def pkg_list():
         pkgs.append(package.Package(i, f"Address{i}", "City", "ST", 99999, None, 1.0, None, "at_the_hub", None, None, 0, 0))
     return pkgs
 
+
 @pytest.fixture
 def fake_world():
     address_list = [
@@ -37,6 +39,7 @@ def fake_world():
         "address_to_index": address_to_index,
     }
 
+
 @pytest.fixture
 def patch_nn(monkeypatch, fake_world, pkg_list):
     monkeypatch.setattr(nn, "get_address_list", lambda: fake_world["address_list"])
@@ -54,6 +57,7 @@ def patch_nn(monkeypatch, fake_world, pkg_list):
     monkeypatch.setattr(nn, "convert_route_to_package_list", convert_route_to_package_list)
     return True
 
+
 def test_build_vertices_list_excludes_start_point_packages(pkg_list, monkeypatch, fake_world):
     start_point = "Address0"
     monkeypatch.setattr(nn, "address_to_index", fake_world["address_to_index"])
@@ -64,12 +68,14 @@ def test_build_vertices_list_excludes_start_point_packages(pkg_list, monkeypatch
     package_ids = [pkg_id for (pkg_id, _idx) in v_list]
     assert 0 not in package_ids
 
+
 def test_nearest_neighbor_returns_sum_and_route_in_expected_order_simple_case(pkg_list, patch_nn):
     route_sum, route = nn.nearest_neighbor(pkg_list, "Address0")
 
     assert route_sum == 6
     assert [p.address for p in route] == ["Address1", "Address3", "Address2"]
 
+
 def test_nearest_neighbor_includes_return_to_start_in_route_sum(pkg_list, monkeypatch, fake_world):
     monkeypatch.setattr(nn, "get_address_list", lambda: fake_world["address_list"])
     monkeypatch.setattr(nn, "address_to_index", fake_world["address_to_index"])
@@ -93,6 +99,7 @@ def test_nearest_neighbor_includes_return_to_start_in_route_sum(pkg_list, monkey
 
     assert route_sum >= 50
 
+
 def test_nearest_neighbor_handles_empty_package_list(monkeypatch, fake_world):
     empty_pkg_list = []
 
@@ -106,6 +113,7 @@ def test_nearest_neighbor_handles_empty_package_list(monkeypatch, fake_world):
     assert route_sum == 0
     assert route == []
 
+
 def test_nearest_neighbor_all_packages_included_even_if_addresses_repeat(pkg_list, patch_nn):
     pkg_list[2].address = "Address1"
 
@@ -113,4 +121,74 @@ def test_nearest_neighbor_all_packages_included_even_if_addresses_repeat(pkg_lis
 
     ids = [p.package_id for p in route]
     assert sorted(ids) == [1, 2, 3]
-    assert len(ids) == len(set(ids))
\ No newline at end of file
+    assert len(ids) == len(set(ids))
+
+
+def test_build_vertices_list_uses_cached_address_index(pkg_list, monkeypatch):
+    def fail_lookup(_address):
+        raise AssertionError("address_to_index should not be called when address_index is cached")
+    monkeypatch.setattr(nn, "address_to_index", fail_lookup)
+    for pkg in pkg_list:
+        pkg.address_index = pkg.package_id
+
+    v_list = nn.build_vertices_list(pkg_list, "Address0")
+
+    assert v_list == [(1, 1), (2, 2), (3, 3)]
+
+
+class TestNearestNeighborVectorized:
+    @pytest.fixture
+    def random_world(self, monkeypatch):
+        np = pytest.importorskip("numpy")
+        import random
+        rng = random.Random(7)
+        size = 30
+        # Small integer distances force plenty of ties.
+        matrix = [[0] * size for _ in range(size)]
+        for i in range(size):
+            for j in range(i):
+                matrix[i][j] = matrix[j][i] = rng.randint(1, 4)
+        pkgs = [package.Package(i, f"Address{rng.randrange(size)}", "City", "ST", 99999, None, 1.0, None) for i in range(60)]
+        by_id = {p.package_id: p for p in pkgs}
+
+        monkeypatch.setattr(nn, "address_to_index", lambda address: int(address[len("Address"):]))
+        monkeypatch.setattr(nn, "convert_route_to_package_list", lambda visited: [by_id[i] for (i, _idx) in visited if i is not None])
+        return np, matrix, pkgs
+
+    def test_matches_loop_version_including_ties(self, random_world, monkeypatch):
+        np, matrix, pkgs = random_world
+
+        monkeypatch.setattr(nn, "get_distance_matrix", lambda: matrix)
+        expected_sum, expected_route = nn.nearest_neighbor(pkgs, "Address0")
+
+        array = np.array(matrix, dtype=np.float64)
+        monkeypatch.setattr(nn, "get_distance_matrix", lambda: array)
+        route_sum, route = nn.nearest_neighbor_vectorized(pkgs, "Address0")
+
+        assert route_sum == expected_sum
+        assert [p.package_id for p in route] == [p.package_id for p in expected_route]
+
+    def test_nearest_neighbor_dispatches_to_vectorized_for_ndarray(self, random_world, monkeypatch):
+        np, matrix, pkgs = random_world
+        array = np.array(matrix, dtype=np.float32)
+        monkeypatch.setattr(nn, "get_distance_matrix", lambda: array)
+
+        calls = []
+        monkeypatch.setattr(nn, "nearest_neighbor_vectorized", lambda *args: calls.append(args) or (0, []))
+        nn.nearest_neighbor(pkgs, "Address0")
+
+        assert calls == [(pkgs, "Address0")]
+
+    def test_handles_empty_package_list(self, random_world, monkeypatch):
+        np, matrix, _ = random_world
+        array = np.array(matrix, dtype=np.float64)
+        monkeypatch.setattr(nn, "get_distance_matrix", lambda: array)
+
+        assert nn.nearest_neighbor_vectorized([], "Address0") == (0, [])
+
+    def test_requires_ndarray(self, random_world, monkeypatch):
+        _, matrix, pkgs = random_world
+        monkeypatch.setattr(nn, "get_distance_matrix", lambda: matrix)
+
+        with pytest.raises(ValueError):
+            nn.nearest_neighbor_vectorized(pkgs, "Address0")
@@ -153,6 +153,16 @@ def test_get_time_str_for_none_and_time():
     assert package.get_time_str(time(12, 0)) == "12:00 PM"
     assert package.get_time_str(time(23, 59)) == "11:59 PM"
 
+def test_get_time_str_for_minutes_since_midnight():
+    assert package.get_time_str(8 * 60 + 5) == "08:05 AM"
+    assert package.get_time_str(24 * 60 + 15) == "12:15 AM +1d"
+
+def test_deadline_minutes_converts_deadline_and_keeps_none():
+    pkg = package.Package(1, "Address", "City", "ST", 99999, "10:30 AM", 1.0, None)
+    assert pkg.deadline_minutes == 10 * 60 + 30
+    pkg.delivery_deadline = None
+    assert pkg.deadline_minutes is None
+
 def test_try_casting_to_int_numeric_and_non_numeric():
     assert package.try_casting_to_int('0') == 0
     assert package.try_casting_to_int('int') == 'int'
@@ -204,3 +214,77 @@ def test_print_group_list_shows_group_sizes_and_delegates(capsys, monkeypatch):
     assert len(calls) == 2
     assert calls[0] == [p1, p2]
     assert calls[1] == [p3]
+
+def test_location_prefers_cached_address_index():
+    pkg = package.Package(1, "A", "C1", "S", "00001", "EOD", 1.0, None)
+    assert pkg.address_index is None
+    assert pkg.location == "A"
+
+    pkg.address_index = 0
+    assert pkg.location == 0
+
+def test_note_tag_reads_raw_and_parsed_notes():
+    assert package.get_note_tag(None) is None
+    assert package.get_note_tag("T, 2") == "T"
+    assert package.get_note_tag(["X", time(10, 20)]) == "X"
+
+def test_setting_watched_field_notifies_watchers():
+    class Watcher:
+        def __init__(self):
+            self.calls = []
+        def package_changed(self, pkg, field, old_value):
+            self.calls.append((field, old_value, getattr(pkg, field)))
+
+    pkg = package.Package(1, "Address", "City", "ST", 99999, "EOD", 1.0, None)
+    watcher = Watcher()
+    pkg.watchers.append(watcher)
+
+    pkg.truck = 2
+    pkg.address = "Elsewhere"
+    pkg.delivery_status = "en_route"
+
+    pkg.weight_kilo = 2.0
+
+    assert watcher.calls == [("truck", None, 2), ("address", "Address", "Elsewhere"), ("delivery_status", "at_the_hub", "en_route")]
+
+def test_package_has_no_instance_dict():
+    pkg = package.Package(1, "A", "C1", "S", "00001", "EOD", 1.0, None)
+    assert not hasattr(pkg, "__dict__")
+    with pytest.raises(AttributeError):
+        pkg.not_a_field = 1
+
+def test_address_history_is_lazy_until_address_changes():
+    pkg = package.Package(1, "Address", "City", "ST", 99999, "EOD", 1.0, None)
+    assert pkg._address_history is None
+
+    pkg.address = "Elsewhere"
+    assert pkg.address_history == [(None, "Address")]
+
+    pkg.address_history = pkg.address_history + [(600, "Elsewhere")]
+    assert pkg.address_history == [(None, "Address"), (600, "Elsewhere")]
+
+def test_address_history_read_keeps_the_list_it_builds():
+    pkg = package.Package(1, "Address", "City", "ST", 99999, "EOD", 1.0, None)
+
+    history = pkg.address_history
+    history.append((600, "Elsewhere"))
+
+    assert pkg.address_history is history
+    assert pkg.address_history == [(None, "Address"), (600, "Elsewhere")]
+
+def test_deepcopy_restores_slots_without_notifying_watchers():
+    import copy
+
+    class Watcher:
+        def __init__(self):
+            self.calls = []
+        def package_changed(self, pkg, field, old_value):
+            self.calls.append(field)
+
+    pkg = package.Package(1, "Address", "City", "ST", 99999, "EOD", 1.0, None)
+    pkg.watchers.append(Watcher())
+    clone = copy.deepcopy(pkg)
+
+    assert clone.package_id == 1 and clone.address == "Address"
+    assert clone.watchers[0].calls == []
+    assert pkg.watchers[0].calls == []
@@ -0,0 +1,111 @@
+# tests/test_package_columns.py
+import datetime
+import pytest
+import package
+import package_columns as pc
+from package_columns import PackageColumns, MISSING
+
+def make_pkg(pid, deadline=package.Package.EOD_TIME, note=None, priority=None, group=None, truck=None):
+    p = package.Package(pid, "Address", "City", "ST", 99999, deadline, "2.5", note)
+    p.priority = priority
+    p.group = group
+    p.truck = truck
+    return p
+
+def test_columns_line_up_with_packages_and_none_becomes_missing():
+    pkgs = [make_pkg(3, datetime.time(9, 0), group=1), make_pkg(1, None, truck=0)]
+    pkgs[0].address_index = 7
+    columns = PackageColumns(pkgs)
+
+    assert len(columns) == 2
+    assert columns.package_id.tolist() == [3, 1]
+    assert columns.address_index.tolist() == [7, MISSING]
+    assert columns.deadline_minutes.tolist() == [540, MISSING]
+    assert columns.weight.tolist() == [2.5, 2.5]
+    assert columns.priority.tolist() == [MISSING, MISSING]
+    assert columns.group.tolist() == [1, MISSING]
+    assert columns.truck.tolist() == [MISSING, 0]
+
+def test_non_numeric_weight_becomes_nan():
+    pkg = make_pkg(1)
+    pkg.weight_kilo = "Weight Kilo"
+    columns = PackageColumns([pkg])
+    assert pc.np.isnan(columns.weight[0])
+
+def test_materialize_returns_package_objects_in_row_order():
+    pkgs = [make_pkg(i) for i in range(4)]
+    columns = PackageColumns(pkgs)
+
+    assert columns.materialize() == pkgs
+    assert columns.materialize([2, 0]) == [pkgs[2], pkgs[0]]
+
+def test_from_table_reads_every_package():
+    import hash_table
+    table = hash_table.HashTable(size=4)
+    for i in range(3):
+        table.insert(i, make_pkg(i))
+
+    columns = PackageColumns.from_table(table)
+    assert sorted(columns.package_id.tolist()) == [0, 1, 2]
+
+def test_compute_priorities_follows_deadline_and_delay_rules():
+    pkgs = [
+        make_pkg(1, datetime.time(9, 0), ['D', datetime.time(13, 0)]),
+        make_pkg(2, datetime.time(13, 0), None),
+        make_pkg(3, package.Package.EOD_TIME, ['T', 2]),
+        make_pkg(4, package.Package.EOD_TIME, ['D', datetime.time(13, 0)]),
+        make_pkg(5, None, None),
+        make_pkg(6, package.Package.EOD_TIME, ['d', datetime.time(13, 0)]),
+    ]
+    assert PackageColumns(pkgs).compute_priorities().tolist() == [0, 1, 2, 3, 1, 2]
+
+def test_store_only_touches_changed_packages():
+    class Watcher:
+        def __init__(self):
+            self.calls = []
+        def package_changed(self, pkg, field, old_value):
+            self.calls.append((pkg.package_id, field))
+
+    pkgs = [make_pkg(1, priority=2), make_pkg(2, priority=0)]
+    watcher = Watcher()
+    for pkg in pkgs:
+        pkg.watchers.append(watcher)
+
+    columns = PackageColumns(pkgs)
+    columns.store('priority', [2, 1])
+
+    assert [p.priority for p in pkgs] == [2, 1]
+    assert columns.priority.tolist() == [2, 1]
+    assert watcher.calls == [(2, 'priority')]
+
+def test_store_writes_missing_back_as_none():
+    pkg = make_pkg(1, group=4)
+    columns = PackageColumns([pkg])
+    columns.store('group', [MISSING])
+    assert pkg.group is None
+
+def test_store_rejects_read_only_columns():
+    columns = PackageColumns([make_pkg(1)])
+    with pytest.raises(ValueError):
+        columns.store('deadline_minutes', [0])
+
+def test_priority_rows_keeps_original_order():
+    pkgs = [make_pkg(i, priority=p) for i, p in enumerate([6, 0, None, 5, -1, 2])]
+    assert PackageColumns(pkgs).priority_rows(0, 5).tolist() == [1, 3, 5]
+
+def test_sort_order_by_priority_then_group_frequency_then_group():
+    spec = [(1, 2), (0, None), (1, 1), (1, 2), (0, 4), (1, None), (1, 1), (1, 2)]
+    pkgs = [make_pkg(i, priority=p, group=g) for i, (p, g) in enumerate(spec)]
+    order = PackageColumns(pkgs).sort_order().tolist()
+
+    # Priority 0: group 4 before no group. Priority 1: group 2 (x3), then group 1 (x2), then no group.
+    assert order == [4, 1, 0, 3, 7, 2, 6, 5]
+
+def test_sort_order_handles_empty_rows():
+    columns = PackageColumns([])
+    assert columns.sort_order().tolist() == []
+
+def test_requires_numpy(monkeypatch):
+    monkeypatch.setattr(pc, "np", None)
+    with pytest.raises(ImportError):
+        PackageColumns([])
@@ -106,7 +106,7 @@ class TestPackageDataGenerator:
         before = pkg.copy()
         pkg_id = id(pkg)
 
-        def fake_make_random_time_string(lower, upper):
+        def fake_make_random_time_string(lower, upper, rng=None):
             return not_so_random_time_string
 
         monkeypatch.setattr(pdg, "make_random_time_string", fake_make_random_time_string)
@@ -125,7 +125,7 @@ class TestPackageDataGenerator:
         pkg_id = id(pkg)
 
         calls = 0
-        def count_make_random_time_string_calls(lower, upper):
+        def count_make_random_time_string_calls(lower, upper, rng=None):
             nonlocal calls
             calls += 1
             return "Failed Test"
@@ -149,7 +149,7 @@ class TestPackageDataGenerator:
         pkg_id = id(pkg)
 
         monkeypatch.setattr(pdg.random, "choice", lambda notes: "D")
-        monkeypatch.setattr(pdg, "make_random_time_string", lambda lower, upper: not_so_random_time_string)
+        monkeypatch.setattr(pdg, "make_random_time_string", lambda lower, upper, rng=None: not_so_random_time_string)
 
         gen = pdg.PackageDataGenerator(1, 0, 0)
         gen.constraints_list = [pkg[0]]
@@ -168,7 +168,7 @@ class TestPackageDataGenerator:
         gen.constraints_list = [pkg[0]]
 
         monkeypatch.setattr(pdg.random, "choice", lambda choices: "D")
-        monkeypatch.setattr(pdg, "make_random_time_string", lambda lower, upper: "11:00 AM")
+        monkeypatch.setattr(pdg, "make_random_time_string", lambda lower, upper, rng=None: "11:00 AM")
 
         gen.assign_special_note(pkg)
 
@@ -237,7 +237,7 @@ class TestPackageDataGenerator:
             return "D"
 
         monkeypatch.setattr(pdg.random, "choice", fake_choice)
-        monkeypatch.setattr(pdg, "make_random_time_string", lambda lower, upper: "10:30 AM")
+        monkeypatch.setattr(pdg, "make_random_time_string", lambda lower, upper, rng=None: "10:30 AM")
 
         gen.assign_special_note(pkg)
 
@@ -311,7 +311,7 @@ class TestPackageDataGenerator:
                 return "D"
 
         monkeypatch.setattr(pdg.random, "choice", fake_choice)
-        monkeypatch.setattr(pdg, "make_random_time_string", lambda lower, upper: "10:30 AM")
+        monkeypatch.setattr(pdg, "make_random_time_string", lambda lower, upper, rng=None: "10:30 AM")
 
         gen.assign_special_note(pkg1)
         gen.assign_special_note(pkg2)
@@ -388,6 +388,34 @@ class TestPackageDataGenerator:
 
         assert rows == write_list
 
+    @staticmethod
+    def generate(seed):
+        gen = pdg.PackageDataGenerator(40, 50, 50, 9, 18, seed=seed)
+        for pkg in gen.packages:
+            gen.assign_random_address(pkg)
+            gen.assign_deadline(pkg)
+            gen.assign_special_note(pkg)
+        return gen.packages
+
+    def test_same_seed_generates_the_same_packages(self):
+        first = self.generate(11)
+        random.random() # the global stream moving on must not matter
+        second = self.generate(11)
+
+        assert first == second
+
+    def test_seeded_generator_does_not_touch_global_random(self):
+        random.seed(3)
+        expected = random.random()
+
+        random.seed(3)
+        self.generate(11)
+
+        assert random.random() == expected
+
+    def test_different_seeds_generate_different_packages(self):
+        assert self.generate(11) != self.generate(12)
+
 @pytest.fixture
 def make_address_csv(tmp_path):
     default_rows = [
@@ -437,7 +465,7 @@ def test_read_address_data_raises_on_nonint_id(tmp_path):
 def test_parse_args_returns_default_values():
     argv = []
     
-    OUTPUT, NUM_PKGS, PCT_CONSTRAINTS, PCT_DEADLINES, DL_LOWER_BOUND, DL_UPPER_BOUND = pdg.parse_args(argv)
+    OUTPUT, NUM_PKGS, PCT_CONSTRAINTS, PCT_DEADLINES, DL_LOWER_BOUND, DL_UPPER_BOUND, SEED = pdg.parse_args(argv)
 
     assert OUTPUT == "packages.csv"
     assert NUM_PKGS == 20
@@ -445,11 +473,12 @@ def test_parse_args_returns_default_values():
     assert PCT_DEADLINES == 20
     assert DL_LOWER_BOUND == 9
     assert DL_UPPER_BOUND == 18
+    assert SEED is None
 
 def test_parse_args_returns_non_default_values():
-    argv = ['-o', 'output.csv', '-n', '30', '-c', '25', '-d', '75', '-l', '13', '-u', '14']
+    argv = ['-o', 'output.csv', '-n', '30', '-c', '25', '-d', '75', '-l', '13', '-u', '14', '-s', '5']
     
-    OUTPUT, NUM_PKGS, PCT_CONSTRAINTS, PCT_DEADLINES, DL_LOWER_BOUND, DL_UPPER_BOUND = pdg.parse_args(argv)
+    OUTPUT, NUM_PKGS, PCT_CONSTRAINTS, PCT_DEADLINES, DL_LOWER_BOUND, DL_UPPER_BOUND, SEED = pdg.parse_args(argv)
 
     assert OUTPUT == "output.csv"
     assert NUM_PKGS == 30
@@ -457,11 +486,12 @@ def test_parse_args_returns_non_default_values():
     assert PCT_DEADLINES == 75
     assert DL_LOWER_BOUND == 13
     assert DL_UPPER_BOUND == 14
+    assert SEED == 5
     
 def test_parse_args_adjusts_to_floor_for_all_low_values():
     argv = ['-n', '19', '-c', '-1', '-d', '-1', '-l', '8', '-u', '9']
 
-    OUTPUT, NUM_PKGS, PCT_CONSTRAINTS, PCT_DEADLINES, DL_LOWER_BOUND, DL_UPPER_BOUND = pdg.parse_args(argv)
+    OUTPUT, NUM_PKGS, PCT_CONSTRAINTS, PCT_DEADLINES, DL_LOWER_BOUND, DL_UPPER_BOUND, SEED = pdg.parse_args(argv)
 
     assert NUM_PKGS == 20
     assert PCT_CONSTRAINTS == 0
@@ -472,7 +502,7 @@ def test_parse_args_adjusts_to_floor_for_all_low_values():
 def test_parse_args_adjusts_to_ceiling_for_all_high_values():
     argv = ['-n', '41', '-c', '100', '-d', '100', '-l', '17', '-u', '19']
 
-    OUTPUT, NUM_PKGS, PCT_CONSTRAINTS, PCT_DEADLINES, DL_LOWER_BOUND, DL_UPPER_BOUND = pdg.parse_args(argv)
+    OUTPUT, NUM_PKGS, PCT_CONSTRAINTS, PCT_DEADLINES, DL_LOWER_BOUND, DL_UPPER_BOUND, SEED = pdg.parse_args(argv)
 
     assert NUM_PKGS == 40
     assert PCT_CONSTRAINTS == 100
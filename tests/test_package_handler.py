@@ -299,6 +299,20 @@ def test_build_constraints_removes_dupes(warehouse_reset):
     assert len(ids) == len(set(ids)) == 2
     assert sorted(ids) == [6, 7]
 
+def test_build_constraints_list_sees_fields_changed_after_insert(patch_get_warehouse_hash):
+    packages = patch_get_warehouse_hash
+    handler = ph.PackageHandler()
+    before = [p.package_id for p in handler.build_constraints_list()]
+
+    packages[1].special_note = ['T', 1]         # 2: gains a note
+    packages[0].special_note = ['X', time(9, 0)] # 1: X note only, but keeps its deadline
+    packages[5].delivery_deadline = package.Package.EOD_TIME # 6: loses its only constraint
+
+    after = [p.package_id for p in handler.build_constraints_list()]
+
+    assert 6 in before and 2 not in before
+    assert after == sorted((set(before) | {2}) - {6})
+
 def test_build_constraints_list_uses_identity_semantics(patch_get_warehouse_hash):
     handler = ph.PackageHandler()
     constraints_list = handler.build_constraints_list()
@@ -915,6 +929,33 @@ def test_handle_with_package_note_conflicting_trucks_in_w_group_raises(sample_w_
         handler.handle_with_package_note(packages)
 
 
+def test_assign_fleet_trucks_puts_delayed_eod_package_and_its_w_group_on_first_driverless_truck(sample_w_notes):
+    packages = sample_w_notes
+    handler = ph.PackageHandler()
+    handler.handle_with_package_note(packages)
+
+    fl = fleet.Fleet(3)
+    fl.assign_drivers_to_trucks(["Driver1"])
+    handler.assign_fleet_trucks(packages, fl)
+
+    # Package 4 is 'D' without a deadline and package 8 must go with it
+    assert packages[3].truck == 1
+    assert packages[7].truck == 1
+
+def test_assign_fleet_trucks_uses_last_truck_when_every_truck_has_a_driver(sample_w_notes):
+    packages = sample_w_notes
+    handler = ph.PackageHandler()
+    handler.handle_with_package_note(packages)
+
+    fl = fleet.Fleet(2)
+    fl.assign_drivers_to_trucks(["Driver1", "Driver2"])
+    handler.assign_fleet_trucks(packages, fl)
+
+    assert packages[3].truck == 1
+    assert packages[7].truck == 1
+    assert packages[2].truck is None
+
+
 def test_add_and_prioritize_remaining_packages_sets_special_note_none_to_4(patch_get_warehouse_hash):
     remaining_packages = []
     handler = ph.PackageHandler()
@@ -1208,15 +1249,34 @@ def test_list_builder_uses_identity_semantics(patch_get_warehouse_hash):
         assert packages[i] is same_packages[i]
 
 def test_list_builder_empty(monkeypatch):
-    monkeypatch.setattr(ph, "get_warehouse_hash", lambda: [])
+    monkeypatch.setattr(ph, "get_warehouse_hash", lambda: hash_table.HashTable(1))
     assert ph.list_builder() == []    
 
 def test_list_builder_missing_attribute_ignored(monkeypatch):
     class Dummy:
         def __init__(self, pid): self.package_id = pid
-    monkeypatch.setattr(ph, "get_warehouse_hash", lambda: [[Dummy(n) for n in range(100)]])
+    table = hash_table.HashTable(100)
+    for n in range(100):
+        table.insert(n, Dummy(n))
+    monkeypatch.setattr(ph, "get_warehouse_hash", lambda: table)
     assert ph.list_builder('special_note') == []
 
+def test_anti_list_builder_excludes_listed_packages_by_identity(patch_get_warehouse_hash):
+    packages = patch_get_warehouse_hash
+    lookalike = package.Package(1, "123 Maple Street", "Springfield", "IL", 62701, "10:00 AM", 2.5, None)
+
+    anti_package_list = ph.anti_list_builder([packages[0], packages[1], lookalike])
+
+    assert [pkg.package_id for pkg in anti_package_list] == [3, 4, 5, 6, 7, 8]
+
+def test_list_builder_nested_inside_iteration_of_same_table(patch_get_warehouse_hash):
+    packages = patch_get_warehouse_hash
+    table = ph.get_warehouse_hash()
+
+    sizes = [len(ph.anti_list_builder([pkg])) for pkg in table]
+
+    assert sizes == [len(packages) - 1] * len(packages)
+
 def test_anti_list_builder_returns_all(patch_get_warehouse_hash):
     result = ph.list_builder()
     packages = [
@@ -1282,4 +1342,127 @@ def test_perform_union_on_lists_removes_duplicates(lists, results):
 def test_perform_union_on_lists_returns_sorted():
     list_a = [2, 3, 1]
     list_b = [0]
-    assert ph.perform_union_on_lists(list_a, list_b) == [0, 1, 2, 3]
\ No newline at end of file
+    assert ph.perform_union_on_lists(list_a, list_b) == [0, 1, 2, 3]
+def test_columnar_set_package_priorities_matches_row_by_row():
+    def build():
+        return [
+            make_pkg(1, datetime.time(9, 0), ['D', datetime.time(13, 0)]),
+            make_pkg(2, datetime.time(13, 0), None),
+            make_pkg(3, package.Package.EOD_TIME, ['W', 2]),
+            make_pkg(4, package.Package.EOD_TIME, ['D', datetime.time(13, 0)]),
+            make_pkg(5, package.Package.EOD_TIME, ['d', datetime.time(13, 0)]),
+        ]
+    rows, cols = build(), build()
+    ph.PackageHandler().set_package_priorities(rows)
+    ph.PackageHandler(columnar=True).set_package_priorities(cols)
+    assert [p.priority for p in cols] == [p.priority for p in rows]
+
+def test_columnar_group_and_sort_list_matches_row_by_row(sample_unsorted_list):
+    for i, pkg in enumerate(sample_unsorted_list):
+        if pkg.group is None and i % 3 == 0:
+            pkg.group = 100 + i % 2
+    rows = ph.PackageHandler().group_and_sort_list(sample_unsorted_list)
+    cols = ph.PackageHandler(columnar=True).group_and_sort_list(sample_unsorted_list)
+    assert [[p.package_id for p in group] for group in cols] == [[p.package_id for p in group] for group in rows]
+
+# The rescanning merge_sets that the union-find version replaced, to check they agree.
+def rescanning_merge_sets(set_list):
+    result_list = []
+    while set_list:
+        current_set = set_list.pop()
+        merged = True
+        while merged:
+            merged = False
+            for other_set in set_list[:]:
+                if current_set.intersection(other_set):
+                    current_set = current_set.union(other_set)
+                    set_list.remove(other_set)
+                    merged = True
+        result_list.append(current_set)
+    return result_list
+
+@pytest.mark.parametrize("seed", range(5))
+def test_merge_sets_matches_rescanning_version(seed):
+    import random
+    rng = random.Random(seed)
+    set_list = [{rng.randrange(200) for _ in range(rng.randint(1, 3))} for _ in range(150)]
+    assert ph.merge_sets([set(s) for s in set_list]) == rescanning_merge_sets([set(s) for s in set_list])
+
+def test_merge_sets_does_not_consume_input():
+    set_list = [{1, 2}, {2, 3}]
+    ph.merge_sets(set_list)
+    assert set_list == [{1, 2}, {2, 3}]
+
+def test_handle_with_package_note_groups_long_w_chain(monkeypatch):
+    # Each package must go with the next one: a single chain of thousands of links.
+    n = 3000
+    table = hash_table.HashTable(size=n)
+    packages = []
+    for i in range(n):
+        pkg = package.Package(i, f"{i} Main St", "City", "ST", 0, "EOD", 1.0, f"W, {i + 1}" if i < n - 1 else None)
+        pkg.special_note = pkg.parse_special_note()
+        pkg.priority = 2
+        table.insert(i, pkg)
+        packages.append(pkg)
+    packages[n // 2].truck = 1
+    monkeypatch.setattr(ph, "get_warehouse_hash", lambda: table)
+
+    ph.PackageHandler().handle_with_package_note(packages[:-1])
+
+    assert {pkg.group for pkg in packages} == {0}
+    assert {pkg.truck for pkg in packages} == {1}
+
+# The pairwise merge_addresses that the bucketed version replaced, to check they agree.
+def pairwise_merge_addresses(package_list):
+    for i_package in package_list[:]:
+        tag = i_package.special_note[0] if i_package.special_note else None
+        if tag in {"D"}:
+            continue
+        for j_package in package_list:
+            if i_package.package_id == j_package.package_id:
+                continue
+            if i_package.address != j_package.address:
+                continue
+            earliest_deadline = min(i_package.delivery_deadline, j_package.delivery_deadline)
+            if tag and tag != 'X' and j_package.special_note is None:
+                j_package.special_note = i_package.special_note
+                i_package.delivery_deadline = j_package.delivery_deadline = earliest_deadline
+            elif i_package.special_note is None and j_package.special_note is None:
+                i_package.special_note = f'W, {j_package.package_id}'
+                i_package.parse_special_note()
+                j_package.special_note = f'W, {i_package.package_id}'
+                j_package.parse_special_note()
+                i_package.delivery_deadline = j_package.delivery_deadline = earliest_deadline
+
+def merge_snapshot(table):
+    return [(p.package_id, p.address, p.delivery_deadline, p.special_note) for p in sorted(table.packages())]
+
+def assert_merge_matches_pairwise(csv_path, monkeypatch):
+    import project_data
+    bucketed = project_data.read_package_data(csv_path)
+    pairwise = project_data.read_package_data(csv_path)
+
+    monkeypatch.setattr(ph, "get_warehouse_hash", lambda: bucketed)
+    ph.PackageHandler().merge_addresses()
+    pairwise_merge_addresses(sorted(pairwise.packages()))
+
+    assert merge_snapshot(bucketed) == merge_snapshot(pairwise)
+
+def test_merge_addresses_matches_pairwise_on_default_csv(monkeypatch):
+    from pathlib import Path
+    assert_merge_matches_pairwise(Path(__file__).resolve().parents[1] / "default.csv", monkeypatch)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_merge_addresses_matches_pairwise_on_generated_manifests(seed, tmp_path, monkeypatch):
+    import random
+    from package_data_generator import PackageDataGenerator
+    random.seed(seed)
+    gen = PackageDataGenerator(200, 30, 30)
+    for pkg in gen.packages:
+        gen.assign_random_address(pkg)
+        gen.assign_deadline(pkg)
+        gen.assign_special_note(pkg)
+    csv_path = tmp_path / "packages.csv"
+    gen.generate_csv_from_list(gen.packages, csv_path)
+
+    assert_merge_matches_pairwise(csv_path, monkeypatch)
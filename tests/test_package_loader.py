@@ -274,6 +274,125 @@ class TestHelpers:
         assert len(result) == 1
         assert result[0][0] is t1
 
+    def test_build_insertion_routes_uses_insertion_result(self, monkeypatch):
+        t1 = truck.Truck(0)
+        t1.package_list = [make_pkg(1)]
+        working_package_list = [make_pkg(2)]
+
+        calls = []
+        def fake_insert(route, new_packages, speed_mph, start_address):
+            calls.append((route, new_packages, speed_mph, start_address))
+            return 12.5, route + new_packages
+        monkeypatch.setattr(pl, "insert_packages_into_route", fake_insert)
+        monkeypatch.setattr(pl, "build_feasible_routes", lambda *args: pytest.fail("should not rebuild"))
+
+        result = pl.build_insertion_routes([t1], working_package_list, verbosity="0")
+
+        assert calls == [(t1.package_list, working_package_list, t1.speed_mph, t1.departure_address)]
+        assert result == [(t1, t1.package_list + working_package_list, 12.5)]
+
+    def test_build_insertion_routes_falls_back_to_rebuild_when_insertion_fails(self, monkeypatch):
+        t1, t2 = truck.Truck(0), truck.Truck(1)
+        working_package_list = [make_pkg(3)]
+
+        monkeypatch.setattr(pl, "insert_packages_into_route", lambda route, *_: None if route is t1.package_list else (1.0, ["ok"]))
+        rebuilt = []
+        def fake_build_feasible_routes(available_trucks, working, verbosity):
+            rebuilt.append(available_trucks)
+            return [(available_trucks[0], ["rebuilt"], 9.0)]
+        monkeypatch.setattr(pl, "build_feasible_routes", fake_build_feasible_routes)
+
+        result = pl.build_insertion_routes([t1, t2], working_package_list, verbosity="0")
+
+        assert rebuilt == [[t1]]
+        assert result == [(t1, ["rebuilt"], 9.0), (t2, ["ok"], 1.0)]
+
+    def test_build_insertion_routes_improves_the_insertion_route(self, monkeypatch):
+        t1 = truck.Truck(0)
+        working_package_list = [make_pkg(3)]
+
+        monkeypatch.setattr(pl, "insert_packages_into_route", lambda *args: (12.5, ["inserted"]))
+        improved = []
+        def fake_improve_route(route, speed_mph, start_address, time_budget):
+            improved.append((route, time_budget))
+            return 10.0, ["improved"]
+        monkeypatch.setattr(pl, "improve_route", fake_improve_route)
+        monkeypatch.setattr(pl, "check_route_feasibility", lambda route, speed, v: True)
+
+        result = pl.build_insertion_routes([t1], working_package_list, "0", improve=True, time_budget=0.25)
+
+        assert improved == [(["inserted"], 0.25)]
+        assert result == [(t1, ["improved"], 10.0)]
+
+    def test_build_insertion_routes_keeps_the_insertion_route_if_the_improved_one_fails(self, monkeypatch):
+        t1 = truck.Truck(0)
+
+        monkeypatch.setattr(pl, "insert_packages_into_route", lambda *args: (12.5, ["inserted"]))
+        monkeypatch.setattr(pl, "improve_route", lambda *args: (10.0, ["improved"]))
+        monkeypatch.setattr(pl, "check_route_feasibility", lambda route, speed, v: False)
+
+        result = pl.build_insertion_routes([t1], [make_pkg(3)], "0", improve=True)
+
+        assert result == [(t1, ["inserted"], 12.5)]
+
+    def test_build_insertion_routes_falls_back_to_an_improved_rebuild_when_improving(self, monkeypatch):
+        t1 = truck.Truck(0)
+
+        monkeypatch.setattr(pl, "insert_packages_into_route", lambda *args: None)
+        monkeypatch.setattr(pl, "build_feasible_routes", lambda *args: pytest.fail("plain rebuild"))
+        monkeypatch.setattr(pl, "build_improved_routes", lambda trucks, working, verbosity, time_budget: [(trucks[0], ["improved rebuild"], time_budget)])
+
+        result = pl.build_insertion_routes([t1], [make_pkg(3)], "0", improve=True, time_budget=0.5)
+
+        assert result == [(t1, ["improved rebuild"], 0.5)]
+
+    def test_find_feasible_routes_selects_builder_by_mode(self, monkeypatch):
+        monkeypatch.setattr(pl, "build_feasible_routes", lambda *args: "rebuild")
+        monkeypatch.setattr(pl, "build_insertion_routes", lambda *args: ("incremental",) + args[3:])
+        monkeypatch.setattr(pl, "build_improved_routes", lambda *args: ("improved",) + args[3:])
+
+        assert pl.PackageLoader().find_feasible_routes([], [], 0) == "rebuild"
+        assert pl.PackageLoader(incremental=True).find_feasible_routes([], [], 0) == ("incremental", False, None)
+        assert pl.PackageLoader(incremental=True, improve=True, improve_budget=0.5).find_feasible_routes([], [], 0) == ("incremental", True, 0.5)
+        assert pl.PackageLoader(improve=True).find_feasible_routes([], [], 0) == ("improved", None)
+        assert pl.PackageLoader(improve=True, improve_budget=0.5).find_feasible_routes([], [], 0) == ("improved", 0.5)
+
+    def test_optimize_load_plan_runs_the_optimizer_on_the_fleet(self, monkeypatch):
+        calls = []
+        class FakeOptimizer:
+            def __init__(self, fleet, time_budget, reporter):
+                calls.append((fleet, time_budget, reporter))
+            def optimize(self):
+                return 0, 12.5
+        monkeypatch.setattr(pl, "LoadPlanOptimizer", FakeOptimizer)
+
+        assert pl.PackageLoader().optimize_load_plan("fleet", "reporter", 2.0) == (0, 12.5)
+        assert calls == [("fleet", 2.0, "reporter")]
+
+    def test_build_improved_routes_checks_the_improved_route(self, monkeypatch):
+        t1, t2 = truck.Truck(0), truck.Truck(1)
+        t1.package_list = [make_pkg(1)]
+        t2.package_list = [make_pkg(2)]
+        working_package_list = [make_pkg(3)]
+
+        fake_nearest_neighbor(monkeypatch, distance=10.0)
+        improved = []
+        def fake_improve_route(route, speed_mph, start_address, time_budget):
+            improved.append((len(route), speed_mph, start_address, time_budget))
+            return 8.0, ["better"] + route
+        monkeypatch.setattr(pl, "improve_route", fake_improve_route)
+        checked = []
+        def fake_check_route_feasibility(route, speed, v):
+            checked.append(route)
+            return len(checked) == 2
+        monkeypatch.setattr(pl, "check_route_feasibility", fake_check_route_feasibility)
+
+        result = pl.build_improved_routes([t1, t2], working_package_list, verbosity="0", time_budget=0.25)
+
+        assert improved == [(2, t1.speed_mph, t1.departure_address, 0.25), (2, t2.speed_mph, t2.departure_address, 0.25)]
+        assert all(route[0] == "better" for route in checked)
+        assert result == [(t2, checked[1], 8.0)]
+
     def test_choose_best_option_returns_the_only_route_when_exactly_one_feasible_route_exists(self):
         t1, wpl, dist = truck.Truck(0), [make_pkg(1), make_pkg(2)], 10.0
         feasible_routes = [(t1, wpl, dist)]
@@ -204,4 +204,44 @@ def test_csv_line_count_empty_file(tmp_path):
 )
 def test_clean_value_conversions_parametrized(raw, expected):
     assert pd.clean_value(raw) == expected
-    
\ No newline at end of file
+    
+def test_read_package_data_caches_address_index_when_addresses_are_set(make_package_csv, patch_fakes, monkeypatch):
+    csv_path = make_package_csv()
+    mapping = {"Disneyland": 0, "The White House": 1, "The Alamo": 2, "Niagara Falls": 3, "Peter Griffin's House": 4}
+    monkeypatch.setattr(pd, "get_address_list", lambda: list(mapping))
+    monkeypatch.setattr(pd, "address_to_index", lambda address: mapping[address])
+
+    table = pd.read_package_data(csv_path)
+
+    for pkg in table.items.values():
+        assert pkg.address_index == mapping[pkg.address]
+
+def test_read_package_data_skips_address_index_without_addresses(make_package_csv, patch_fakes, monkeypatch):
+    csv_path = make_package_csv()
+    monkeypatch.setattr(pd, "get_address_list", lambda: None)
+
+    table = pd.read_package_data(csv_path)
+
+    for pkg in table.items.values():
+        assert not hasattr(pkg, "address_index")
+
+def test_read_distance_data_requires_numpy_for_dtype(tmp_path, monkeypatch):
+    path = tmp_path / "distances.csv"
+    path.write_text("0,,\n1,0,\n2,3,0\n")
+    monkeypatch.setattr(pd, "np", None)
+
+    with pytest.raises(ImportError):
+        pd.read_distance_data(path, "float64")
+
+@pytest.mark.parametrize("dtype", ["float32", "float64"])
+def test_read_distance_data_ndarray_matches_list_backend(tmp_path, dtype):
+    np = pytest.importorskip("numpy")
+    path = tmp_path / "distances.csv"
+    path.write_text("0,,\n1.5,0,\n2,3,0\n")
+
+    matrix = pd.read_distance_data(path, dtype)
+
+    assert isinstance(matrix, np.ndarray)
+    assert matrix.dtype == np.dtype(dtype)
+    assert matrix.tolist() == pd.read_distance_data(path)
+    assert matrix[0][2] == 2
@@ -0,0 +1,43 @@
+# tests/test_random_repository.py
+import pytest
+import random
+import random_repository
+
+@pytest.fixture(autouse=True)
+def restore_planner_rng(monkeypatch):
+    monkeypatch.setattr(random_repository, "planner_seed", None)
+    monkeypatch.setattr(random_repository, "planner_rng", None)
+
+def test_get_planner_rng_is_none_before_set():
+    assert random_repository.get_planner_rng() is None
+    assert random_repository.get_planner_seed() is None
+
+def test_set_planner_seed_builds_seeded_generator():
+    random_repository.set_planner_seed(42)
+
+    rng = random_repository.get_planner_rng()
+    assert isinstance(rng, random.Random)
+    assert random_repository.get_planner_seed() == 42
+    reference = random.Random(42)
+    assert [rng.random() for _ in range(3)] == [reference.random() for _ in range(3)]
+
+def test_set_planner_seed_restarts_the_stream():
+    random_repository.set_planner_seed(7)
+    first = [random_repository.get_planner_rng().random() for _ in range(5)]
+
+    random_repository.set_planner_seed(7)
+    second = [random_repository.get_planner_rng().random() for _ in range(5)]
+
+    assert first == second
+
+def test_set_planner_seed_none_gives_unseeded_generator():
+    random_repository.set_planner_seed(None)
+
+    assert isinstance(random_repository.get_planner_rng(), random.Random)
+    assert random_repository.get_planner_seed() is None
+
+@pytest.mark.parametrize("bad", ["42", 4.2, True, [1]])
+def test_set_planner_seed_rejects_non_int(bad):
+    with pytest.raises(ValueError, match="planner seed must be an int or None"):
+        random_repository.set_planner_seed(bad)
+    assert random_repository.get_planner_rng() is None
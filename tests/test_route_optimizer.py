@@ -4,13 +4,21 @@ import package
 import pytest
 import route_optimizer as ro
 
+
 def make_pkg(id_):
     return package.Package(id_, "Address", "City", "ST", 99999, None, 1.0, None, "at_the_hub", None, None, 0, 0)
-    
-def fake_get_route_departure_time(_route):
-    return time(8, 0)
+
+
+def fake_get_route_departure_minutes(_route):
+    return 8 * 60
+
+
+def minutes(h, m):
+    return h * 60 + m
+
 
 class TestRouteOptimizer:
+
     def test_check_route_feasibility_returns_true_when_no_deadlines(self):
         route = [make_pkg(i) for i in range(5)]
         for pkg in route: pkg.delivery_deadline = package.Package.EOD_TIME
@@ -23,11 +31,11 @@ class TestRouteOptimizer:
         pkg = make_pkg(0)
         pkg.delivery_deadline = time(8, 30)
 
-        def fake_get_arrival_time(*args):
-            return time(8, 31)
+        def fake_get_arrival_minutes(*args):
+            return minutes(8, 31)
 
-        monkeypatch.setattr(ro, "get_arrival_time", fake_get_arrival_time)
-        monkeypatch.setattr(ro, "get_route_departure_time", fake_get_route_departure_time)
+        monkeypatch.setattr(ro, "get_arrival_minutes", fake_get_arrival_minutes)
+        monkeypatch.setattr(ro, "get_route_departure_minutes", fake_get_route_departure_minutes)
 
         feasibility = ro.check_route_feasibility([pkg], speed_mph=18, verbosity=0)
 
@@ -39,10 +47,10 @@ class TestRouteOptimizer:
             pkg.delivery_deadline = time(8+n, 30)
             pkg.address = f"Address{n}"
 
-        times = [time(8,30), time(9,30), time(10,30), time(11,30), time(12,31)]
+        times = [minutes(8, 30), minutes(9, 30), minutes(10, 30), minutes(11, 30), minutes(12, 31)]
         it = iter(times)
-        monkeypatch.setattr(ro, "get_arrival_time", lambda *args: next(it))
-        monkeypatch.setattr(ro, "get_route_departure_time", fake_get_route_departure_time)
+        monkeypatch.setattr(ro, "get_arrival_minutes", lambda *args: next(it))
+        monkeypatch.setattr(ro, "get_route_departure_minutes", fake_get_route_departure_minutes)
 
         feasibility = ro.check_route_feasibility(route, speed_mph=18, verbosity=0)
 
@@ -55,12 +63,12 @@ class TestRouteOptimizer:
         pkg1.delivery_deadline = time(0, 1)
 
         calls = []
-        def fake_get_arrival_time(*args):
+        def fake_get_arrival_minutes(*args):
             calls.append((args))
-            return time(9, 0)
+            return minutes(9, 0)
 
-        monkeypatch.setattr(ro, "get_arrival_time", fake_get_arrival_time)
-        monkeypatch.setattr(ro, "get_route_departure_time", fake_get_route_departure_time)
+        monkeypatch.setattr(ro, "get_arrival_minutes", fake_get_arrival_minutes)
+        monkeypatch.setattr(ro, "get_route_departure_minutes", fake_get_route_departure_minutes)
 
         feasibility = ro.check_route_feasibility([pkg0, pkg1], speed_mph=18, verbosity=0)
 
@@ -74,12 +82,12 @@ class TestRouteOptimizer:
         pkg1.delivery_deadline = time(10, 0)
 
         calls = []
-        def fake_get_arrival_time(*args):
+        def fake_get_arrival_minutes(*args):
             calls.append(args)
-            return time(9, 0)
+            return minutes(9, 0)
 
-        monkeypatch.setattr(ro, "get_arrival_time", fake_get_arrival_time)
-        monkeypatch.setattr(ro, "get_route_departure_time", fake_get_route_departure_time)
+        monkeypatch.setattr(ro, "get_arrival_minutes", fake_get_arrival_minutes)
+        monkeypatch.setattr(ro, "get_route_departure_minutes", fake_get_route_departure_minutes)
 
         feasibility = ro.check_route_feasibility([pkg0, pkg1], speed_mph=18, verbosity=0)
 
@@ -92,15 +100,26 @@ class TestRouteOptimizer:
             pkg.delivery_deadline = time(8+n, 31)
             pkg.address = f"Address{n}"
 
-        times = [time(8,30), time(9,30), time(10,30), time(11,30), time(12,30)]
+        times = [minutes(8, 30), minutes(9, 30), minutes(10, 30), minutes(11, 30), minutes(12, 30)]
         it = iter(times)
-        monkeypatch.setattr(ro, "get_arrival_time", lambda *args: next(it))
-        monkeypatch.setattr(ro, "get_route_departure_time", fake_get_route_departure_time)
+        monkeypatch.setattr(ro, "get_arrival_minutes", lambda *args: next(it))
+        monkeypatch.setattr(ro, "get_route_departure_minutes", fake_get_route_departure_minutes)
 
         feasibility = ro.check_route_feasibility(route, speed_mph=18, verbosity=0)
 
         assert feasibility is True
 
+    def test_check_route_feasibility_handles_arrivals_past_midnight(self, monkeypatch):
+        pkg = make_pkg(0)
+        pkg.delivery_deadline = time(23, 0)
+
+        monkeypatch.setattr(ro, "get_arrival_minutes", lambda *args: minutes(24, 10))
+        monkeypatch.setattr(ro, "get_route_departure_minutes", fake_get_route_departure_minutes)
+
+        feasibility = ro.check_route_feasibility([pkg], speed_mph=18, verbosity="1")
+
+        assert feasibility is False
+
     def test_convert_route_to_package_list_looks_up_packages_by_id_and_skips_none(self, monkeypatch):
         route = [
             (None if n == 0 or n == 4 else n, '_') 
@@ -118,4 +137,100 @@ class TestRouteOptimizer:
         ids = [pkg.package_id for pkg in package_list]
 
         assert len(package_list) == 3
-        assert ids == [1, 2, 3]
\ No newline at end of file
+        assert ids == [1, 2, 3]
+
+    def test_route_packages_streams_packages_in_route_order(self, monkeypatch):
+        class FakeWarehouseHash:
+            def search(self, package_id):
+                return make_pkg(package_id)
+
+        monkeypatch.setattr(ro, "get_warehouse_hash", lambda: FakeWarehouseHash())
+
+        stream = ro.route_packages([(None, 0), (3, 2), (1, 5), (None, 0)])
+
+        assert next(stream).package_id == 3
+        assert [pkg.package_id for pkg in stream] == [1]
+
+
+# Stops on a number line: distance is |a - b| miles and each mile takes 10 minutes. The hub is at 0.
+@pytest.fixture
+def line_world(monkeypatch):
+    def to_point(location):
+        return 0 if isinstance(location, str) else location
+
+    def fake_get_distance(a, b):
+        return abs(to_point(a) - to_point(b))
+
+    monkeypatch.setattr(ro, "get_distance", fake_get_distance)
+    monkeypatch.setattr(ro, "get_travel_minutes", lambda a, b, speed: fake_get_distance(a, b) * 10)
+    monkeypatch.setattr(ro, "get_route_departure_minutes", fake_get_route_departure_minutes)
+
+
+def make_stop(id_, point, deadline=package.Package.EOD_TIME):
+    pkg = make_pkg(id_)
+    pkg.address_index = point
+    pkg.delivery_deadline = deadline
+    return pkg
+
+
+class TestRouteSchedule:
+
+    def test_arrivals_distance_and_slack(self, line_world):
+        route = [make_stop(1, 1, time(8, 30)), make_stop(2, 3)]
+
+        schedule = ro.RouteSchedule(route, 18, 8 * 60, enforce_deadlines=True)
+
+        assert schedule.arrivals == [490, 510]
+        assert schedule.distance == 6
+        assert schedule.slack == [20, 23 * 60 + 59 - 510, float('inf')]
+        assert schedule.is_feasible()
+
+    def test_best_insertion_picks_cheapest_position(self, line_world):
+        route = [make_stop(1, 1), make_stop(2, 3)]
+        schedule = ro.RouteSchedule(route, 18, 8 * 60, enforce_deadlines=True)
+
+        assert schedule.best_insertion(make_stop(3, 2)) == (1, 0)
+
+    def test_best_insertion_respects_downstream_slack(self, line_world):
+        route = [make_stop(1, 1), make_stop(2, 2, time(8, 20))]
+        schedule = ro.RouteSchedule(route, 18, 8 * 60, enforce_deadlines=True)
+
+        # Inserting before package 2 would push it past 8:20, so only the end of the route is left.
+        assert schedule.best_insertion(make_stop(3, 5)) == (2, 6)
+
+    def test_best_insertion_returns_none_when_new_package_cannot_make_its_deadline(self, line_world):
+        schedule = ro.RouteSchedule([make_stop(1, 1)], 18, 8 * 60, enforce_deadlines=True)
+
+        assert schedule.best_insertion(make_stop(2, 9, time(8, 30))) is None
+
+
+class TestInsertPackagesIntoRoute:
+
+    def test_inserts_and_reports_full_route_distance(self, line_world):
+        route = [make_stop(1, 1), make_stop(2, 4)]
+        new = [make_stop(3, 2), make_stop(4, 3)]
+
+        distance, new_route = ro.insert_packages_into_route(route, new, 18)
+
+        assert [pkg.package_id for pkg in new_route] == [1, 3, 4, 2]
+        assert distance == 8
+
+    def test_tightest_deadline_is_placed_first(self, line_world):
+        late, early = make_stop(2, 2, time(9, 0)), make_stop(3, 1, time(8, 10))
+
+        _, new_route = ro.insert_packages_into_route([], [late, early], 18)
+
+        assert new_route == [early, late]
+
+    def test_returns_none_when_existing_route_is_already_late(self, line_world):
+        route = [make_stop(1, 5, time(8, 10))]
+
+        assert ro.insert_packages_into_route(route, [make_stop(2, 1)], 18) is None
+
+    def test_ignores_deadlines_when_route_has_none(self, line_world):
+        route = [make_stop(1, 200)]
+
+        distance, new_route = ro.insert_packages_into_route(route, [make_stop(2, 1)], 18)
+
+        assert len(new_route) == 2
+        assert distance == 400
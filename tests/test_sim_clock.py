@@ -0,0 +1,81 @@
+# tests/test_sim_clock.py
+import pytest
+import sim_clock
+
+# Stands in for the time module: sleeping moves the monotonic clock forward.
+class FakeTime:
+    def __init__(self, now=100.0):
+        self.now = now
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(sim_clock, "simulate_real_time", fake)
+    return fake
+
+def test_virtual_clock_never_sleeps(fake_time):
+    clock = sim_clock.VirtualClock()
+
+    clock.advance(480, 600)
+
+    assert fake_time.sleeps == []
+
+def test_accelerated_clock_sleeps_each_leg_divided_by_rate(fake_time):
+    clock = sim_clock.AcceleratedClock(60)
+
+    clock.advance(480, 490)
+    clock.advance(480, 486)
+
+    assert fake_time.sleeps == pytest.approx([10 / 60, 6 / 60])
+
+def test_accelerated_clock_default_rate_matches_delivery_handler():
+    import delivery_handler
+    assert sim_clock.AcceleratedClock().rate == delivery_handler.DeliveryHandler.RATE
+
+def test_wall_clock_paces_events_from_the_first_leg(fake_time):
+    clock = sim_clock.WallClock(rate=60) # an hour a minute, so a simulated minute is a real second
+
+    clock.advance(480, 490)
+    clock.advance(490, 495)
+
+    assert fake_time.sleeps == pytest.approx([10.0, 5.0])
+
+def test_wall_clock_does_not_sleep_for_legs_that_are_already_due(fake_time):
+    clock = sim_clock.WallClock(rate=60)
+
+    clock.advance(480, 500)
+    # Another truck's leg, ending earlier than the last one did
+    clock.advance(480, 490)
+
+    assert fake_time.sleeps == pytest.approx([20.0])
+
+def test_wall_clock_counts_time_spent_outside_the_clock(fake_time):
+    clock = sim_clock.WallClock(rate=60)
+
+    clock.advance(480, 490)
+    fake_time.now += 3 # The handlers took three real seconds
+    clock.advance(490, 500)
+
+    assert fake_time.sleeps == pytest.approx([10.0, 7.0])
+
+@pytest.mark.parametrize("clock_class", [sim_clock.AcceleratedClock, sim_clock.WallClock])
+def test_rate_must_be_positive(clock_class):
+    with pytest.raises(ValueError):
+        clock_class(0)
+
+def test_make_clock_by_name():
+    assert isinstance(sim_clock.make_clock("virtual"), sim_clock.VirtualClock)
+    assert sim_clock.make_clock("accelerated", 10).rate == 10
+    assert sim_clock.make_clock("wall").rate == 1.0
+
+def test_make_clock_rejects_unknown_names():
+    with pytest.raises(ValueError, match="Unknown clock"):
+        sim_clock.make_clock("sundial")
@@ -1,24 +1,28 @@
 # tests/test_time_utils.py
 from datetime import time
 import package
+import distance_repository as dr
 import pytest
 import time_utils as tu
 
 def make_pkg(id_):
     return package.Package(id_, "Address", "City", "ST", 99999, None, 1.0, None, "at_the_hub", None, None, 0, 0)
 
-class TestTimeUtils:
-    def test_float_to_time_rounds_minutes_correctly(self):
-        ret_time = tu.float_to_time(8.49)
-        assert ret_time == time(8, 29)
+# Two addresses 5.3 miles apart, installed through set_distance_matrix with a fresh travel-minutes cache.
+@pytest.fixture
+def two_stop_world(monkeypatch):
+    monkeypatch.setattr(dr, "distance_matrix", None)
+    monkeypatch.setattr(dr, "travel_minutes_matrices", {})
+    monkeypatch.setattr(tu, "address_to_index", {"A": 0, "B": 1}.get)
+    dr.set_distance_matrix([[0.0, 5.3], [5.3, 0.0]])
+    return dr.travel_minutes_matrices
 
-    def test_float_to_time_rolls_over_when_rounds_to_60(self):
-        ret_time = tu.float_to_time(8.999)
-        assert ret_time == time(9, 0)
+class TestTimeUtils:
+    def test_hours_to_minutes_rounds_minutes_correctly(self):
+        assert tu.hours_to_minutes(8.49) == 8 * 60 + 29
 
-    def test_float_to_time_handles_zero_minutes(self):
-        ret_time = tu.float_to_time(8.0)
-        assert ret_time == time(8, 0)
+    def test_hours_to_minutes_handles_zero_minutes(self):
+        assert tu.hours_to_minutes(8.0) == 8 * 60
 
     def test_get_route_departure_time_defaults_to_0800_when_no_delays(self):
         pkg1, pkg2 = make_pkg(1), make_pkg(2)
@@ -38,31 +42,88 @@ class TestTimeUtils:
 
         assert departure == time(8, 31)
 
-    def test_get_arrival_time_uses_distance_and_speed(self, monkeypatch):
-        departure = time(9, 0)
-        start, end = "Here", "There"
-        speed = 10.0
+    def test_time_to_minutes(self):
+        assert tu.time_to_minutes(time(9, 15)) == 555
+
+    def test_get_travel_minutes_rounds_with_hours_to_minutes(self, two_stop_world):
+        assert tu.get_travel_minutes("A", "B", 18) == tu.hours_to_minutes(5.3 / 18)
+
+    def test_hours_to_minutes_rolls_over_when_rounds_to_60(self):
+        assert tu.hours_to_minutes(8.999) == 9 * 60
+
+    def test_get_arrival_minutes_continues_past_midnight(self, monkeypatch):
+        monkeypatch.setattr(tu, "get_travel_minutes", lambda a, b, speed: 30)
+
+        arrival = tu.get_arrival_minutes(23 * 60 + 50, "A", "B", 18)
+
+        assert arrival == 24 * 60 + 20
+
+    def test_get_route_departure_minutes_uses_latest_delayed_time(self):
+        pkg = make_pkg(0)
+        pkg.special_note = ['D', time(9, 5)]
+
+        assert tu.get_route_departure_minutes([pkg]) == 9 * 60 + 5
+
+    def test_minutes_to_time_wraps_past_midnight(self):
+        assert tu.minutes_to_time(8 * 60 + 5) == time(8, 5)
+        assert tu.minutes_to_time(24 * 60 + 20) == time(0, 20)
+
+    def test_format_minutes_matches_strftime_within_the_day(self):
+        assert tu.format_minutes(8 * 60 + 5) == time(8, 5).strftime("%H:%M")
+
+    def test_format_minutes_marks_following_days(self):
+        assert tu.format_minutes(24 * 60 + 20) == "00:20 +1d"
+
+    def test_format_minutes_12h_keeps_the_day(self):
+        assert tu.format_minutes_12h(8 * 60 + 5) == "08:05 AM"
+        assert tu.format_minutes_12h(13 * 60) == "01:00 PM"
+        assert tu.format_minutes_12h(2 * 24 * 60 + 15) == "12:15 AM +2d"
+
+class TestTravelMinutesMatrix:
+    def test_get_travel_minutes_reads_cached_matrix_for_indices_and_addresses(self, two_stop_world):
+        assert tu.get_travel_minutes(0, 1, 18) == 18
+        assert tu.get_travel_minutes("A", "B", 18) == 18
+        assert list(two_stop_world) == [18]
+
+    def test_builds_one_matrix_per_distinct_speed(self, two_stop_world):
+        slow = tu.get_travel_minutes_matrix(18)
+        fast = tu.get_travel_minutes_matrix(36)
+
+        assert slow[0][1] == 18 and fast[0][1] == 9
+        assert tu.get_travel_minutes_matrix(18) is slow
+        assert set(two_stop_world) == {18, 36}
+
+    def test_set_distance_matrix_invalidates_cached_matrices(self, two_stop_world):
+        tu.get_travel_minutes_matrix(18)
 
-        def fake_get_distance(start, end):
-            return 30
+        dr.set_distance_matrix([[0.0, 9.0], [9.0, 0.0]])
 
-        monkeypatch.setattr(tu, "get_distance", fake_get_distance)
+        assert dr.travel_minutes_matrices == {}
+        assert tu.get_travel_minutes(0, 1, 18) == 30
 
-        arrival = tu.get_arrival_time(departure, start, end, speed)
+    def test_unreachable_pairs_stay_infinite(self, two_stop_world):
+        dr.set_distance_matrix([[0.0, float('inf')], [float('inf'), 0.0]])
 
-        assert arrival == time(12, 0)
+        assert tu.get_travel_minutes_matrix(18)[0][1] == float('inf')
 
-    def test_calculate_travel_time_adds_minutes_correctly(self):
-        now, travel = time(8, 0), time(1, 30)
-        ret_time = tu.calculate_travel_time(now, travel)
-        assert ret_time == time(9, 30)
+    @pytest.mark.parametrize("dtype", ["float32", "float64"])
+    def test_ndarray_matrix_gives_the_same_minutes_as_the_list_matrix(self, two_stop_world, dtype):
+        np = pytest.importorskip("numpy")
+        rng = np.random.default_rng(7)
+        n = 40
+        upper = np.triu(np.round(rng.uniform(0.1, 30.0, (n, n)), 1), 1)
+        distances = upper + upper.T
+        distances[3, 5] = distances[5, 3] = np.inf
+        distances = distances.astype(dtype)
 
-    def test_calculate_travel_time_crosses_hour_boundary(self):
-        now, travel = time(8, 30), time(0, 40)
-        ret_time = tu.calculate_travel_time(now, travel)
-        assert ret_time == time(9, 10)
+        dr.set_distance_matrix(distances.tolist())
+        list_minutes = {speed: tu.get_travel_minutes_matrix(speed) for speed in (18, 25, 60)}
+        dr.set_distance_matrix(distances)
 
-    def test_get_travel_time_in_minutes_returns_delta_minutes(self):
-        now, travel = time(8, 40), time(9, 30)
-        ret_minutes = tu.get_travel_time_in_minutes(now, travel)
-        assert ret_minutes == 50
\ No newline at end of file
+        for speed, expected in list_minutes.items():
+            array_minutes = tu.get_travel_minutes_matrix(speed)
+            assert isinstance(array_minutes, np.ndarray)
+            assert array_minutes.tolist() == expected
+        assert tu.get_travel_minutes(0, 1, 18) == list_minutes[18][0][1]
+        assert type(tu.get_travel_minutes(0, 1, 18)) is int
+        assert tu.get_travel_minutes(3, 5, 18) == float('inf')
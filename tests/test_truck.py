@@ -54,4 +54,20 @@ import pytest
 
 def test_capacity_never_exceeds_maximum_future():
     t = Truck(current_capacity=17, maximum_capacity=16)
-    assert t.current_capacity <= t.maximum_capacity
\ No newline at end of file
+    assert t.current_capacity <= t.maximum_capacity
+
+def test_str_formats_minute_departure_and_return_times():
+    t = Truck(truck_id=0, departure_time=8 * 60, return_time=12 * 60 + 30)
+    s = str(t)
+    assert "Departure Time: 08:00 AM" in s
+    assert "Return Time: 12:30 PM" in s
+
+def test_str_keeps_the_day_of_a_return_past_midnight():
+    t = Truck(truck_id=0, departure_time=22 * 60, return_time=24 * 60 + 40)
+    assert "Return Time: 12:40 AM +1d" in str(t)
+
+def test_truck_has_no_instance_dict():
+    t = Truck(truck_id=0)
+    assert not hasattr(t, "__dict__")
+    with pytest.raises(AttributeError):
+        t.not_a_field = 1
@@ -0,0 +1,168 @@
+# tests/test_two_opt.py
+from conftest import line_matrix, make_stop_pkg
+from datetime import time
+import itertools
+import math
+import random
+import pytest
+import route_optimizer as ro
+import two_opt
+
+DEPARTURE = 8 * 60
+
+# Travel minutes equal the distance, so the clock is easy to follow. Index 0 is the hub.
+@pytest.fixture
+def world(monkeypatch):
+    def _set(distance_matrix):
+        monkeypatch.setattr(two_opt, "get_distance_matrix", lambda: distance_matrix)
+        monkeypatch.setattr(two_opt, "get_travel_minutes_matrix", lambda speed: distance_matrix)
+        monkeypatch.setattr(two_opt, "get_route_departure_minutes", lambda route: DEPARTURE)
+        # check_route_feasibility on the same clock, for comparing verdicts
+        monkeypatch.setattr(ro, "get_arrival_minutes", lambda dep, a, b, speed: dep + distance_matrix[a][b])
+        monkeypatch.setattr(ro, "get_route_departure_minutes", lambda route: DEPARTURE)
+        return distance_matrix
+    return _set
+
+def plane_matrix(points):
+    return [[math.dist(a, b) for b in points] for a in points]
+
+def route_distance(distance_matrix, route):
+    stops = [0] + [pkg.address_index for pkg in route] + [0]
+    return sum(distance_matrix[a][b] for a, b in zip(stops, stops[1:]))
+
+def improve(route, **kwargs):
+    return two_opt.RouteImprover(route, 18, 0, **kwargs).improve()
+
+
+class TestRouteImprover:
+    def test_uncrosses_a_zigzag_route(self, world):
+        world(line_matrix([0, 1, 2, 3, 4, 5, 6]))
+        route = [make_stop_pkg(i, i) for i in (1, 4, 2, 5, 3, 6)]
+
+        distance, improved = improve(route)
+
+        assert distance == 12
+        assert [pkg.address_index for pkg in improved] in ([1, 2, 3, 4, 5, 6], [6, 5, 4, 3, 2, 1])
+
+    def test_returns_every_package_once(self, world):
+        rng = random.Random(5)
+        distance_matrix = world(plane_matrix([(rng.random(), rng.random()) for _ in range(30)]))
+        route = [make_stop_pkg(i, i) for i in range(1, 30)]
+        rng.shuffle(route)
+
+        distance, improved = improve(route)
+
+        assert sorted(pkg.package_id for pkg in improved) == list(range(1, 30))
+        assert distance == pytest.approx(route_distance(distance_matrix, improved))
+        assert distance < route_distance(distance_matrix, route)
+
+    def test_packages_at_one_address_stay_together(self, world):
+        world(line_matrix([0, 1, 2, 3]))
+        route = [make_stop_pkg(1, 2), make_stop_pkg(2, 1), make_stop_pkg(3, 2), make_stop_pkg(4, 3)]
+
+        _, improved = improve(route)
+
+        indices = [pkg.address_index for pkg in improved]
+        assert indices in ([1, 2, 2, 3], [3, 2, 2, 1])
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_result_is_a_local_optimum_with_full_neighbor_lists(self, world, seed):
+        rng = random.Random(seed)
+        distance_matrix = world(plane_matrix([(rng.random(), rng.random()) for _ in range(12)]))
+        route = [make_stop_pkg(i, i) for i in range(1, 12)]
+        rng.shuffle(route)
+
+        distance, improved = improve(route, num_neighbors=11)
+
+        # No reversal and no single relocation is shorter
+        for i, j in itertools.combinations(range(len(improved) + 1), 2):
+            reversed_route = improved[:i] + improved[i:j][::-1] + improved[j:]
+            assert route_distance(distance_matrix, reversed_route) >= distance - 1e-9
+        for i, j in itertools.permutations(range(len(improved)), 2):
+            moved = improved[:i] + improved[i + 1:]
+            moved.insert(j, improved[i])
+            assert route_distance(distance_matrix, moved) >= distance - 1e-9
+
+    def test_does_not_trade_a_deadline_for_distance(self, world):
+        # Going out to 2 and sweeping across is shorter but reaches package 1 too late
+        world(plane_matrix([(0, 0), (0, 5), (-1, 5), (1, 5)]))
+        first = make_stop_pkg(1, 1, time(8, 5))
+        route = [first, make_stop_pkg(2, 2), make_stop_pkg(3, 3)]
+
+        _, improved = improve(route)
+
+        assert improved[0] is first
+        assert ro.check_route_feasibility(improved, 18, 0, 0)
+
+    def test_repairs_a_late_route_at_the_same_distance(self, world):
+        world(line_matrix([0, 1, -5]))
+        late = make_stop_pkg(2, 2, time(8, 5))
+        route = [make_stop_pkg(1, 1), late]
+        assert not ro.check_route_feasibility(route, 18, 0, 0)
+
+        distance, improved = improve(route)
+
+        assert distance == 12
+        assert improved[0] is late
+        assert ro.check_route_feasibility(improved, 18, 0, 0)
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_never_makes_a_route_later_and_agrees_with_check_route_feasibility(self, world, seed):
+        rng = random.Random(seed)
+        points = [(0, 0)] + [(rng.uniform(-30, 30), rng.uniform(-30, 30)) for _ in range(10)]
+        distance_matrix = world([[round(d) for d in row] for row in plane_matrix(points)])
+        route = [make_stop_pkg(i, i, time(8, rng.randint(30, 59)) if rng.random() < 0.3 else None) for i in range(1, 11)]
+        rng.shuffle(route)
+
+        before = two_opt.RouteImprover(route, 18, 0)
+        distance, improved = improve(route)
+        after = two_opt.RouteImprover(improved, 18, 0)
+
+        assert after.cost[0] <= before.cost[0]
+        if after.cost[0] == before.cost[0]:
+            assert distance <= route_distance(distance_matrix, route)
+        assert (after.cost[0] == 0) == ro.check_route_feasibility(improved, 18, 0, 0)
+        assert (before.cost[0] == 0) == ro.check_route_feasibility(route, 18, 0, 0)
+
+    def test_departure_override_is_used_for_deadlines(self, world):
+        world(line_matrix([0, 1, -5]))
+        route = [make_stop_pkg(1, 1), make_stop_pkg(2, 2, time(8, 10))]
+
+        assert two_opt.RouteImprover(route, 18, 0).cost[0] == 0
+        assert two_opt.RouteImprover(route, 18, 0, departure_minutes=DEPARTURE + 5).cost[0] == 2
+
+    def test_zero_time_budget_returns_the_route_unchanged(self, world):
+        world(line_matrix([0, 1, 2, 3, 4]))
+        route = [make_stop_pkg(i, i) for i in (1, 3, 2, 4)]
+
+        distance, improved = improve(route, time_budget=0)
+
+        assert improved == route
+        assert distance == 10
+
+    def test_empty_route(self, world):
+        world(line_matrix([0, 1]))
+
+        assert improve([]) == (0, [])
+
+    def test_improve_route_passes_through(self, world, monkeypatch):
+        calls = []
+        class FakeImprover:
+            def __init__(self, route, speed_mph, start_address, time_budget=None):
+                calls.append((route, speed_mph, start_address, time_budget))
+            def improve(self):
+                return 1.0, ["r"]
+        monkeypatch.setattr(two_opt, "RouteImprover", FakeImprover)
+
+        assert two_opt.improve_route(["p"], 18, "Hub", 0.5) == (1.0, ["r"])
+        assert calls == [(["p"], 18, "Hub", 0.5)]
+
+def test_build_neighbor_lists_orders_by_distance_and_skips_hub():
+    distance_matrix = line_matrix([0, 1, 2, 4, 7])
+
+    neighbors = two_opt.build_neighbor_lists(distance_matrix, 2)
+
+    assert neighbors[0] == []
+    assert neighbors[1] == [2, 3]
+    assert neighbors[3] == [2, 1] # 1 and 4 tie; the lower node wins
+    assert neighbors[4] == [3, 2]
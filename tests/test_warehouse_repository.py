@@ -9,6 +9,9 @@ import hash_table
 def reset_repository_state(monkeypatch):
     monkeypatch.setattr(wr, "warehouse_hash", None, raising=False)
     monkeypatch.setattr(wr, "warehouse_base", None, raising=False)
+    monkeypatch.setattr(wr, "warehouse_journal", None, raising=False)
+    monkeypatch.setattr(wr, "working_hash", None, raising=False)
+    monkeypatch.setattr(wr, "working_version", None, raising=False)
 
 @pytest.fixture
 def sample_table():
@@ -131,7 +134,7 @@ def test_reset_warehouse_produces_independent_copy(sample_table):
     # base should not see this mutation
     assert wr.warehouse_base.search(77) is None
 
-def test_multiple_resets_produce_new_instances(sample_table):
+def test_multiple_resets_reuse_working_table_while_its_packages_are_unchanged(sample_table):
     table, _ = sample_table
     wr.set_warehouse_base(table)
 
@@ -141,4 +144,106 @@ def test_multiple_resets_produce_new_instances(sample_table):
     wr.reset_warehouse()
     wh2 = wr.get_warehouse_hash()
 
-    assert wh1 is not wh2
\ No newline at end of file
+    assert wh1 is wh2
+    assert wh1 is not wr.warehouse_base
+
+def test_reset_after_insert_hands_out_fresh_table_without_the_insert(sample_table):
+    table, _ = sample_table
+    wr.set_warehouse_base(table)
+
+    wr.reset_warehouse()
+    wh1 = wr.get_warehouse_hash()
+    mutant = package.Package(77, "77 Reset Rd", "Resetville", "RS", "77777", "EOD", 1, "None")
+    wh1.insert(mutant.package_id, mutant)
+
+    wr.reset_warehouse()
+    wh2 = wr.get_warehouse_hash()
+
+    assert wh1 is not wh2
+    assert wh2.search(77) is None
+    assert len(wh2) == 3
+    assert wh1 not in wh2.search(1).watchers
+
+def test_reset_restores_changed_fields_and_indexes(sample_table):
+    table, packages = sample_table
+    wr.set_warehouse_hash(table)
+    wr.set_warehouse_base(table)
+
+    pkg = packages[0]
+    original_deadline = pkg.delivery_deadline
+    pkg.truck = 2
+    pkg.group = 5
+    pkg.priority = 1
+    pkg.delivery_status = "delivered"
+    pkg.delivery_deadline = package.Package.EOD_TIME
+    pkg.address = "9 Moved Ave"
+    pkg.address_history = pkg.address_history + [(600, "9 Moved Ave")]
+    pkg.truck = 0
+
+    wr.reset_warehouse()
+    wh = wr.get_warehouse_hash()
+
+    assert wh.search(1) is pkg
+    assert (pkg.truck, pkg.group, pkg.priority, pkg.delivery_status) == (None, None, None, "at_the_hub")
+    assert pkg.delivery_deadline == original_deadline
+    assert pkg.address == "123 Main St"
+    assert pkg.address_history == [(None, "123 Main St")]
+    assert wh.find_by("truck", None) == packages
+    assert wh.find_by("delivery_status", "at_the_hub") == packages
+    assert wr.warehouse_journal.changes == {}
+
+def test_reset_only_touches_packages_changed_since_last_reset(sample_table):
+    table, packages = sample_table
+    wr.set_warehouse_base(table)
+    wr.reset_warehouse()
+
+    packages[1].truck = 1
+
+    assert list(wr.warehouse_journal.changes) == [packages[1]]
+
+    wr.reset_warehouse()
+
+    assert packages[1].truck is None
+    assert wr.warehouse_journal.changes == {}
+
+def test_set_warehouse_base_again_stops_journaling_previous_packages(sample_table):
+    table, packages = sample_table
+    wr.set_warehouse_base(table)
+    old_journal = wr.warehouse_journal
+
+    table2 = hash_table.HashTable(size=2)
+    p4 = package.Package(4, "321 Birch Lane", "Peoria", "IL", "61602", "12:00 PM", 3.3, "None")
+    table2.insert(p4.package_id, p4)
+    wr.set_warehouse_base(table2)
+
+    packages[0].truck = 1
+
+    assert old_journal not in packages[0].watchers
+    assert wr.warehouse_journal.changes == {}
+
+def test_set_warehouse_hash_detaches_the_table_it_replaces(sample_table):
+    table, packages = sample_table
+    wr.set_warehouse_hash(table)
+    replacement = table.copy()
+
+    wr.set_warehouse_hash(replacement)
+
+    assert table not in packages[0].watchers
+    assert replacement in packages[0].watchers
+
+def test_repeated_set_and_reset_cycles_leave_no_dead_tables_watching(sample_table):
+    table, packages = sample_table
+    wr.set_warehouse_hash(table)
+    wr.set_warehouse_base(table)
+
+    for _ in range(4):
+        wr.reset_warehouse()
+        packages[0].truck = 2
+        wr.set_warehouse_base(wr.get_warehouse_hash())
+        wr.reset_warehouse()
+
+    # The base, its journal and the working table, nothing else
+    for pkg in packages:
+        assert len(pkg.watchers) == 3
+        assert set(map(id, pkg.watchers)) == {id(wr.warehouse_base), id(wr.warehouse_journal), id(wr.get_warehouse_hash())}
+
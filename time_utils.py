@@ -1,21 +1,12 @@
+import math
 from datetime import time
-from distance_repository import get_distance
-
-# Takes a float object representing hours and returns a time object of h:m. Source utilized: https://timeanalyticssoftware.com/decimal-hours-converter/#:~:text=If%20the%20decimal%20hours%20have,45%20minutes%2C%20and%200%20seconds.
-def float_to_time(h_float):
-    h = int(h_float)
-    
-    m_float = (h_float - h) * 60
-    #m = int(m_float)
-    m = round(m_float)
-    
-    if m == 60:
-        h += 1
-        m = 0
-
-    # Return a time object
-    return time(h, m)
-    
+try:
+    import numpy as np
+except ImportError: # NumPy is optional; list-of-lists distance matrices get list-of-lists minutes.
+    np = None
+import distance_repository
+from distance_repository import get_distance_matrix
+from address_repository import address_to_index
 
 def get_route_departure_time(package_list):
     # Per project instruction: 'Drivers leave the hub no earlier than 8:00 a.m'
@@ -29,36 +20,82 @@ def get_route_departure_time(package_list):
     return earliest_departure
     
 
-def get_arrival_time(departure_time, start_point, end_point, speed_mph):
-    distance = get_distance(start_point, end_point)
-    travel_time = float_to_time(distance / speed_mph)
-    #print(f"DEBUG: travel_time: {travel_time}, travel_time type {type(travel_time)}")
-    return calculate_travel_time(departure_time, travel_time)
+# The planner and the simulation keep time as integer minutes since midnight of the first day. Values past 1439 simply run into the next day, which a time object can't represent, so time objects are only built when something is printed.
+MINUTES_PER_DAY = 24 * 60
+
+
+# Hours to whole minutes, rounding the fraction of an hour to the nearest minute (halves to even, like round).
+def hours_to_minutes(h_float):
+    h = int(h_float)
+    m = round((h_float - h) * 60)
+    return int(h * 60 + m)
+    
+
+# Travel minutes between every pair of addresses at one speed. Each distinct speed in the fleet gets its own matrix, built on first use from the current distance matrix and dropped by set_distance_matrix.
+def get_travel_minutes_matrix(speed_mph):
+    matrices = distance_repository.travel_minutes_matrices
+    matrix = matrices.get(speed_mph)
+    if matrix is None:
+        distance_matrix = get_distance_matrix()
+        if np is not None and isinstance(distance_matrix, np.ndarray):
+            matrix = travel_minutes_array(distance_matrix, speed_mph)
+        else:
+            # Unreachable pairs (inf) stay inf rather than being rounded
+            matrix = [[d if math.isinf(d) else hours_to_minutes(d / speed_mph) for d in row] for row in distance_matrix]
+        matrices[speed_mph] = matrix
+    return matrix
     
 
-def calculate_travel_time(now_time, travel_time):
+# hours_to_minutes over a whole NumPy distance matrix at once. The minutes stay in the matrix's float dtype so unreachable pairs can stay inf; np.round rounds halves to even, like round.
+def travel_minutes_array(distance_matrix, speed_mph):
+    hours = distance_matrix / speed_mph
+    whole_hours = np.trunc(hours)
+    with np.errstate(invalid='ignore'): # inf - inf; those cells are replaced below
+        minutes = whole_hours * 60 + np.round((hours - whole_hours) * 60)
+    return np.where(np.isinf(distance_matrix), distance_matrix, minutes)
     
-    now_minutes = now_time.hour * 60 + now_time.minute
-    travel_minutes = travel_time.hour * 60 + travel_time.minute
+
+# Returns the travel time between two points in whole minutes, rounded by hours_to_minutes. Accepts address strings or distance matrix indices, like get_distance.
+def get_travel_minutes(start_point, end_point, speed_mph):
+    index_a = start_point if isinstance(start_point, int) else address_to_index(start_point)
+    index_b = end_point if isinstance(end_point, int) else address_to_index(end_point)
     
-    arrival_minutes = now_minutes + travel_minutes
-    #print(f"arrival_time_minutes: {arrival_minutes}")
+    minutes = get_travel_minutes_matrix(speed_mph)[index_a][index_b]
+    if type(minutes) is int:
+        return minutes
+    # An ndarray matrix holds whole minutes as floats; arrival times are kept as ints either way.
+    return minutes if math.isinf(minutes) else int(minutes)
     
-    # Convert minutes to h:m. Source utilized: https://www.youtube.com/watch?v=ugXLIlM7PW0
-    h = arrival_minutes // 60
-    m = arrival_minutes % 60
+
+def get_arrival_minutes(departure_minutes, start_point, end_point, speed_mph):
+    return departure_minutes + get_travel_minutes(start_point, end_point, speed_mph)
     
-    #print(f"DEBUG: h: {h}, m type {type(m)}")
-    #print(f"DEBUG: h: {m}, m type {type(m)}")
+
+def get_route_departure_minutes(package_list):
+    return time_to_minutes(get_route_departure_time(package_list))
     
-    return time(h, m)
+
+def time_to_minutes(time_obj):
+    return time_obj.hour * 60 + time_obj.minute
     
+
+# Wraps around midnight: the day is dropped, so only use this for display and for comparing against clock times.
+def minutes_to_time(minutes):
+    return time((minutes // 60) % 24, minutes % 60)
     
-def get_travel_time_in_minutes(now_time, travel_time):
-    now_minutes = now_time.hour * 60 + now_time.minute
-    travel_minutes = travel_time.hour * 60 + travel_time.minute
+
+# "HH:MM" like strftime("%H:%M"), with a "+Nd" suffix once the horizon runs past midnight.
+def format_minutes(minutes):
+    days, day_minutes = divmod(minutes, MINUTES_PER_DAY)
+    time_str = f"{day_minutes // 60:02}:{day_minutes % 60:02}"
+    return f"{time_str} +{days}d" if days else time_str
     
-    return travel_minutes - now_minutes
+
+# format_minutes on the 12-hour clock the status printouts use ("08:05 AM"), keeping the "+Nd" suffix so a time past midnight isn't mistaken for one early that morning.
+def format_minutes_12h(minutes):
+    days = minutes // MINUTES_PER_DAY
+    time_str = minutes_to_time(minutes).strftime("%I:%M %p")
+    return f"{time_str} +{days}d" if days else time_str
     
 
 #jjg
\ No newline at end of file
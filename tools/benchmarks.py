@@ -0,0 +1,425 @@
+import argparse
+import copy
+import math
+import random
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+# Allow running as a script from the tools directory: the planner modules live at the project root.
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+import address_repository
+import delivery_handler
+import distance_repository
+import hash_table
+import k_means
+import two_opt
+import warehouse_repository
+from contextlib import redirect_stdout
+from event_queue import EventQueue
+from fleet import Fleet
+from io import StringIO
+from package import Package
+from sim_clock import VirtualClock
+from truck import Truck
+
+
+def make_address_list(num_addresses):
+    return [[i, f"Location {i}", f"{i} Benchmark Ave"] for i in range(num_addresses)]
+
+
+# Reference implementation of the original linear-scan lookup, kept here so the benchmark can show the difference.
+def linear_address_to_index(address_list, address):
+    for addr in address_list:
+        if addr[2] == address:
+            return int(addr[0])
+    return None
+
+
+def bench_address_lookup(num_addresses=5000, num_lookups=2000, repeat=3):
+    address_list = make_address_list(num_addresses)
+    address_repository.set_address_list(address_list)
+
+    # Spread the lookups evenly across the table so the linear scan is not favored by early hits.
+    step = max(1, num_addresses // num_lookups)
+    targets = [address_list[i][2] for i in range(0, num_addresses, step)][:num_lookups]
+
+    def run_linear():
+        for address in targets:
+            linear_address_to_index(address_list, address)
+
+    def run_indexed():
+        for address in targets:
+            address_repository.address_to_index(address)
+
+    linear_seconds = min(timeit.repeat(run_linear, number=1, repeat=repeat))
+    indexed_seconds = min(timeit.repeat(run_indexed, number=1, repeat=repeat))
+
+    return {
+        "num_addresses": num_addresses,
+        "num_lookups": len(targets),
+        "linear_seconds": linear_seconds,
+        "indexed_seconds": indexed_seconds,
+        "speedup": linear_seconds / indexed_seconds if indexed_seconds else float('inf'),
+    }
+
+
+def make_package_table(num_packages):
+    table = hash_table.HashTable(num_packages)
+    for i in range(num_packages):
+        pkg = Package(i, f"{i} Benchmark Ave", "City", "ST", 84101, "EOD", 1.0, "D, 9:05 AM" if i % 5 == 0 else None)
+        pkg.parse_special_note()
+        table.insert(i, pkg)
+    return table
+
+
+# What an attempt typically changes: group, priority and truck for a share of the packages.
+def mutate_packages(table, num_changed):
+    for i in range(num_changed):
+        pkg = table.search(i)
+        pkg.group = i
+        pkg.priority = 1
+        pkg.truck = 0
+
+
+def bench_warehouse_reset(num_packages=2000, num_changed=100, repeat=3):
+    table = make_package_table(num_packages)
+
+    # Previous implementation: every reset deep-copied the base table.
+    base = copy.deepcopy(table)
+    def run_deepcopy():
+        mutate_packages(base, num_changed)
+        copy.deepcopy(base)
+
+    warehouse_repository.set_warehouse_base(table)
+    warehouse_repository.reset_warehouse()
+    def run_journal():
+        mutate_packages(warehouse_repository.get_warehouse_hash(), num_changed)
+        warehouse_repository.reset_warehouse()
+
+    deepcopy_seconds = min(timeit.repeat(run_deepcopy, number=1, repeat=repeat))
+    journal_seconds = min(timeit.repeat(run_journal, number=1, repeat=repeat))
+
+    return {
+        "num_packages": num_packages,
+        "num_changed": num_changed,
+        "deepcopy_seconds": deepcopy_seconds,
+        "journal_seconds": journal_seconds,
+        "speedup": deepcopy_seconds / journal_seconds if journal_seconds else float('inf'),
+    }
+
+
+# Reference for the previous dict-backed Package layout: same fields, plus the address_history list every package allocated up front.
+class DictPackage:
+    def __init__(self, package_id, address, city, state, zip_code, delivery_deadline, weight_kilo, special_note):
+        self.watchers = []
+        self.package_id = package_id
+        self.address = address
+        self.address_history = [(None, address)]
+        self.city = city
+        self.state = state
+        self.zip_code = zip_code
+        self.delivery_deadline = delivery_deadline
+        self.weight_kilo = weight_kilo
+        self.special_note = special_note
+        self.delivery_status = 'at_the_hub'
+        self.time_of_delivery = None
+        self.truck = None
+        self.group = None
+        self.priority = None
+        self.delay_time = None
+        self.address_index = None
+
+
+# Bytes allocated while building num_packages packages with the given class (the shared field values are created up front so only the records are counted).
+def measure_package_memory(package_class, num_packages):
+    addresses = [f"{i} Benchmark Ave" for i in range(num_packages)]
+    tracemalloc.start()
+    try:
+        packages = [package_class(i, addresses[i], "City", "ST", 84101, Package.EOD_TIME, 1.0, None) for i in range(num_packages)]
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del packages
+    return allocated
+
+
+def bench_package_memory(num_packages=100000):
+    dict_bytes = measure_package_memory(DictPackage, num_packages)
+    slots_bytes = measure_package_memory(Package, num_packages)
+
+    return {
+        "num_packages": num_packages,
+        "dict_bytes": dict_bytes,
+        "slots_bytes": slots_bytes,
+        "bytes_per_dict": dict_bytes / num_packages,
+        "bytes_per_slots": slots_bytes / num_packages,
+        "ratio": dict_bytes / slots_bytes if slots_bytes else float('inf'),
+    }
+
+
+# Stops scattered over a unit square, with straight-line distances, and one package per stop.
+def make_stop_world(num_stops, seed=1):
+    rng = random.Random(seed)
+    points = [(rng.random(), rng.random()) for _ in range(num_stops)]
+    distance_repository.set_distance_matrix([[math.dist(a, b) for b in points] for a in points])
+    return [Package(i, f"{i} Benchmark Ave", "City", "ST", 84101, "EOD", 1.0, None, address_index=i) for i in range(num_stops)]
+
+
+# Reference for the previous clustering loop: assign every package to its nearest centroid, then recompute each centroid with find_new_centroid, until nothing changes.
+def voronoi_k_medoids(package_list, centroids):
+    distance_matrix = distance_repository.get_distance_matrix()
+    while True:
+        clusters = [[] for _ in centroids]
+        for package in package_list:
+            row = distance_matrix[package.address_index]
+            distances = [row[centroid.address_index] for centroid in centroids]
+            clusters[distances.index(min(distances))].append(package)
+        new_centroids = [k_means.find_new_centroid(cluster) for cluster in clusters if cluster]
+        if new_centroids == centroids:
+            return clusters
+        centroids = new_centroids
+
+
+def bench_k_medoids(num_stops=1000, k=2, repeat=3):
+    package_list = make_stop_world(num_stops)
+    centroids = k_means.select_unique_package_address(package_list, k, random.Random(1))
+
+    def run_voronoi():
+        voronoi_k_medoids(package_list, centroids)
+
+    def run_engine():
+        k_means.MedoidClustering(package_list).fit(centroids)
+
+    voronoi_seconds = min(timeit.repeat(run_voronoi, number=1, repeat=repeat))
+    engine_seconds = min(timeit.repeat(run_engine, number=1, repeat=repeat))
+
+    return {
+        "num_stops": num_stops,
+        "k": k,
+        "voronoi_seconds": voronoi_seconds,
+        "engine_seconds": engine_seconds,
+        "speedup": voronoi_seconds / engine_seconds if engine_seconds else float('inf'),
+    }
+
+
+# Greedy tour from the hub (stop 0) over the packages, the same rule nearest_neighbor follows, read straight off the distance matrix.
+def greedy_route(package_list):
+    distance_matrix = distance_repository.get_distance_matrix()
+    unvisited = list(package_list)
+    route = []
+    current = 0
+    while unvisited:
+        row = distance_matrix[current]
+        nearest = min(unvisited, key=lambda pkg: row[pkg.address_index])
+        unvisited.remove(nearest)
+        route.append(nearest)
+        current = nearest.address_index
+    return route
+
+
+def route_length(route):
+    distance_matrix = distance_repository.get_distance_matrix()
+    stops = [0] + [pkg.address_index for pkg in route] + [0]
+    return sum(distance_matrix[a][b] for a, b in zip(stops, stops[1:]))
+
+
+def bench_route_improvement(num_stops=500, repeat=3):
+    # Stop 0 is the hub; with EOD deadlines only distance matters.
+    package_list = make_stop_world(num_stops + 1)[1:]
+    route = greedy_route(package_list)
+    greedy_distance = route_length(route)
+
+    result = {}
+    def run_improver():
+        result["distance"], _ = two_opt.RouteImprover(route, 18, 0).improve()
+
+    improve_seconds = min(timeit.repeat(run_improver, number=1, repeat=repeat))
+
+    return {
+        "num_stops": num_stops,
+        "greedy_distance": greedy_distance,
+        "improved_distance": result["distance"],
+        "saving_pct": 100 * (greedy_distance - result["distance"]) / greedy_distance if greedy_distance else 0.0,
+        "improve_seconds": improve_seconds,
+    }
+
+
+# A fleet of num_trucks trucks with drivers, sharing out enough packages at random stops for num_events depart/deliver/return events.
+def make_delivery_fleet(num_events, num_trucks, num_stops=500, seed=1):
+    rng = random.Random(seed)
+    stops = make_stop_world(num_stops)
+    num_packages = max(num_trucks, num_events - 2 * num_trucks)
+
+    trucks = []
+    for i in range(num_trucks):
+        route = [Package(n, stop.address, "City", "ST", 84101, "EOD", 1.0, None, address_index=stop.address_index)
+                 for n, stop in ((n, rng.choice(stops[1:])) for n in range(i, num_packages, num_trucks))]
+        trucks.append(Truck(i, maximum_capacity=len(route), departure_address=0, driver=f"Driver{i + 1}", package_list=route))
+    return Fleet(num_trucks, trucks)
+
+
+def bench_delivery_simulation(num_events=100000, num_trucks=10, repeat=3):
+    fleet = make_delivery_fleet(num_events, num_trucks)
+    handler = delivery_handler.DeliveryHandler(clock=VirtualClock())
+    handler.build_delivery_list(fleet)
+    events = [(event[2], event) for event in handler.delivery_list]
+
+    # Previous queue: a copy of the sorted list, consumed from the front.
+    def run_pop_front():
+        queue = list(events)
+        while queue:
+            queue.pop(0)
+
+    def run_event_queue():
+        queue = EventQueue()
+        for seq, (time, event) in enumerate(events):
+            queue.push(time, event, seq)
+        while queue:
+            queue.pop()
+
+    # Headless (quiet) by default, the way a virtual-clock batch run goes; printing=True also formats every event line, into a buffer.
+    def run_simulation(printing=False):
+        handler.quiet = not printing
+        for truck in fleet:
+            truck.route_distance = 0.0
+        with redirect_stdout(StringIO()):
+            handler.deliver_packages(fleet)
+
+    pop_front_seconds = min(timeit.repeat(run_pop_front, number=1, repeat=repeat))
+    event_queue_seconds = min(timeit.repeat(run_event_queue, number=1, repeat=repeat))
+    simulate_seconds = min(timeit.repeat(run_simulation, number=1, repeat=repeat))
+    simulate_printing_seconds = min(timeit.repeat(lambda: run_simulation(printing=True), number=1, repeat=repeat))
+
+    return {
+        "num_events": len(events),
+        "num_trucks": num_trucks,
+        "pop_front_seconds": pop_front_seconds,
+        "event_queue_seconds": event_queue_seconds,
+        "simulate_seconds": simulate_seconds,
+        "simulate_printing_seconds": simulate_printing_seconds,
+    }
+
+
+# Reference implementation of the original status query: copy every package on the fleet, then replay the delivery_list up to the query time, looking the copies up one event at a time.
+def replay_package_statuses(delivery_list, fleet, time_input):
+    copied_packages = []
+    for truck in fleet.truck_list:
+        for package in truck.package_list:
+            copied_packages.append(Package(package.package_id, package.address, package.city, package.state, package.zip_code, package.delivery_deadline,
+                                           package.weight_kilo, package.special_note, 'at_the_hub', None, truck.truck_id, package.group, package.priority, address_index=package.address_index))
+
+    for truck, package, time, action in delivery_list:
+        if time > time_input:
+            break
+        if action == delivery_handler.DeliveryAction.DEPART:
+            for package_ in copied_packages:
+                if package_.truck == truck.truck_id and package_.delivery_status == 'at_the_hub':
+                    package_.delivery_status = 'en_route'
+        elif action == delivery_handler.DeliveryAction.DELIVER and package:
+            for package_ in copied_packages:
+                if package_.package_id == package.package_id:
+                    package_.delivery_status = 'delivered'
+                    package_.time_of_delivery = time
+
+    return [(package.package_id, package.delivery_status, package.time_of_delivery) for package in copied_packages]
+
+
+def timeline_package_statuses(handler, fleet, time_input):
+    return [(package_id, *timeline.status_at(time_input)) for package_id, timeline in handler.status_timeline_for(fleet).items()]
+
+
+def bench_status_query(num_packages=2000, num_trucks=10, num_queries=5, repeat=3):
+    fleet = make_delivery_fleet(num_packages + 2 * num_trucks, num_trucks)
+    handler = delivery_handler.DeliveryHandler(clock=VirtualClock())
+    handler.build_delivery_list(fleet)
+
+    # Query times spread over the day, from the first departure to the last return
+    first, last = handler.delivery_list[0][2], handler.delivery_list[-1][2]
+    query_times = [first + (last - first) * (i + 1) // (num_queries + 1) for i in range(num_queries)]
+
+    def run_replay():
+        for t in query_times:
+            replay_package_statuses(handler.delivery_list, fleet, t)
+
+    def run_timeline():
+        for t in query_times:
+            timeline_package_statuses(handler, fleet, t)
+
+    def run_build():
+        handler.build_status_timeline(fleet)
+
+    replay_seconds = min(timeit.repeat(run_replay, number=1, repeat=repeat)) / num_queries
+    timeline_seconds = min(timeit.repeat(run_timeline, number=1, repeat=repeat)) / num_queries
+    build_seconds = min(timeit.repeat(run_build, number=1, repeat=repeat))
+
+    return {
+        "num_packages": num_packages,
+        "num_queries": num_queries,
+        "replay_query_seconds": replay_seconds,
+        "timeline_query_seconds": timeline_seconds,
+        "timeline_build_seconds": build_seconds,
+        "speedup": replay_seconds / timeline_seconds if timeline_seconds else float("inf"),
+    }
+
+
+def print_results(name, results):
+    print(f"\n{name}")
+    for key, value in results.items():
+        if isinstance(value, float):
+            print(f"  {key:<16} {value:.6f}")
+        else:
+            print(f"  {key:<16} {value}")
+
+
+BENCHMARKS = {
+    "address_lookup": bench_address_lookup,
+    "warehouse_reset": bench_warehouse_reset,
+    "package_memory": bench_package_memory,
+    "k_medoids": bench_k_medoids,
+    "route_improvement": bench_route_improvement,
+    "delivery_simulation": bench_delivery_simulation,
+    "status_query": bench_status_query,
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Planner benchmarks")
+
+    parser.add_argument("benchmark", nargs="?", choices=sorted(BENCHMARKS), default=None, help="Run a single benchmark (default: all)")
+    parser.add_argument("-n", "--num_addresses", type=int, default=5000, help="Set number of addresses for address_lookup")
+    parser.add_argument("-k", "--num_packages", type=int, default=2000, help="Set number of packages for warehouse_reset")
+    parser.add_argument("-m", "--num_records", type=int, default=100000, help="Set number of packages for package_memory")
+    parser.add_argument("-s", "--num_stops", type=int, default=1000, help="Set number of stops for k_medoids")
+    parser.add_argument("-r", "--route_stops", type=int, default=500, help="Set number of stops for route_improvement")
+    parser.add_argument("-e", "--num_events", type=int, default=100000, help="Set number of delivery events for delivery_simulation")
+    parser.add_argument("-q", "--status_packages", type=int, default=2000, help="Set number of packages for status_query")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.benchmark in (None, "address_lookup"):
+        print_results("address_lookup", bench_address_lookup(num_addresses=args.num_addresses))
+    if args.benchmark in (None, "warehouse_reset"):
+        print_results("warehouse_reset", bench_warehouse_reset(num_packages=args.num_packages))
+    if args.benchmark in (None, "package_memory"):
+        print_results("package_memory", bench_package_memory(num_packages=args.num_records))
+    if args.benchmark in (None, "k_medoids"):
+        print_results("k_medoids", bench_k_medoids(num_stops=args.num_stops))
+    if args.benchmark in (None, "route_improvement"):
+        print_results("route_improvement", bench_route_improvement(num_stops=args.route_stops))
+    if args.benchmark in (None, "delivery_simulation"):
+        print_results("delivery_simulation", bench_delivery_simulation(num_events=args.num_events))
+    if args.benchmark in (None, "status_query"):
+        print_results("status_query", bench_status_query(num_packages=args.status_packages))
+
+
+if __name__ == "__main__":
+    main()
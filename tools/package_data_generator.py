@@ -4,10 +4,13 @@ from pathlib import Path
 import random
 
 class PackageDataGenerator:
-    def __init__(self, num_pkgs, pct_constraints, pct_deadlines, dl_lower_band=9, dl_upper_band=16):
+    def __init__(self, num_pkgs, pct_constraints, pct_deadlines, dl_lower_band=9, dl_upper_band=16, seed=None):
         if dl_lower_band > dl_upper_band:
             raise ValueError("dl_lower_band must be <= dl_upper_band")
 
+        # With a seed, every draw comes from a private generator so the same arguments and seed always write the same CSV. Without one, keep using the global random module.
+        self.rng = random if seed is None else random.Random(seed)
+
         self.packages = [[i, "Address", "City", "State", "Zip Code", "EOD", "Weight Kilo", "None"] for i in range(num_pkgs)]
         self.pkg_ids = [pkg[0] for pkg in self.packages]
         base_dir = Path(__file__).resolve().parents[1]
@@ -17,8 +20,8 @@ class PackageDataGenerator:
         self.dl_lower_band = dl_lower_band
         self.dl_upper_band = dl_upper_band
         
-        self.constraints_list = random.sample([pkg[0] for pkg in self.packages], k=int((num_pkgs * self.pct_constraints)))
-        self.deadlines_list = random.sample([pkg[0] for pkg in self.packages], k=int((num_pkgs * self.pct_deadlines)))
+        self.constraints_list = self.rng.sample([pkg[0] for pkg in self.packages], k=int((num_pkgs * self.pct_constraints)))
+        self.deadlines_list = self.rng.sample([pkg[0] for pkg in self.packages], k=int((num_pkgs * self.pct_deadlines)))
         self.possible_w_notes = [pkg_id for pkg_id in self.pkg_ids if pkg_id not in self.constraints_list]
 
         self.truck_capacity = 16 # TODO: Add CLI arg
@@ -27,12 +30,12 @@ class PackageDataGenerator:
 
     def assign_random_address(self, pkg):
         self.delivery_addresses = self.address_list[1:]
-        address_tup = random.choice(self.delivery_addresses)
+        address_tup = self.rng.choice(self.delivery_addresses)
         pkg[1] = address_tup[2]
         
     def assign_deadline(self, pkg):
         if pkg[0] in self.deadlines_list:
-            pkg[5] = make_random_time_string(self.dl_lower_band, self.dl_upper_band)
+            pkg[5] = make_random_time_string(self.dl_lower_band, self.dl_upper_band, self.rng)
         
     def assign_special_note(self, pkg):
         if pkg[0] not in self.constraints_list:
@@ -60,18 +63,18 @@ class PackageDataGenerator:
         if not notes:
             return
 
-        note = random.choice(notes)
+        note = self.rng.choice(notes)
 
         if note == "T":
-            truck_id = random.choice(eligible_trucks)
+            truck_id = self.rng.choice(eligible_trucks)
             pkg[7] = f"T, {truck_id}"
             self.truck_loads[truck_id] += 1
             return
 
         if note == "W":
             pool = [pid for pid in self.possible_w_notes if pid != pkg[0]]
-            k_ = min(random.randint(1, 2), len(pool))
-            chosen_notes = random.sample(pool, k=k_)
+            k_ = min(self.rng.randint(1, 2), len(pool))
+            chosen_notes = self.rng.sample(pool, k=k_)
             pkg[7] = f"W, {', '.join(str(n) for n in chosen_notes)}"
             return
 
@@ -79,9 +82,9 @@ class PackageDataGenerator:
             deadline_hour = parse_hour_24(pkg[5])
             delay_lower = self.dl_lower_band
             delay_upper = min(self.dl_upper_band, deadline_hour - 2)
-            pkg[7] = f"D, {make_random_time_string(delay_lower, delay_upper)}"
+            pkg[7] = f"D, {make_random_time_string(delay_lower, delay_upper, self.rng)}"
         else:
-            pkg[7] = f"D, {make_random_time_string(self.dl_lower_band, self.dl_upper_band)}"
+            pkg[7] = f"D, {make_random_time_string(self.dl_lower_band, self.dl_upper_band, self.rng)}"
 
     def generate_csv_from_list(self, write_list, output_file=None):
         base_dir = Path(__file__).resolve().parents[1]
@@ -122,6 +125,7 @@ def parse_args(argv=None):
     parser.add_argument("-d", "--deadlines", type=int, default = 20, help="Set percentage of packages with deadlines")
     parser.add_argument("-l", "--lower_bound", type=int, default = 9, help="Set lower hour bound")
     parser.add_argument("-u", "--upper_bound", type=int, default = 18, help="Set upper hour bound")
+    parser.add_argument("-s", "--seed", type=int, default = None, help="Seed the generator so the same arguments always produce the same list")
 
     args = parser.parse_args(argv)
 
@@ -131,15 +135,15 @@ def parse_args(argv=None):
     args.lower_bound = max(9, min(args.lower_bound, 16))
     args.upper_bound = max(10, min(args.upper_bound, 18))
 
-    return args.output, args.num_pkgs, args.constraints, args.deadlines, args.lower_bound, args.upper_bound
+    return args.output, args.num_pkgs, args.constraints, args.deadlines, args.lower_bound, args.upper_bound, args.seed
 
 
-def make_random_time_string(lower_band, upper_band):
-    hour = random.randint(lower_band, upper_band)
+def make_random_time_string(lower_band, upper_band, rng=random):
+    hour = rng.randint(lower_band, upper_band)
     meridiem = "AM" if hour < 12 else "PM"
     if hour > 12:
         hour = hour % 12
-    minute = random.randint(0, 59)
+    minute = rng.randint(0, 59)
     return f"{hour}:{minute:02} {meridiem}"
 
 def parse_hour_24(time_str):
@@ -154,12 +158,12 @@ def parse_hour_24(time_str):
 
 def main():
     args = parse_args()
-    OUTPUT, NUM_PKGS, PCT_CONSTRAINTS, PCT_DEADLINES, DL_LOWER_BOUND, DL_UPPER_BOUND = args
+    OUTPUT, NUM_PKGS, PCT_CONSTRAINTS, PCT_DEADLINES, DL_LOWER_BOUND, DL_UPPER_BOUND, SEED = args
 
     if DL_LOWER_BOUND > DL_UPPER_BOUND:
         DL_UPPER_BOUND, DL_LOWER_BOUND = DL_LOWER_BOUND, DL_UPPER_BOUND
 
-    gen = PackageDataGenerator(NUM_PKGS, PCT_CONSTRAINTS, PCT_DEADLINES, DL_LOWER_BOUND, DL_UPPER_BOUND)
+    gen = PackageDataGenerator(NUM_PKGS, PCT_CONSTRAINTS, PCT_DEADLINES, DL_LOWER_BOUND, DL_UPPER_BOUND, SEED)
 
     write_list = []
     for pkg in gen.packages:
@@ -1,5 +1,9 @@
+from time_utils import format_minutes_12h
+
 class Truck:
     MAX = 16
+    __slots__ = ('truck_id', 'current_capacity', 'maximum_capacity', 'speed_mph', 'gas', 'departure_time', 'return_time',
+                 'departure_address', 'driver', 'package_list', 'route_distance')
 
     def __init__(self, 
                  truck_id=None, 
@@ -60,6 +64,8 @@ class Truck:
     def get_time_str(self, time_object):
         if time_object is None:
             return 'None'
-        else:
-            return time_object.strftime("%I:%M %p")
+        # Departure and return times are stored as minutes since midnight
+        if isinstance(time_object, int):
+            return format_minutes_12h(time_object)
+        return time_object.strftime("%I:%M %p")
 # jjg
\ No newline at end of file
@@ -0,0 +1,210 @@
+import heapq
+import time
+from collections import deque
+from address_repository import address_to_index
+from distance_repository import get_distance_matrix
+from package import Package
+from time_utils import get_travel_minutes_matrix, get_route_departure_minutes
+
+# Anything smaller than this is float noise, not an improvement.
+EPSILON = 1e-9
+# How many of each stop's nearest stops are tried as move partners.
+NUM_NEIGHBORS = 8
+# Longest run of stops Or-opt moves at once. A run of 1 is a plain relocate.
+MAX_SEGMENT = 3
+
+# Sourced from: https://en.wikipedia.org/wiki/2-opt and https://en.wikipedia.org/wiki/Lin%E2%80%93Kernighan_heuristic (neighbor lists and don't-look bits)
+# Local search on a route built by nearest_neighbor. Three kinds of move are tried: 2-opt (reverse a stretch of the route), Or-opt (move a run of up to MAX_SEGMENT stops elsewhere, either way round) and relocate (Or-opt with a run of one).
+# Each stop only pairs up with its NUM_NEIGHBORS closest stops, and a stop that produced nothing is left alone until one of its edges changes (its don't-look bit), so a pass costs about O(n) distance lookups instead of O(n^2).
+# Moves are judged on (minutes late, distance): a move has to make the route less late, or equally late and shorter. The lateness follows check_route_feasibility exactly, so a feasible route stays feasible and a late one can only get closer to on time.
+class RouteImprover:
+    # departure_minutes overrides the departure worked out from the route, for a truck that has to wait for a driver.
+    def __init__(self, route, speed_mph, start_address='4001 South 700 East', num_neighbors=NUM_NEIGHBORS, time_budget=None, departure_minutes=None):
+        self.route = list(route)
+        self.time_budget = time_budget
+
+        # Node 0 is the hub, node i is route[i - 1]. Everything below works on nodes so the matrices only have to be read once.
+        locations = [location_index(start_address)] + [location_index(pkg.location) for pkg in self.route]
+        self.distance = submatrix(get_distance_matrix(), locations)
+        self.minutes = submatrix(get_travel_minutes_matrix(speed_mph), locations)
+
+        # Same rules as check_route_feasibility: deadlines only count if some package has one, and everyone leaves together.
+        self.enforce_deadlines = any(pkg.delivery_deadline != Package.EOD_TIME for pkg in self.route)
+        if departure_minutes is not None:
+            self.departure_minutes = departure_minutes
+        else:
+            self.departure_minutes = get_route_departure_minutes(self.route) if self.route else 0
+        self.deadlines = [float('inf')] + [float('inf') if pkg.deadline_minutes is None else pkg.deadline_minutes for pkg in self.route]
+
+        self.neighbors = build_neighbor_lists(self.distance, num_neighbors)
+
+        # The tour starts and ends at the hub.
+        self.tour = list(range(len(locations))) + [0]
+        self.positions = list(range(len(locations)))
+        self.cost = (self.lateness(self.tour), self.tour_distance(self.tour))
+
+
+    # Runs until no stop can be improved or the time budget (seconds) runs out. Returns (route_distance, route) like nearest_neighbor.
+    def improve(self):
+        stop_at = None if self.time_budget is None else time.perf_counter() + self.time_budget
+
+        queue = deque(range(1, len(self.tour) - 1))
+        queued = [False] + [True] * len(queue)
+        while queue:
+            if stop_at is not None and time.perf_counter() >= stop_at:
+                break
+            node = queue.popleft()
+            queued[node] = False
+
+            touched = self.try_two_opt(node) or self.try_or_opt(node)
+            if touched:
+                # Clear the don't-look bits of every stop whose edges just changed.
+                for other in touched:
+                    if other != 0 and not queued[other]:
+                        queue.append(other)
+                        queued[other] = True
+
+        return self.tour_distance(self.tour), self.packages()
+
+
+    def packages(self):
+        return [self.route[node - 1] for node in self.tour[1:-1]]
+
+
+    # Minutes past deadline summed over the stops; 0 exactly when check_route_feasibility would pass the route.
+    def lateness(self, tour):
+        if not self.enforce_deadlines:
+            return 0
+        minutes = self.minutes
+        arr_minutes = self.departure_minutes
+        late = 0
+        prev = 0
+        for node in tour[1:-1]:
+            arr_minutes += minutes[prev][node]
+            if arr_minutes > self.deadlines[node]:
+                late += arr_minutes - self.deadlines[node]
+            prev = node
+        return late
+
+
+    def tour_distance(self, tour):
+        distance = self.distance
+        return sum(distance[tour[i]][tour[i + 1]] for i in range(len(tour) - 1))
+
+
+    # Takes the new tour if it beats the current one. delta is the change in distance, worked out from the edges that changed.
+    def accept(self, tour, delta):
+        late, length = self.cost
+        new_late = self.lateness(tour)
+        if new_late < late or (new_late == late and delta < -EPSILON):
+            self.tour = tour
+            for position, node in enumerate(tour[:-1]):
+                self.positions[node] = position
+            self.cost = (new_late, length + delta)
+            return True
+        return False
+
+
+    # While the route is late every candidate is checked against the clock, not just the ones that are shorter; a longer route can still be the one that makes the deadlines.
+    def repairing(self):
+        return self.cost[0] > 0
+
+
+    # Replaces edges (a, b) and (c, d) with (a, c) and (b, d), where b and d are the next stops after a and c (or the previous stops, for the mirrored move). Returns the stops whose edges changed, or None.
+    def try_two_opt(self, a):
+        distance = self.distance
+        tour = self.tour
+        i = self.positions[a]
+        repairing = self.repairing()
+
+        for step in (1, -1):
+            b = tour[i + step]
+            d_ab = distance[a][b]
+            for c in self.neighbors[a]:
+                d_ac = distance[a][c]
+                # Neighbors are sorted, so once a-c is no shorter than a-b no later c can do better (the move is found from c's side if it exists).
+                if d_ac >= d_ab and not repairing:
+                    break
+                j = self.positions[c]
+                d = tour[j + step]
+                if c == b or d == a:
+                    continue
+
+                delta = d_ac + distance[b][d] - d_ab - distance[c][d]
+                if delta >= -EPSILON and not repairing:
+                    continue
+
+                if step == 1:
+                    low, high = (i + 1, j) if i < j else (j + 1, i)
+                else:
+                    low, high = (j, i - 1) if j < i else (i, j - 1)
+                new_tour = tour[:low] + tour[low:high + 1][::-1] + tour[high + 1:]
+                if self.accept(new_tour, delta):
+                    return [a, b, c, d]
+        return None
+
+
+    # Moves the run of stops starting at a (1 to MAX_SEGMENT long) next to one of the neighbors of its ends, in either direction. Returns the stops whose edges changed, or None.
+    def try_or_opt(self, a):
+        distance = self.distance
+        tour = self.tour
+        i = self.positions[a]
+        last = len(tour) - 2
+        repairing = self.repairing()
+
+        for length in range(1, MAX_SEGMENT + 1):
+            if i + length - 1 > last:
+                break
+            segment = tour[i:i + length]
+            first, end = segment[0], segment[-1]
+            prev, after = tour[i - 1], tour[i + length]
+            removed = distance[prev][first] + distance[end][after] - distance[prev][after]
+
+            for c in self.neighbors[first] + self.neighbors[end]:
+                if c in segment:
+                    continue
+                j = self.positions[c]
+                # Try the edge on either side of c.
+                for u, v in ((tour[j - 1], c), (c, tour[j + 1])):
+                    if u in segment or v in segment:
+                        continue
+                    for reverse in (False, True):
+                        head, tail = (end, first) if reverse else (first, end)
+                        delta = distance[u][head] + distance[tail][v] - distance[u][v] - removed
+                        if delta >= -EPSILON and not repairing:
+                            continue
+
+                        rest = tour[:i] + tour[i + length:]
+                        at = self.positions[u]
+                        if at > i:
+                            at -= length
+                        moved = segment[::-1] if reverse else segment
+                        new_tour = rest[:at + 1] + moved + rest[at + 1:]
+                        if self.accept(new_tour, delta):
+                            return [prev, after, u, v, first, end]
+        return None
+
+
+
+def improve_route(route, speed_mph, start_address='4001 South 700 East', time_budget=None):
+    return RouteImprover(route, speed_mph, start_address, time_budget=time_budget).improve()
+
+
+# Helper functions
+
+def location_index(location):
+    return location if isinstance(location, int) else address_to_index(location)
+
+# The rows and columns of matrix for the given indices, as plain lists of floats.
+def submatrix(matrix, indices):
+    return [[float(matrix[a][b]) for b in indices] for a in indices]
+
+# For every package node, the num_neighbors closest other package nodes, closest first (ties by node). The hub never moves, so it is nobody's neighbor.
+def build_neighbor_lists(distance, num_neighbors):
+    nodes = range(1, len(distance))
+    neighbors = [[]]
+    for node in nodes:
+        row = distance[node]
+        neighbors.append(heapq.nsmallest(num_neighbors, (other for other in nodes if other != node), key=lambda other: (row[other], other)))
+    return neighbors
+#jjg
@@ -1,28 +1,90 @@
-import copy
 import hash_table
 
 warehouse_hash = None
 warehouse_base = None
+warehouse_journal = None
+# The table reset_warehouse hands out, and its version at that point. It is reused by the next reset as long as nothing was inserted into or removed from it.
+working_hash = None
+working_version = None
+
+# Records the value each package field had before it was first changed since the last rollback. The base packages themselves are the records; the journal is the overlay of what an attempt changed, so rolling back costs O(changed packages) instead of a deepcopy of the whole table.
+class WarehouseJournal:
+    def __init__(self, table):
+        self.table = table
+        self.changes = {} # package -> {field: value before the first change}
+        for pkg in table.packages():
+            pkg.watchers.append(self)
+
+
+    # Called by Package.__setattr__ after a watched field has been reassigned.
+    def package_changed(self, pkg, field, old_value):
+        self.changes.setdefault(pkg, {}).setdefault(field, old_value)
+
+
+    def rollback(self):
+        changes, self.changes = self.changes, {}
+        # Restore through setattr so the tables' indexes follow; the journal entries this creates are dropped below.
+        for pkg, fields in changes.items():
+            for field, value in fields.items():
+                setattr(pkg, field, value)
+        self.changes = {}
+
+
+    def detach(self):
+        for pkg in self.table.packages():
+            if self in pkg.watchers:
+                pkg.watchers.remove(self)
+
 
 def set_warehouse_hash(data):
-    global warehouse_hash
     if not isinstance(data, hash_table.HashTable):
         raise ValueError("warehouse_hash must be a HashTable")
-    warehouse_hash = data
+    replace_warehouse_hash(data)
 
 def get_warehouse_hash():
     return warehouse_hash
 
+# Snapshots the table's current state as the base that reset_warehouse returns to. The base keeps its own slots, so later inserts into data don't reach it, but it shares the package objects and journals their changes instead of copying them.
 def set_warehouse_base(data):
-    global warehouse_base
+    global warehouse_base, warehouse_journal, working_hash, working_version
     if not isinstance(data, hash_table.HashTable):
         raise ValueError("warehouse_base must be a HashTable")
-    warehouse_base = copy.deepcopy(data)
+
+    # Everything built on the previous base stops watching its packages; otherwise each dead table keeps re-indexing on every field change.
+    if warehouse_journal is not None:
+        warehouse_journal.detach()
+    if warehouse_base is not None:
+        warehouse_base.detach()
+    if working_hash is not None:
+        working_hash.detach()
+        working_hash = working_version = None
+
+    warehouse_base = data.copy()
+    warehouse_journal = WarehouseJournal(warehouse_base)
 
 def reset_warehouse():
-    global warehouse_hash
+    global working_hash, working_version
     if warehouse_base is None:
         raise RuntimeError("warehouse_base not set")
-    warehouse_hash = copy.deepcopy(warehouse_base)
 
-#jjg
\ No newline at end of file
+    # Put back every field changed since the last reset
+    warehouse_journal.rollback()
+
+    # Only rebuild the working table if packages were added to or removed from it
+    if working_hash is None or working_hash.version != working_version:
+        if working_hash is not None:
+            working_hash.detach()
+        working_hash = warehouse_base.copy()
+        working_version = working_hash.version
+
+    replace_warehouse_hash(working_hash)
+
+
+# Points warehouse_hash at table. The table it replaces stops watching its packages, unless it is the working table that reset_warehouse hands out again.
+def replace_warehouse_hash(table):
+    global warehouse_hash
+    if warehouse_hash is not None and warehouse_hash is not table and warehouse_hash is not working_hash:
+        warehouse_hash.detach()
+    warehouse_hash = table
+
+#jjg